@@ -0,0 +1,289 @@
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+SEED      = 20240601
+
+# Rows per batch-throughput run; the 10M run is skipped with --quick.
+BATCH_SIZES       = (1_000, 100_000, 10_000_000)
+QUICK_BATCH_SIZES = (1_000, 100_000)
+
+
+@dataclass
+class Metric:
+    value:  float
+    unit:   str
+    # 'lower' for times and memory, 'higher' for throughput.
+    better: str = 'lower'
+
+    def as_dict(self) -> dict:
+        return {'value': self.value, 'unit': self.unit, 'better': self.better}
+
+
+def _inputs(n: int, seed: int = SEED):
+    rng = np.random.default_rng(seed)
+    return (rng.uniform(100, 190, n), rng.uniform(3.0, 9.0, n),
+            rng.uniform(0, 42, n))
+
+
+def _median_time(func: Callable, repeat: int, number: int = 1,
+                 warmup: bool = True) -> float:
+    """Median over ``repeat`` samples of the mean time of ``number`` calls."""
+    if warmup:
+        func()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        times.append((time.perf_counter() - start) / number)
+    return statistics.median(times)
+
+
+# Cases
+def bench_scalar_latency(quick: bool = False) -> Dict[str, Metric]:
+    from fuzzystride import FuzzyEngine, FuzzyModel
+
+    n = 1_000 if quick else 5_000
+    hr, pc, dist = _inputs(n)
+    metrics = {}
+    for method in FuzzyEngine.DEFUZZ_METHODS:
+        engine = FuzzyEngine(FuzzyModel(), method)
+        for name, func in (('evaluate', engine.evaluate),
+                           ('score',    engine.score)):
+            for i in range(100):
+                func(150.0, 5.5, 12.0)
+            samples = []
+            for i in range(n):
+                start = time.perf_counter_ns()
+                try:
+                    func(hr[i], pc[i], dist[i])
+                except ValueError:
+                    pass
+                samples.append(time.perf_counter_ns() - start)
+            p50, p90, p99 = np.percentile(samples, (50, 90, 99)) / 1e3
+            for label, value in (('p50', p50), ('p90', p90), ('p99', p99)):
+                metrics[f"scalar.{method}.{name}.{label}"] = Metric(value, 'us')
+    return metrics
+
+
+def bench_batch_throughput(quick: bool = False) -> Dict[str, Metric]:
+    from fuzzystride import FuzzyEngine, FuzzyModel
+
+    metrics = {}
+    for method in FuzzyEngine.DEFUZZ_METHODS:
+        engine = FuzzyEngine(FuzzyModel(), method)
+        for n in (QUICK_BATCH_SIZES if quick else BATCH_SIZES):
+            inputs  = _inputs(n)
+            large   = n >= 1_000_000
+            elapsed = _median_time(lambda: engine.evaluate_batch(*inputs),
+                                   1 if large else 5, warmup=not large)
+            metrics[f"batch.{method}.{_size_label(n)}"] = Metric(
+                n / elapsed, 'rows/s', 'higher')
+            del inputs
+    return metrics
+
+
+def bench_parallel_scaling(quick: bool = False) -> Dict[str, Metric]:
+    """``ParallelExecutor`` throughput at 1..cpu_count workers per backend."""
+    from fuzzystride.Parallel import ParallelExecutor
+
+    n      = 100_000 if quick else 1_000_000
+    repeat = 3 if quick else 5
+    inputs = _inputs(n)
+    metrics = {}
+    for backend in ParallelExecutor.BACKENDS:
+        for workers in range(1, (os.cpu_count() or 1) + 1):
+            # The warmup call starts the pool, so its spawn cost is excluded.
+            with ParallelExecutor(workers, backend) as executor:
+                elapsed = _median_time(lambda: executor.evaluate_batch(*inputs),
+                                       repeat)
+            metrics[f"parallel.{backend}.{workers}"] = Metric(
+                n / elapsed, 'rows/s', 'higher')
+    return metrics
+
+
+def bench_model_build(quick: bool = False) -> Dict[str, Metric]:
+    from fuzzystride import FuzzyEngine, FuzzyModel
+
+    repeat = 5 if quick else 15
+    return {
+        'model.build': Metric(
+            _median_time(FuzzyModel, repeat, 100) * 1e3, 'ms'),
+        'model.build_with_engine': Metric(
+            _median_time(lambda: FuzzyEngine(FuzzyModel()), repeat, 100) * 1e3,
+            'ms'),
+    }
+
+
+# Runs in a fresh interpreter per sample so nothing is already imported.
+_COLD_IMPORT = """
+import time
+start = time.perf_counter()
+from fuzzystride import FuzzyEngine, FuzzyModel
+imported = time.perf_counter()
+FuzzyEngine(FuzzyModel()).evaluate(150, 5.5, 12)
+print(imported - start, time.perf_counter() - start)
+"""
+
+
+def bench_cold_import(quick: bool = False) -> Dict[str, Metric]:
+    imports, firsts = [], []
+    for _ in range(3 if quick else 7):
+        out = subprocess.run(
+            [sys.executable, '-c', _COLD_IMPORT], cwd=REPO_ROOT, check=True,
+            capture_output=True, text=True,
+            env={**os.environ, 'PYTHONPATH': str(REPO_ROOT)}).stdout.split()
+        imports.append(float(out[0]))
+        firsts.append(float(out[1]))
+    return {
+        'cold.import':       Metric(statistics.median(imports) * 1e3, 'ms'),
+        'cold.first_result': Metric(statistics.median(firsts) * 1e3, 'ms'),
+    }
+
+
+def bench_peak_memory(quick: bool = False) -> Dict[str, Metric]:
+    """Peak traced allocation (Python objects and NumPy buffers)."""
+    from fuzzystride import FuzzyEngine, FuzzyModel
+
+    n = 100_000 if quick else 1_000_000
+    metrics = {}
+    for method in FuzzyEngine.DEFUZZ_METHODS:
+        engine = FuzzyEngine(FuzzyModel(), method)
+        inputs = _inputs(n)
+        tracemalloc.start()
+        try:
+            engine.evaluate_batch(*inputs)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        metrics[f"memory.batch.{method}.{_size_label(n)}"] = Metric(
+            peak / 2**20, 'MiB')
+    return metrics
+
+
+def bench_plot_redraw(quick: bool = False) -> Dict[str, Metric]:
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from fuzzystride import FuzzyEngine, FuzzyModel
+    from ui.Plots import DefuzzPlot, MembershipPlots
+
+    class OffscreenMembership(MembershipPlots):
+        def _make_canvas(self, parent):
+            return FigureCanvasAgg(self.fig)
+
+    class OffscreenDefuzz(DefuzzPlot):
+        def _make_canvas(self, parent):
+            return FigureCanvasAgg(self.fig)
+
+    model  = FuzzyModel()
+    engine = FuzzyEngine(model)
+    hr, pc, dist = _inputs(50)
+    results = []
+    for i in range(len(hr)):
+        try:
+            results.append(engine.evaluate(hr[i], pc[i], dist[i]))
+        except ValueError:
+            pass
+
+    repeat     = 10 if quick else 30
+    membership = OffscreenMembership(None, model)
+    defuzz     = OffscreenDefuzz(None, model)
+    cycle      = iter(range(10**9))
+
+    def redraw_markers():
+        r = results[next(cycle) % len(results)]
+        membership.update_markers(r.heart_rate, r.pacing, r.distance)
+
+    def redraw_defuzz():
+        defuzz.update(results[next(cycle) % len(results)])
+
+    metrics = {
+        'plot.membership.update': Metric(
+            _median_time(redraw_markers, repeat) * 1e3, 'ms'),
+        'plot.defuzz.update': Metric(
+            _median_time(redraw_defuzz, repeat) * 1e3, 'ms'),
+    }
+    plt.close('all')
+    return metrics
+
+
+CASES = {
+    'scalar':   bench_scalar_latency,
+    'batch':    bench_batch_throughput,
+    'parallel': bench_parallel_scaling,
+    'model':    bench_model_build,
+    'cold':     bench_cold_import,
+    'memory':   bench_peak_memory,
+    'plots':    bench_plot_redraw,
+}
+
+
+def _size_label(n: int) -> str:
+    for suffix, scale in (('M', 1_000_000), ('K', 1_000)):
+        if n >= scale and n % scale == 0:
+            return f"{n // scale}{suffix}"
+    return str(n)
+
+
+# Running and comparing
+def run(cases: Optional[List[str]] = None, quick: bool = False) -> dict:
+    results = {}
+    for name in cases or CASES:
+        for key, metric in CASES[name](quick).items():
+            results[key] = metric.as_dict()
+    return {
+        'meta': {
+            'python':    platform.python_version(),
+            'numpy':     np.__version__,
+            'platform':  platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'quick':     quick,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'results': results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> List[dict]:
+    """Rows for every metric present in both runs; 'regressed' marks the
+    ones worse than the baseline by more than ``threshold`` (a fraction)."""
+    rows = []
+    for key, metric in current['results'].items():
+        base = baseline['results'].get(key)
+        if base is None or not base['value']:
+            continue
+        ratio = metric['value'] / base['value']
+        if metric['better'] == 'higher':
+            regressed = ratio < 1 / (1 + threshold)
+        else:
+            regressed = ratio > 1 + threshold
+        rows.append({'metric': key, 'baseline': base['value'],
+                     'current': metric['value'], 'unit': metric['unit'],
+                     'ratio': ratio, 'regressed': regressed})
+    return rows
+
+
+def load(path: Path) -> dict:
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save(report: dict, path: Path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+        f.write("\n")
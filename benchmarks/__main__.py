@@ -0,0 +1,69 @@
+import argparse
+import sys
+from pathlib import Path
+
+from benchmarks.Suite import CASES, compare, load, run, save
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / 'baseline.json'
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Benchmark the inference pipeline and compare the run "
+                    "against a saved JSON baseline.")
+    parser.add_argument('cases', nargs='*', metavar='CASE',
+                        help=f"cases to run (default: all of {', '.join(CASES)})")
+    parser.add_argument('--quick', action='store_true',
+                        help="smaller inputs; skips the 10M-row batch run")
+    parser.add_argument('--baseline', type=Path, default=DEFAULT_BASELINE,
+                        help="baseline JSON to compare against "
+                             "(default: %(default)s)")
+    parser.add_argument('--save', action='store_true',
+                        help="write this run to --baseline instead of "
+                             "comparing")
+    parser.add_argument('--output', type=Path,
+                        help="also write this run's JSON report here")
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help="allowed slowdown as a fraction "
+                             "(default: %(default)s)")
+    return parser
+
+
+def main(argv=None) -> int:
+    parser = build_parser()
+    args   = parser.parse_args(argv)
+    for name in args.cases:
+        if name not in CASES:
+            parser.error(f"unknown case '{name}' (choose from {', '.join(CASES)})")
+    report = run(args.cases or None, args.quick)
+    if args.output:
+        save(report, args.output)
+
+    if args.save or not args.baseline.exists():
+        save(report, args.baseline)
+        for key, metric in sorted(report['results'].items()):
+            print(f"{key:<40} {metric['value']:>14.4g} {metric['unit']}")
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    baseline = load(args.baseline)
+    if baseline['meta'].get('quick') != report['meta']['quick']:
+        print("warning: baseline and this run differ in --quick; sizes may "
+              "not match.", file=sys.stderr)
+    rows = compare(report, baseline, args.threshold)
+    for row in rows:
+        flag = "REGRESSED" if row['regressed'] else ""
+        print(f"{row['metric']:<40} {row['baseline']:>12.4g} -> "
+              f"{row['current']:>12.4g} {row['unit']:<7} "
+              f"x{row['ratio']:.2f} {flag}")
+    regressions = [row for row in rows if row['regressed']]
+    if regressions:
+        print(f"{len(regressions)} metric(s) regressed by more than "
+              f"{args.threshold:.0%}.", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
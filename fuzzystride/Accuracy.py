@@ -0,0 +1,216 @@
+import time
+import numpy as np
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence
+
+from fuzzystride.Cache import CachedEngine
+from fuzzystride.FuzzyEngine import FuzzyEngine, EmptyMembershipError
+from fuzzystride.FuzzyModel import FuzzyModel
+from fuzzystride.SugenoEngine import SugenoEngine
+from fuzzystride.SurfaceEngine import SurfaceEngine
+
+INPUTS = ('heart_rate', 'pacing', 'distance')
+
+# Every path maps (hr, pc, dist) arrays to crisp values, NaN where no
+# rule fired. 'reference' is skfuzzy's ControlSystemSimulation and
+# 'scalar' the row-by-row FuzzyEngine.evaluate; both serve as baselines.
+PATHS = ('reference', 'scalar', 'batch', 'analytic', 'surface', 'cached',
+         'sugeno')
+BASELINES = ('reference', 'scalar')
+
+# skfuzzy takes ~20 ms per row, so the reference only sees a subset.
+DEFAULT_REFERENCE_SAMPLES = 250
+
+
+@dataclass
+class PathTiming:
+    path:    str
+    rows:    int
+    setup:   float
+    elapsed: float
+
+    @property
+    def per_row(self) -> float:
+        return self.elapsed / self.rows if self.rows else 0.0
+
+
+@dataclass
+class Comparison:
+    path:       str
+    baseline:   str
+    compared:   int
+    max_error:  float
+    mean_error: float
+    # Fraction of rows whose status differs (rows that are empty in only
+    # one of the two paths count as disagreements).
+    status_disagreement: float
+    empty_mismatches:    int
+    speedup:    float
+
+
+@dataclass
+class AccuracyReport:
+    points:      int
+    timings:     Dict[str, PathTiming] = field(default_factory=dict)
+    comparisons: List[Comparison]      = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        return {
+            'points':      self.points,
+            'timings':     {name: {**asdict(t), 'per_row': t.per_row}
+                            for name, t in self.timings.items()},
+            'comparisons': [asdict(c) for c in self.comparisons],
+        }
+
+    def format_table(self) -> str:
+        lines = [f"{'path':<10} {'vs':<10} {'rows':>7} {'max err':>10} "
+                 f"{'mean err':>10} {'status':>8} {'empty':>6} {'speedup':>9}"]
+        for c in self.comparisons:
+            lines.append(
+                f"{c.path:<10} {c.baseline:<10} {c.compared:>7} "
+                f"{c.max_error:>10.2e} {c.mean_error:>10.2e} "
+                f"{c.status_disagreement:>8.2%} {c.empty_mismatches:>6} "
+                f"{c.speedup:>8.1f}x")
+        lines.append("")
+        for t in self.timings.values():
+            lines.append(f"{t.path:<10} {t.per_row * 1e6:>10.2f} us/row "
+                         f"(setup {t.setup:.2f} s)")
+        return "\n".join(lines)
+
+
+# Sample points
+def sample_points(model: FuzzyModel, grid: Sequence[int] = (10, 10, 10),
+                  samples: int = 2000, seed: int = 0):
+    """Dense grid over the input ranges (edges included) plus uniform
+    random samples, as three flat arrays."""
+    ranges = [model.input_ranges[name] for name in INPUTS]
+    axes   = [np.linspace(lo, hi, n) for (lo, hi), n in zip(ranges, grid)]
+    mesh   = [a.ravel() for a in np.meshgrid(*axes, indexing='ij')]
+    rng    = np.random.default_rng(seed)
+    random = [rng.uniform(lo, hi, samples) for lo, hi in ranges]
+    return tuple(np.concatenate([m, r]) for m, r in zip(mesh, random))
+
+
+# Paths
+def _reference_path(model: FuzzyModel) -> Callable:
+    simulation = model.simulation
+
+    def run(hr, pc, dist):
+        crisp = np.full(len(hr), np.nan)
+        for i, row in enumerate(zip(hr, pc, dist)):
+            for name, value in zip(INPUTS, row):
+                simulation.input[name] = value
+            try:
+                simulation.compute()
+            except ValueError:
+                continue
+            crisp[i] = simulation.output.get(model.rule_output, np.nan)
+        return crisp
+    return run
+
+
+def _scalar_path(evaluate: Callable) -> Callable:
+    def run(hr, pc, dist):
+        crisp = np.full(len(hr), np.nan)
+        for i, row in enumerate(zip(hr, pc, dist)):
+            try:
+                crisp[i] = evaluate(*row).crisp_value
+            except EmptyMembershipError:
+                pass
+        return crisp
+    return run
+
+
+def build_path(name: str, model: FuzzyModel,
+               surface_cache: Optional[str] = None) -> Callable:
+    if name == 'reference':
+        return _reference_path(model)
+    if name == 'scalar':
+        return _scalar_path(FuzzyEngine(model).evaluate)
+    if name == 'cached':
+        return _scalar_path(CachedEngine(FuzzyEngine(model)).evaluate)
+    if name == 'batch':
+        engine = FuzzyEngine(model)
+    elif name == 'analytic':
+        engine = FuzzyEngine(model, 'analytic')
+    elif name == 'sugeno':
+        engine = SugenoEngine(model)
+    elif name == 'surface':
+        engine = SurfaceEngine(FuzzyEngine(model), cache_dir=surface_cache)
+    else:
+        raise ValueError(f"Unknown path '{name}'; choose from {PATHS}.")
+    return lambda hr, pc, dist: engine.evaluate_batch(hr, pc, dist).crisp_values
+
+
+# Comparison
+def status_codes(model: FuzzyModel, crisp: np.ndarray) -> np.ndarray:
+    degrees = np.vstack(list(model.fuzzify(model.rule_output, crisp).values()))
+    codes   = np.argmax(degrees, axis=0).astype(np.int8)
+    codes[np.isnan(crisp)] = -1
+    return codes
+
+
+def compare(model: FuzzyModel, path: str, crisp: np.ndarray,
+            baseline: str, expected: np.ndarray,
+            speedup: float) -> Comparison:
+    both   = ~np.isnan(crisp) & ~np.isnan(expected)
+    errors = np.abs(crisp[both] - expected[both])
+    agree  = status_codes(model, crisp) == status_codes(model, expected)
+    return Comparison(
+        path       = path,
+        baseline   = baseline,
+        compared   = len(crisp),
+        max_error  = float(errors.max()) if errors.size else 0.0,
+        mean_error = float(errors.mean()) if errors.size else 0.0,
+        status_disagreement = float(1 - agree.mean()) if len(crisp) else 0.0,
+        empty_mismatches    = int(np.sum(np.isnan(crisp) != np.isnan(expected))),
+        speedup    = speedup,
+    )
+
+
+def run_accuracy(model: Optional[FuzzyModel] = None,
+                 paths: Sequence[str] = PATHS,
+                 grid: Sequence[int] = (10, 10, 10), samples: int = 2000,
+                 reference_samples: int = DEFAULT_REFERENCE_SAMPLES,
+                 seed: int = 0,
+                 surface_cache: Optional[str] = None) -> AccuracyReport:
+    """Evaluate every path on the same points and compare each with the
+    baselines it is not itself.
+
+    All paths except 'reference' see every point; the reference and the
+    comparisons against it use a random subset of ``reference_samples``.
+    """
+    model  = model or FuzzyModel()
+    points = sample_points(model, grid, samples, seed)
+    subset = np.sort(np.random.default_rng(seed).choice(
+        len(points[0]), min(reference_samples, len(points[0])),
+        replace=False))
+    report = AccuracyReport(points=len(points[0]))
+
+    crisp: Dict[str, np.ndarray] = {}
+    for name in paths:
+        start = time.perf_counter()
+        run   = build_path(name, model, surface_cache)
+        setup = time.perf_counter() - start
+        rows  = tuple(p[subset] for p in points) if name == 'reference' \
+            else points
+        start = time.perf_counter()
+        crisp[name] = run(*rows)
+        report.timings[name] = PathTiming(
+            name, len(rows[0]), setup, time.perf_counter() - start)
+
+    timing = report.timings
+    for i, baseline in enumerate(BASELINES):
+        if baseline not in crisp:
+            continue
+        for name in paths:
+            if name in BASELINES[:i + 1]:
+                continue
+            values, expected = crisp[name], crisp[baseline]
+            if baseline == 'reference':
+                values = values[subset]
+            speedup = timing[baseline].per_row / timing[name].per_row \
+                if timing[name].per_row else float('inf')
+            report.comparisons.append(
+                compare(model, name, values, baseline, expected, speedup))
+    return report
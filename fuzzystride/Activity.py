@@ -0,0 +1,270 @@
+import gzip
+import math
+import numpy as np
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import BinaryIO, Iterable, Iterator, List, Optional
+
+from fuzzystride.Batch import chunked
+from fuzzystride.FuzzyEngine import FuzzyEngine
+
+EARTH_RADIUS_M = 6371008.8
+DEFAULT_SPLIT_KM = 1.0
+
+
+@dataclass
+class TrackPoint:
+    """One GPX ``trkpt`` or TCX ``Trackpoint``; missing values are None."""
+    time:       Optional[float] = None      # POSIX seconds
+    lat:        Optional[float] = None
+    lon:        Optional[float] = None
+    distance:   Optional[float] = None      # metres from the start (TCX)
+    heart_rate: Optional[float] = None
+
+
+@dataclass
+class Split:
+    """One per-km (or per-interval) split of an activity.
+
+    ``distance`` is the cumulative distance at the end of the split, the
+    value the model's 'distance' input expects. ``errors`` lists why a
+    split was not evaluated (no HR, no timing, or inputs outside the
+    model's ranges); its ``status`` is then None.
+    """
+    index:       int
+    start:       float                      # seconds from the activity start
+    elapsed:     float                      # seconds
+    length:      float                      # km covered in this split
+    distance:    float                      # km from the start
+    pacing:      float                      # min/km
+    heart_rate:  float                      # time-weighted mean bpm
+    crisp_value: float = float('nan')
+    status:      Optional[str] = None
+    errors:      List[str] = field(default_factory=list)
+
+    def to_record(self) -> dict:
+        return {
+            'split':       self.index,
+            'start':       round(self.start, 1),
+            'elapsed':     round(self.elapsed, 1),
+            'length':      round(self.length, 3),
+            'distance':    round(self.distance, 3),
+            'pacing':      round(self.pacing, 3),
+            'heart_rate':  round(self.heart_rate, 1),
+            'crisp_value': None if math.isnan(self.crisp_value) else self.crisp_value,
+            'status':      self.status,
+            'errors':      "; ".join(self.errors),
+        }
+
+
+# Parsing
+def open_activity(path: str) -> BinaryIO:
+    return gzip.open(path, 'rb') if path.endswith('.gz') else open(path, 'rb')
+
+
+def read_trackpoints(source) -> Iterator[TrackPoint]:
+    """Stream the track points of a GPX or TCX file (path or binary file).
+
+    Parsed incrementally with ``iterparse``; every point is cleared and
+    detached from its parent once read, so memory use does not grow with
+    the length of the track.
+    """
+    parents = []
+    for event, elem in ET.iterparse(source, events=('start', 'end')):
+        if event == 'start':
+            parents.append(elem)
+            continue
+        parents.pop()
+        if _local(elem.tag) in ('trkpt', 'Trackpoint'):
+            yield _trackpoint(elem)
+            elem.clear()
+            if parents:
+                parents[-1].remove(elem)
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit('}', 1)[-1]
+
+
+def _trackpoint(elem: ET.Element) -> TrackPoint:
+    point = TrackPoint()
+    if 'lat' in elem.attrib:                                    # GPX
+        point.lat = float(elem.attrib['lat'])
+        point.lon = float(elem.attrib['lon'])
+    for child in elem.iter():
+        name, text = _local(child.tag), (child.text or '').strip()
+        if not text:
+            continue
+        if name in ('time', 'Time'):
+            point.time = _timestamp(text)
+        elif name == 'LatitudeDegrees':
+            point.lat = float(text)
+        elif name == 'LongitudeDegrees':
+            point.lon = float(text)
+        elif name == 'DistanceMeters':
+            point.distance = float(text)
+        elif name == 'hr' or (name == 'Value' and point.heart_rate is None):
+            # gpxtpx:hr in GPX, HeartRateBpm/Value in TCX.
+            point.heart_rate = float(text)
+    return point
+
+
+def _timestamp(text: str) -> float:
+    return datetime.fromisoformat(text.replace('Z', '+00:00')).timestamp()
+
+
+def haversine(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance in metres."""
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp, dl = p2 - p1, math.radians(lon2 - lon1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(math.sqrt(a))
+
+
+# Splits
+def splits(points: Iterable[TrackPoint], split_km: Optional[float] = DEFAULT_SPLIT_KM,
+           interval: Optional[float] = None) -> Iterator[Split]:
+    """Group track points into splits of ``split_km`` or ``interval`` seconds.
+
+    Distance comes from TCX ``DistanceMeters`` when present, else from the
+    haversine distance between positions. A split closes at the first
+    point reaching its boundary; the last, shorter split is kept. Heart
+    rate is averaged over time (by sample when there are no timestamps).
+    """
+    if interval is None and not split_km:
+        raise ValueError("Give split_km or interval.")
+    by_time = interval is not None
+
+    first = prev = split = None
+    cumulative = 0.0                # metres
+    index = 1
+    for point in points:
+        if first is None:
+            first = prev = point
+            if point.distance is not None:
+                cumulative = point.distance
+            split = _SplitState(point.time, cumulative)
+            continue
+
+        if point.distance is not None:
+            cumulative = max(cumulative, point.distance)
+        elif None not in (point.lat, point.lon, prev.lat, prev.lon):
+            cumulative += haversine(prev.lat, prev.lon, point.lat, point.lon)
+        split.add(prev, point)
+        prev = point
+
+        if by_time:
+            done = (point.time is not None and split.start is not None
+                    and point.time - split.start >= interval)
+        else:
+            done = cumulative - split.start_distance >= split_km * 1000
+        if done:
+            yield split.close(index, point, cumulative, first.time)
+            index += 1
+            split = _SplitState(point.time, cumulative)
+
+    if split is not None and split.points:
+        yield split.close(index, prev, cumulative, first.time)
+
+
+class _SplitState:
+    # Running sums of one open split.
+    __slots__ = ('start', 'start_distance', 'hr_weight', 'hr_sum',
+                 'hr_samples', 'hr_count', 'points')
+
+    def __init__(self, start: Optional[float], start_distance: float):
+        self.start          = start
+        self.start_distance = start_distance
+        self.hr_weight      = 0.0
+        self.hr_sum         = 0.0
+        self.hr_samples     = 0.0
+        self.hr_count       = 0
+        self.points         = 0
+
+    def add(self, prev: TrackPoint, point: TrackPoint):
+        self.points += 1
+        if point.heart_rate is None:
+            return
+        self.hr_samples += point.heart_rate
+        self.hr_count   += 1
+        if point.time is not None and prev.time is not None:
+            dt = point.time - prev.time
+            # Mean of the segment's end-point rates where both are known.
+            hr = point.heart_rate if prev.heart_rate is None else \
+                (prev.heart_rate + point.heart_rate) / 2
+            self.hr_sum    += hr * dt
+            self.hr_weight += dt
+
+    def close(self, index: int, end: TrackPoint, cumulative: float,
+              origin: Optional[float]) -> Split:
+        length  = (cumulative - self.start_distance) / 1000
+        timed   = self.start is not None and end.time is not None
+        elapsed = end.time - self.start if timed else float('nan')
+        if self.hr_weight > 0:
+            heart_rate = self.hr_sum / self.hr_weight
+        elif self.hr_count:
+            heart_rate = self.hr_samples / self.hr_count
+        else:
+            heart_rate = float('nan')
+        return Split(
+            index      = index,
+            start      = self.start - origin if timed and origin is not None
+                         else float('nan'),
+            elapsed    = elapsed,
+            length     = length,
+            distance   = cumulative / 1000,
+            pacing     = elapsed / 60 / length if length > 0 else float('nan'),
+            heart_rate = heart_rate,
+        )
+
+
+# Evaluation
+def evaluate_splits(engine: FuzzyEngine, items: Iterable[Split],
+                    chunk_size: int = 1000) -> Iterator[Split]:
+    """Evaluate splits in chunks of one ``evaluate_batch`` call each.
+
+    Splits with a missing value or an input outside the model's ranges
+    are flagged in ``errors`` and passed through unevaluated.
+    """
+    ranges = engine.model.input_ranges
+    labels = engine.STATUS_LABELS
+    for chunk in chunked(items, chunk_size):
+        values = {name: np.array([getattr(s, name) for s in chunk])
+                  for name in ('heart_rate', 'pacing', 'distance')}
+        valid = np.ones(len(chunk), dtype=bool)
+        for name, v in values.items():
+            lo, hi = ranges[name]
+            bad = ~((v >= lo) & (v <= hi))
+            for i in np.flatnonzero(bad):
+                chunk[i].errors.append(
+                    f"no {name.replace('_', ' ')}" if np.isnan(v[i]) else
+                    f"{name.replace('_', ' ')} {v[i]:.2f} outside {lo}-{hi}")
+            valid &= ~bad
+
+        result = engine.evaluate_batch(values['heart_rate'][valid],
+                                       values['pacing'][valid],
+                                       values['distance'][valid])
+        for i, crisp, code in zip(np.flatnonzero(valid), result.crisp_values,
+                                  result.status_codes):
+            chunk[i].crisp_value = float(crisp)
+            if code < 0:
+                chunk[i].errors.append("no rule fired")
+            else:
+                chunk[i].status = labels[code]
+        yield from chunk
+
+
+def activity_timeline(engine: FuzzyEngine, path: str,
+                      split_km: Optional[float] = DEFAULT_SPLIT_KM,
+                      interval: Optional[float] = None,
+                      chunk_size: int = 1000) -> Iterator[Split]:
+    """Training-status timeline of a GPX/TCX file (``.gz`` allowed).
+
+    Parsing, splitting and evaluation are chained generators, so memory
+    use stays constant however long the activity is.
+    """
+    with open_activity(path) as source:
+        yield from evaluate_splits(
+            engine, splits(read_trackpoints(source), split_km, interval),
+            chunk_size)
@@ -0,0 +1,218 @@
+import csv
+import gzip
+import json
+import sys
+import time
+import numpy as np
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, TextIO
+
+from fuzzystride.FuzzyEngine import (
+    FuzzyEngine, EmptyMembershipError, validate_batch,
+)
+
+# (model variable / default column name, name used in validation messages)
+INPUT_FIELDS = (
+    ('heart_rate', "Heart Rate"),
+    ('pacing',     "Pacing"),
+    ('distance',   "Distance"),
+)
+DEFAULT_CHUNK_SIZE = 50000
+# Micro-batching of the HTTP service (Server.py); kept here so that the
+# command-line parser can show them without importing asyncio.
+DEFAULT_MAX_BATCH  = 256
+DEFAULT_MAX_WAIT   = 0.002
+
+
+@dataclass
+class BatchStats:
+    rows:      int = 0
+    evaluated: int = 0
+    rejected:  int = 0
+    elapsed:   float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+
+@dataclass
+class ChunkResult:
+    """Evaluated rows and rejects of one chunk, in input order."""
+    records:  List[dict]
+    rejects:  List[dict] = field(default_factory=list)
+
+
+# Reading
+def open_text(path: str, mode: str = 'r') -> TextIO:
+    """Open ``path`` as text; '-' is stdin/stdout and '.gz' is decompressed."""
+    if path == '-':
+        return sys.stdin if 'r' in mode else sys.stdout
+    if path.endswith('.gz'):
+        return gzip.open(path, mode + 't', newline='', encoding='utf-8')
+    return open(path, mode, newline='', encoding='utf-8')
+
+
+def detect_format(path: str, default: str = 'csv') -> str:
+    name = path[:-3] if path.endswith('.gz') else path
+    if name.endswith(('.jsonl', '.ndjson')):
+        return 'jsonl'
+    if name.endswith('.csv'):
+        return 'csv'
+    return default
+
+
+def read_records(stream: TextIO, fmt: str) -> Iterator[dict]:
+    """Yield one dict per input row. Malformed JSON lines yield ``None``."""
+    if fmt == 'csv':
+        rows   = csv.reader(stream)
+        header = next(rows, None)
+        for row in rows:
+            if row:
+                yield dict(zip(header, row))
+        return
+    for line in stream:
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            record = None
+        yield record if isinstance(record, dict) else None
+
+
+def chunked(records: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(records)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+# Evaluation
+def evaluate_chunks(engine: FuzzyEngine, chunks: Iterable[List[Optional[dict]]],
+                    columns: Optional[Dict[str, str]] = None,
+                    first_row: int = 1) -> Iterator[ChunkResult]:
+    """Validate each chunk in bulk and evaluate its valid rows in one call.
+
+    ``columns`` maps model variables to input column names. Rejected rows
+    carry their 1-based input row number and every validation message.
+    """
+    columns = {**{name: name for name, _ in INPUT_FIELDS}, **(columns or {})}
+    ranges  = engine.model.input_ranges
+    labels  = engine.STATUS_LABELS
+    row     = first_row
+
+    for chunk in chunks:
+        n      = len(chunk)
+        errors = [[] for _ in range(n)]
+        values = {}
+        for name, label in INPUT_FIELDS:
+            raw = [None if record is None else record.get(columns[name])
+                   for record in chunk]
+            parsed, messages = validate_batch(raw, *ranges[name], label)
+            values[name] = parsed
+            for i, message in enumerate(messages):
+                if message is not None:
+                    errors[i].append(message)
+        for i, record in enumerate(chunk):
+            if record is None:
+                errors[i] = ["Row is not a JSON object."]
+
+        valid = np.array([not e for e in errors], dtype=bool)
+        result = engine.evaluate_batch(
+            values['heart_rate'][valid], values['pacing'][valid],
+            values['distance'][valid])
+        crisp = np.full(n, np.nan)
+        codes = np.full(n, -1, dtype=np.int8)
+        crisp[valid] = result.crisp_values
+        codes[valid] = result.status_codes
+
+        out = ChunkResult(records=[])
+        for i, record in enumerate(chunk):
+            if valid[i] and codes[i] < 0:
+                errors[i].append(str(EmptyMembershipError()))
+            if errors[i]:
+                out.rejects.append({
+                    'row': row + i, 'errors': errors[i], 'record': record})
+            else:
+                out.records.append({
+                    **record,
+                    'crisp_value': float(crisp[i]),
+                    'status':      labels[codes[i]],
+                })
+        row += n
+        yield out
+
+
+# Writing
+class RecordWriter:
+    """Incremental CSV/JSONL writer; the CSV header comes from the first row."""
+
+    def __init__(self, stream: TextIO, fmt: str):
+        self.stream  = stream
+        self.fmt     = fmt
+        self._writer = None
+        self._fields = None
+
+    def write(self, records: Sequence[dict]):
+        if not records:
+            return
+        if self.fmt == 'jsonl':
+            self.stream.writelines(json.dumps(r) + "\n" for r in records)
+            return
+        if self._writer is None:
+            self._fields = list(records[0])
+            self._writer = csv.writer(self.stream)
+            self._writer.writerow(self._fields)
+        fields = self._fields
+        self._writer.writerows([r.get(f, '') for f in fields] for r in records)
+
+
+def run_batch(engine: FuzzyEngine, input_path: str, output_path: str,
+              input_format: Optional[str] = None,
+              output_format: Optional[str] = None,
+              rejects_path: Optional[str] = None,
+              chunk_size: int = DEFAULT_CHUNK_SIZE,
+              columns: Optional[Dict[str, str]] = None) -> BatchStats:
+    """Stream ``input_path`` through the engine into ``output_path``.
+
+    Rows are read, validated, evaluated and written one chunk at a time,
+    so memory use does not grow with the input size. Rejected rows go to
+    ``rejects_path`` as JSONL (stderr when not given).
+    """
+    input_format  = input_format  or detect_format(input_path)
+    output_format = output_format or detect_format(output_path, input_format)
+    stats = BatchStats()
+    start = time.perf_counter()
+
+    with ExitStack() as stack:
+        src     = _open(stack, input_path)
+        dst     = _open(stack, output_path, 'w')
+        rejects = _open(stack, rejects_path, 'w') if rejects_path else sys.stderr
+        writer  = RecordWriter(dst, output_format)
+        chunks  = chunked(read_records(src, input_format), chunk_size)
+        for result in evaluate_chunks(engine, chunks, columns):
+            writer.write(result.records)
+            for reject in result.rejects:
+                rejects.write(json.dumps(reject) + "\n")
+            stats.evaluated += len(result.records)
+            stats.rejected  += len(result.rejects)
+
+    stats.rows    = stats.evaluated + stats.rejected
+    stats.elapsed = time.perf_counter() - start
+    return stats
+
+
+def _open(stack: ExitStack, path: str, mode: str = 'r') -> TextIO:
+    # Files we open are closed on exit; the process's std streams are only
+    # flushed.
+    stream = open_text(path, mode)
+    if stream is sys.stdout:
+        stack.callback(stream.flush)
+    elif stream is not sys.stdin:
+        stack.callback(stream.close)
+    return stream
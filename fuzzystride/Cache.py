@@ -0,0 +1,159 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+
+from fuzzystride.FuzzyEngine import FuzzyEngine, EvaluationResult
+
+# Resolution the watches report at: integer bpm, 0.1 min/km, 0.01 km.
+DEFAULT_PRECISION = {
+    'heart_rate': 1.0,
+    'pacing':     0.1,
+    'distance':   0.01,
+}
+
+
+@dataclass
+class CacheStats:
+    hits:          int = 0
+    misses:        int = 0
+    evictions:     int = 0
+    expirations:   int = 0
+    invalidations: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class CachedEngine:
+    """LRU memo in front of ``FuzzyEngine.evaluate``.
+
+    The key covers the model's rule inputs, including any extra inputs a
+    rule base adds (passed as keywords, as to ``FuzzyEngine.evaluate``).
+    Inputs are snapped to ``precision`` (a step per variable; 0 or None
+    keeps that input exact, the default for variables without a step
+    there) and evaluated at the snapped point, so every
+    input sharing a key gets the same result. Entries are evicted least
+    recently used once ``maxsize`` is reached, and expire after ``ttl``
+    seconds when given. The whole cache is dropped as soon as the model's
+    MF parameters or rules change.
+
+    Cached results are shared between callers and must not be mutated.
+    """
+
+    def __init__(self, engine: FuzzyEngine,
+                 precision: Optional[Dict[str, float]] = None,
+                 maxsize: int = 65536, ttl: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1.")
+        self.engine    = engine
+        self.model     = engine.model
+        self.precision = {**DEFAULT_PRECISION, **(precision or {})}
+        self.maxsize   = maxsize
+        self.ttl       = ttl
+        self.stats     = CacheStats()
+        self._clock    = clock
+        self._entries: "OrderedDict[tuple, Tuple[EvaluationResult, float]]" \
+            = OrderedDict()
+        self._lock     = threading.Lock()
+        self._revision = self.model.revision
+        # Snap by multiplying with the inverse step and dividing back, so
+        # that e.g. 52 / 10.0 gives exactly 5.2 rather than 52 * 0.1.
+        self._scales   = {name: 1.0 / step if step else None
+                          for name, step in self.precision.items()}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def quantize(self, hr: float, pc: float, dist: float,
+                 **inputs: float) -> tuple:
+        """Cache key of an input: the step index of each rule input."""
+        values = {'heart_rate': hr, 'pacing': pc, 'distance': dist, **inputs}
+        return self._key(values, self.model.rule_inputs)
+
+    def _key(self, values: dict, names: tuple) -> tuple:
+        key = []
+        for name in names:
+            x, scale = values[name], self._scales.get(name)
+            key.append(float(x) if scale is None else math.floor(x * scale + 0.5))
+        return tuple(key)
+
+    def evaluate(self, hr: float, pc: float, dist: float,
+                 **inputs: float) -> EvaluationResult:
+        # The revision is read once: a result computed while the model
+        # changes must not be stored (see the insert below).
+        revision = self.model.revision
+        # Inputs on or outside a range edge fire no rule in the plain
+        # engine either; evaluate them as given rather than caching a
+        # snapped neighbour's result under their key.
+        # Missing inputs are reported by the engine.
+        values = {'heart_rate': hr, 'pacing': pc, 'distance': dist, **inputs}
+        names  = self.model.rule_inputs
+        if not all(name in values for name in names):
+            return self.engine.evaluate(hr, pc, dist, **inputs)
+        bounds = [self.model.input_ranges[name] for name in names]
+        if not all(lo < values[name] < hi
+                   for name, (lo, hi) in zip(names, bounds)):
+            return self.engine.evaluate(hr, pc, dist, **inputs)
+
+        metrics = self.engine.metrics
+        key = self._key(values, names)
+        now = self._clock()
+        with self._lock:
+            if self._revision != revision:
+                self._entries.clear()
+                self._revision = revision
+                self.stats.invalidations += 1
+            entry = self._entries.get(key)
+            if entry is not None:
+                result, expires = entry
+                if expires > now:
+                    self._entries.move_to_end(key)
+                    self.stats.hits += 1
+                    if metrics is not None:
+                        metrics.count('cache_hits')
+                    return result
+                del self._entries[key]
+                self.stats.expirations += 1
+            self.stats.misses += 1
+        if metrics is not None:
+            metrics.count('cache_misses')
+
+        # Snapping can round an inner input onto the edge, where no rule
+        # fires; keep the point just inside, as SurfaceEngine's nodes are.
+        snapped = dict(values)
+        for name, k, (lo, hi) in zip(names, key, bounds):
+            scale = self._scales.get(name)
+            if scale is not None:
+                eps = 1e-9 * (hi - lo)
+                snapped[name] = min(max(k / scale, lo + eps), hi - eps)
+        result  = self.engine.evaluate(
+            snapped.pop('heart_rate'), snapped.pop('pacing'),
+            snapped.pop('distance'), **snapped)
+        expires = now + self.ttl if self.ttl is not None else math.inf
+
+        with self._lock:
+            if self.model.revision != revision or self._revision != revision:
+                return result
+            self._entries[key] = (result, expires)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+                if metrics is not None:
+                    metrics.count('cache_evictions')
+        return result
+
+    def evaluate_batch(self, hr, pc, dist, chunk_size: Optional[int] = None,
+                       **inputs):
+        """Uncached; the vectorised path is already cheaper than lookups."""
+        return self.engine.evaluate_batch(hr, pc, dist, chunk_size, **inputs)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
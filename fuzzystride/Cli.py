@@ -0,0 +1,357 @@
+import argparse
+import json
+import sys
+from typing import List, Optional
+
+from fuzzystride.Accuracy import (
+    DEFAULT_REFERENCE_SAMPLES, PATHS, run_accuracy,
+)
+from fuzzystride.Batch import (
+    DEFAULT_CHUNK_SIZE, DEFAULT_MAX_BATCH, DEFAULT_MAX_WAIT, INPUT_FIELDS,
+    RecordWriter, detect_format, open_text, run_batch,
+)
+from fuzzystride.FuzzyEngine import FuzzyEngine
+from fuzzystride.FuzzyModel import FuzzyModel
+from fuzzystride.Snapshot import MAGIC, load_snapshot, save_snapshot
+from fuzzystride.SurfaceEngine import SurfaceEngine
+from fuzzystride.SugenoEngine import SugenoEngine
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m fuzzystride",
+        description="Headless FuzzyStride tools.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    batch = commands.add_parser(
+        "batch", help="Evaluate a CSV/JSONL workout log in streaming chunks.")
+    batch.add_argument("input",
+                       help="input file, '-' for stdin; .gz is decompressed")
+    batch.add_argument("-o", "--output", default="-",
+                       help="output file (default: stdout)")
+    batch.add_argument("--input-format", choices=("csv", "jsonl"),
+                       help="default: from the file suffix, else csv")
+    batch.add_argument("--output-format", choices=("csv", "jsonl"),
+                       help="default: from the file suffix, else the input format")
+    batch.add_argument("--rejects",
+                       help="JSONL file for rejected rows (default: stderr)")
+    batch.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                       help=f"rows per evaluation chunk (default: {DEFAULT_CHUNK_SIZE})")
+    batch.add_argument("--columns", metavar="HR,PACE,DIST",
+                       help="input column names (default: heart_rate,pacing,distance)")
+    _add_engine_arguments(batch)
+    batch.set_defaults(handler=_run_batch)
+
+    accuracy = commands.add_parser(
+        "accuracy", help="Compare the fast evaluation paths with skfuzzy "
+                         "and FuzzyEngine.evaluate.")
+    accuracy.add_argument("--paths", default=",".join(PATHS),
+                          help=f"comma-separated subset of {', '.join(PATHS)}")
+    accuracy.add_argument("--grid", metavar="HR,PACE,DIST", default="10,10,10",
+                          help="grid points per input (default: 10,10,10)")
+    accuracy.add_argument("--samples", type=int, default=2000,
+                          help="random samples on top of the grid (default: 2000)")
+    accuracy.add_argument("--reference-samples", type=int,
+                          default=DEFAULT_REFERENCE_SAMPLES,
+                          help="points evaluated by the slow skfuzzy reference "
+                               f"(default: {DEFAULT_REFERENCE_SAMPLES})")
+    accuracy.add_argument("--seed", type=int, default=0)
+    accuracy.add_argument("--surface-cache",
+                          help="directory for the surface table cache")
+    accuracy.add_argument("--json", dest="json_path",
+                          help="also write the report as JSON to this file")
+    accuracy.add_argument("--rules", help="JSON/TOML rule base file")
+    accuracy.set_defaults(handler=_run_accuracy)
+
+    serve = commands.add_parser(
+        "serve", help="Run the HTTP inference service.")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8000)
+    serve.add_argument("--max-batch", type=int, default=DEFAULT_MAX_BATCH,
+                       help="rows per micro-batch (default: %(default)s)")
+    serve.add_argument("--max-wait-ms", type=float,
+                       default=DEFAULT_MAX_WAIT * 1e3,
+                       help="longest a request waits for its micro-batch to "
+                            "fill (default: %(default)s)")
+    _add_engine_arguments(serve)
+    serve.set_defaults(handler=_run_serve)
+
+    tune = commands.add_parser(
+        "tune", help="Fit MF breakpoints (and rule consequents) to labelled "
+                     "workouts.")
+    tune.add_argument("input", help="labelled CSV/JSONL workouts")
+    tune.add_argument("-o", "--output", default="tuned-model.json",
+                      help="tuned model file (default: %(default)s)")
+    tune.add_argument("--label-column", default="status",
+                      help="status label column (default: %(default)s)")
+    tune.add_argument("--target-column",
+                      help="crisp target column, for the mse loss")
+    # Checked in _run_tune, so that the parser does not import Tuning.
+    tune.add_argument("--loss", default="membership",
+                      help="error_rate, membership or mse (default: %(default)s)")
+    tune.add_argument("--strategy", default="evolutionary",
+                      help="grid, random or evolutionary (default: %(default)s)")
+    tune.add_argument("--variables", default="heart_rate,pacing,distance",
+                      help="variables whose breakpoints are tuned "
+                           "(default: %(default)s)")
+    tune.add_argument("--params", metavar="VAR.TERM.a|b|c,...",
+                      help="tune only these breakpoints (overrides --variables)")
+    tune.add_argument("--spread", type=float, default=0.15,
+                      help="search width around each breakpoint, as a "
+                           "fraction of its range (default: %(default)s)")
+    tune.add_argument("--tune-rules", action="store_true",
+                      help="also search the rule consequents")
+    tune.add_argument("--population", type=int, default=32)
+    tune.add_argument("--budget", type=int, default=2000,
+                      help="maximum candidate evaluations (default: %(default)s)")
+    tune.add_argument("--grid-levels", type=int, default=5)
+    tune.add_argument("--patience", type=int, default=10,
+                      help="generations without improvement before stopping; "
+                           "0 disables early stopping (default: %(default)s)")
+    tune.add_argument("--target-loss", type=float)
+    tune.add_argument("--workers", type=int,
+                      help="worker processes (default: CPU count)")
+    tune.add_argument("--seed", type=int, default=0)
+    tune.add_argument("--checkpoint", help="checkpoint file, written every generation")
+    tune.add_argument("--resume", action="store_true",
+                      help="continue from --checkpoint")
+    tune.add_argument("--method", choices=FuzzyEngine.DEFUZZ_METHODS,
+                      default="centroid", help="defuzzification method")
+    tune.add_argument("--rules", help="JSON/TOML rule base file")
+    tune.set_defaults(handler=_run_tune)
+
+    activity = commands.add_parser(
+        "activity", help="Turn a GPX/TCX activity into a per-split "
+                         "training-status timeline.")
+    activity.add_argument("input", help="GPX or TCX file; .gz is decompressed")
+    activity.add_argument("-o", "--output", default="-",
+                          help="output file (default: stdout)")
+    activity.add_argument("--output-format", choices=("csv", "jsonl"),
+                          help="default: from the file suffix, else csv")
+    splitting = activity.add_mutually_exclusive_group()
+    splitting.add_argument("--split-km", type=float,
+                           help="split length in km (default: 1)")
+    splitting.add_argument("--interval", type=float,
+                           help="split every this many seconds instead")
+    _add_engine_arguments(activity)
+    activity.set_defaults(handler=_run_activity)
+
+    snapshot = commands.add_parser(
+        "snapshot", help="Write a memory-mappable model snapshot.")
+    snapshot.add_argument("output", help="snapshot file (e.g. model.fzs)")
+    snapshot.add_argument("--surface", metavar="HR,PACE,DIST",
+                          help="also store a precomputed surface table with "
+                               "this many nodes per input (e.g. 91,61,85)")
+    _add_engine_arguments(snapshot)
+    snapshot.set_defaults(handler=_run_snapshot)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = build_parser()
+    args   = parser.parse_args(argv)
+    return args.handler(parser, args)
+
+
+def _add_engine_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--method",
+                        choices=(*FuzzyEngine.DEFUZZ_METHODS, "sugeno"),
+                        default="centroid",
+                        help="defuzzification method, or 'sugeno' for the "
+                             "weighted-average Takagi-Sugeno engine")
+    parser.add_argument("--rules", help="JSON/TOML rule base file")
+    parser.add_argument("--model",
+                        help="tuned model file written by 'tune', or a "
+                             "snapshot written by 'snapshot' (replaces --rules)")
+
+
+def _load_model(parser, args, builtin_inputs: bool = True) -> FuzzyModel:
+    path = getattr(args, 'model', None)
+    try:
+        if not path:
+            model = FuzzyModel(args.rules)
+        else:
+            with open(path, 'rb') as f:
+                is_snapshot = f.read(len(MAGIC)) == MAGIC
+            if is_snapshot:
+                model = load_snapshot(path).model
+            else:
+                from fuzzystride.Tuning import load_model
+                model = load_model(path)
+    except ValueError as exc:
+        parser.error(str(exc))
+    # The tools read one column (or grid axis) per built-in input, so a
+    # rule base over other inputs is refused here rather than mid-run.
+    known = [name for name, _ in INPUT_FIELDS]
+    extra = [name for name in model.rule_inputs if name not in known]
+    if extra and builtin_inputs:
+        parser.error(
+            f"the rule base uses input(s) {', '.join(extra)}; the command "
+            f"line only reads {', '.join(known)}.")
+    return model
+
+
+def _build_engine(parser, args) -> FuzzyEngine:
+    model = _load_model(parser, args)
+    if args.method == "sugeno":
+        return SugenoEngine(model)
+    return FuzzyEngine(model, args.method)
+
+
+def _run_batch(parser, args) -> int:
+    columns = None
+    if args.columns:
+        names = [name.strip() for name in args.columns.split(",")]
+        if len(names) != len(INPUT_FIELDS):
+            parser.error("--columns needs three comma-separated names.")
+        columns = dict(zip((name for name, _ in INPUT_FIELDS), names))
+
+    stats = run_batch(
+        _build_engine(parser, args), args.input, args.output,
+        input_format  = args.input_format,
+        output_format = args.output_format,
+        rejects_path  = args.rejects,
+        chunk_size    = args.chunk_size,
+        columns       = columns,
+    )
+    print(f"{stats.rows} rows: {stats.evaluated} evaluated, "
+          f"{stats.rejected} rejected in {stats.elapsed:.2f} s "
+          f"({stats.rows_per_second:,.0f} rows/s)", file=sys.stderr)
+    return 0
+
+
+def _run_accuracy(parser, args) -> int:
+    paths = [name.strip() for name in args.paths.split(",") if name.strip()]
+    for name in paths:
+        if name not in PATHS:
+            parser.error(f"unknown path '{name}'; choose from {', '.join(PATHS)}.")
+    try:
+        grid = [int(n) for n in args.grid.split(",")]
+    except ValueError:
+        grid = []
+    if len(grid) != 3:
+        parser.error("--grid needs three comma-separated integers.")
+
+    report = run_accuracy(
+        _load_model(parser, args), paths,
+        grid              = grid,
+        samples           = args.samples,
+        reference_samples = args.reference_samples,
+        seed              = args.seed,
+        surface_cache     = args.surface_cache,
+    )
+    print(report.format_table())
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report.to_dict(), f, indent=2)
+    return 0
+
+
+def _run_serve(parser, args) -> int:
+    from fuzzystride.Server import serve
+    if args.max_batch < 1 or args.max_wait_ms < 0:
+        parser.error("--max-batch must be positive and --max-wait-ms >= 0.")
+    serve(_build_engine(parser, args), args.host, args.port,
+          max_batch = args.max_batch,
+          max_wait  = args.max_wait_ms / 1e3)
+    return 0
+
+
+def _run_tune(parser, args) -> int:
+    from fuzzystride.Tuning import (
+        LOSSES, STRATEGIES, ParameterSpace, Tuner, export_model, load_dataset,
+    )
+    if args.loss not in LOSSES:
+        parser.error(f"--loss must be one of {', '.join(LOSSES)}.")
+    if args.strategy not in STRATEGIES:
+        parser.error(f"--strategy must be one of {', '.join(STRATEGIES)}.")
+    if args.resume and not args.checkpoint:
+        parser.error("--resume needs --checkpoint.")
+    model   = _load_model(parser, args)
+    dataset = load_dataset(args.input, args.label_column, args.target_column,
+                           ranges=model.input_ranges)
+    params  = [p.strip() for p in args.params.split(",")] if args.params else None
+    try:
+        space = ParameterSpace(
+            model, [v.strip() for v in args.variables.split(",")], params,
+            spread=args.spread, rules=args.tune_rules)
+        tuner = Tuner(
+            dataset, space,
+            loss          = args.loss,
+            strategy      = args.strategy,
+            workers       = args.workers,
+            defuzz_method = args.method,
+            rules_path    = args.rules,
+            population    = args.population,
+            budget        = args.budget,
+            grid_levels   = args.grid_levels,
+            patience      = args.patience or None,
+            target_loss   = args.target_loss,
+            seed          = args.seed,
+            checkpoint    = args.checkpoint,
+            progress      = lambda generation, evaluations, loss: print(
+                f"generation {generation}: {evaluations} evaluated, "
+                f"best {args.loss} {loss:.6f}", file=sys.stderr),
+        )
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    print(f"{len(dataset)} workouts ({dataset.skipped} skipped), "
+          f"{len(space)} parameters", file=sys.stderr)
+    with tuner:
+        result = tuner.run(resume=args.resume)
+    export_model(result, args.output, space)
+    print(f"{args.loss}: {result.initial_loss:.6f} -> {result.best_loss:.6f} "
+          f"after {result.evaluations} evaluations in {result.elapsed:.1f} s "
+          f"(stopped: {result.stopped}); model written to {args.output}",
+          file=sys.stderr)
+    return 0
+
+
+def _run_snapshot(parser, args) -> int:
+    if args.method == "sugeno":
+        parser.error("snapshots store Mamdani models; choose a --method "
+                     "defuzzification method.")
+    surface = None
+    if args.surface:
+        try:
+            shape = tuple(int(n) for n in args.surface.split(","))
+        except ValueError:
+            shape = ()
+        if len(shape) != 3:
+            parser.error("--surface needs three comma-separated integers.")
+        surface = SurfaceEngine(_build_engine(parser, args), shape)
+        model   = surface.engine.model
+    else:
+        model   = _load_model(parser, args, builtin_inputs=False)
+    save_snapshot(args.output, model, surface)
+    print(f"Snapshot of model {model.parameter_hash()} written to "
+          f"{args.output}", file=sys.stderr)
+    return 0
+
+
+def _run_activity(parser, args) -> int:
+    from fuzzystride.Activity import DEFAULT_SPLIT_KM, activity_timeline
+    split_km = DEFAULT_SPLIT_KM if args.split_km is None else args.split_km
+    if args.interval is not None and args.interval <= 0 or split_km <= 0:
+        parser.error("--split-km and --interval must be positive.")
+    engine = _build_engine(parser, args)
+    fmt    = args.output_format or detect_format(args.output)
+    stream = open_text(args.output, 'w')
+    counts = {}
+    try:
+        writer = RecordWriter(stream, fmt)
+        for split in activity_timeline(engine, args.input, split_km,
+                                       args.interval):
+            writer.write([split.to_record()])
+            key = split.status or "flagged"
+            counts[key] = counts.get(key, 0) + 1
+    finally:
+        if stream is sys.stdout:
+            stream.flush()
+        else:
+            stream.close()
+    summary = ", ".join(f"{n} {status}" for status, n in counts.items())
+    print(f"{sum(counts.values())} splits: {summary or 'none'}", file=sys.stderr)
+    return 0
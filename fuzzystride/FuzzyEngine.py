@@ -0,0 +1,540 @@
+import threading
+import numpy as np
+from dataclasses import dataclass, field
+from itertools import product
+from typing import Dict, List, Optional, Tuple
+
+from fuzzystride.FuzzyModel import FuzzyModel, STATUS_TERMS, trimf_degree
+from fuzzystride.Instrumentation import Instrumentation
+
+
+class EmptyMembershipError(ValueError):
+    def __init__(self):
+        super().__init__(
+            "No rule fired; the aggregated membership area is empty.")
+
+
+class EvaluationResult:
+    """Result of ``FuzzyEngine.evaluate``.
+
+    Only the scores are stored eagerly; the fired rules are kept as a bit
+    mask (bit i - 1 for rule i) plus their strengths. ``activated_rules``,
+    ``agg_values`` and ``aggregated_mf`` are rendered on each access.
+    """
+    __slots__ = ('heart_rate', 'pacing', 'distance', 'crisp_value', 'status',
+                 'recommendation', 'membership_degrees', 'rule_mask',
+                 'output_strengths', '_fired', '_engine', '_out_mfs')
+
+    def __init__(self, heart_rate: float, pacing: float, distance: float,
+                 crisp_value: float, status: str, recommendation: str,
+                 membership_degrees: Dict[str, float], fired: list,
+                 output_strengths: Dict[str, float], engine: "FuzzyEngine"):
+        self.heart_rate         = heart_rate
+        self.pacing             = pacing
+        self.distance           = distance
+        self.crisp_value        = crisp_value
+        self.status             = status
+        self.recommendation     = recommendation
+        self.membership_degrees = membership_degrees
+        self.output_strengths   = output_strengths
+        self.rule_mask          = sum(1 << (idx - 1) for idx, *_ in fired)
+        self._fired             = fired
+        self._engine            = engine
+        self._out_mfs           = engine._out_mfs
+
+    def __repr__(self) -> str:
+        return (f"EvaluationResult(heart_rate={self.heart_rate!r}, "
+                f"pacing={self.pacing!r}, distance={self.distance!r}, "
+                f"crisp_value={self.crisp_value!r}, status={self.status!r})")
+
+    @property
+    def activated_rules(self) -> List[str]:
+        return [self._engine._describe_rule(idx, terms, out_term)
+                for idx, terms, out_term, _ in self._fired]
+
+    @property
+    def rule_strengths(self) -> np.ndarray:
+        """Firing strength of every rule, 0 for rules that did not fire."""
+        strengths = np.zeros(len(self._engine.model.rule_definitions))
+        for idx, _, _, strength in self._fired:
+            strengths[idx - 1] = strength
+        return strengths
+
+    @property
+    def agg_values(self) -> Dict[str, np.ndarray]:
+        return {term: np.fmin(strength, self._out_mfs[term])
+                for term, strength in self.output_strengths.items()}
+
+    @property
+    def aggregated_mf(self) -> np.ndarray:
+        return np.max(list(self.agg_values.values()), axis=0)
+
+
+@dataclass
+class BatchResult:
+    """Columnar result of ``FuzzyEngine.evaluate_batch``.
+
+    ``status_codes`` index into ``FuzzyEngine.STATUS_LABELS``; rows where no
+    rule fired have a NaN crisp value and a status code of -1.
+    """
+    heart_rate:   np.ndarray
+    pacing:       np.ndarray
+    distance:     np.ndarray
+    crisp_values: np.ndarray
+    status_codes: np.ndarray
+    membership_degrees: Dict[str, np.ndarray] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.crisp_values)
+
+    def statuses(self) -> List[Optional[str]]:
+        labels = FuzzyEngine.STATUS_LABELS
+        return [labels[c] if c >= 0 else None for c in self.status_codes]
+
+
+class FuzzyEngine:
+    ADVICE_MAP = {
+        "Undertraining": "Increase intensity or distance gradually.",
+        "Normal":        "Maintain current training regimen.",
+        "Overtraining":  "Rest or reduce intensity to prevent injury.",
+    }
+
+    STATUS_LABELS = ("Undertraining", "Normal", "Overtraining")
+
+    # Rows evaluated per vectorised pass; bounds the (rows x universe)
+    # aggregation buffer to a few MB.
+    BATCH_CHUNK_SIZE = 16384
+
+    # Maximum absolute difference between evaluate_batch and evaluate.
+    BATCH_TOLERANCE = 1e-9
+
+    # 'centroid' integrates the aggregated output sampled on the
+    # training_status universe (skfuzzy's method); 'analytic' integrates the
+    # exact piecewise-linear aggregate between its breakpoints.
+    DEFUZZ_METHODS = ('centroid', 'analytic')
+
+    def __init__(self, model: FuzzyModel, defuzz_method: str = 'centroid',
+                 metrics: Optional[Instrumentation] = None):
+        if defuzz_method not in self.DEFUZZ_METHODS:
+            raise ValueError(
+                f"defuzz_method must be one of {self.DEFUZZ_METHODS}.")
+        self.model         = model
+        self.defuzz_method = defuzz_method
+        self.metrics       = metrics
+        self._prepare_output()
+
+    def _prepare_output(self):
+        # Output-side arrays derived from the model; rebuilt whenever the
+        # model's revision moves on.
+        model  = self.model
+        output = model.rule_output
+        self._revision     = model.revision
+        self._out_terms    = list(model.compiled_rules.output_terms)
+        self._out_params   = np.array(
+            [model.mf_params[output][t] for t in self._out_terms],
+            dtype=float)
+        self._out_universe = model.universes[output]
+        self._out_mfs      = {t: model.sampled_mf(output, t)
+                              for t in self._out_terms}
+        self._out_bounds   = (float(self._out_universe[0]),
+                              float(self._out_universe[-1]))
+        self._out_index    = {t: k for k, t in enumerate(self._out_terms)}
+        self._out_mf_matrix    = np.vstack(list(self._out_mfs.values()))
+        self._centroid_weights = _centroid_weights(self._out_universe)
+        self._status_params    = [model.mf_params[output][t]
+                                  for t in STATUS_TERMS]
+        # Per-thread scratch arrays for the scalar paths (see _scratch).
+        self._buffers = threading.local()
+        if self.defuzz_method == 'analytic':
+            self._fixed_breaks = _fixed_breakpoints(
+                self._out_params, *self._out_bounds)
+            self._edge_terms, self._edge_levels = _overlapping_pairs(
+                self._out_params)
+
+
+    def evaluate(self, hr: float, pc: float, dist: float,
+                 **inputs: float) -> EvaluationResult:
+        """Evaluate one workout.
+
+        Rule bases over further input variables take them as keyword
+        arguments named after the variables.
+        """
+        metrics = self.metrics
+        fired, strengths, crisp_value, t = self._infer(
+            self._input_values(hr, pc, dist, inputs), metrics)
+        if np.isnan(crisp_value):
+            raise EmptyMembershipError()
+
+        membership_degrees = self._membership_degrees(crisp_value)
+        status             = max(membership_degrees, key=membership_degrees.get)
+        recommendation     = self.ADVICE_MAP[status]
+        if metrics is not None:
+            metrics.lap('scalar', 'classify', t)
+
+        fired.sort()
+        return EvaluationResult(
+            heart_rate         = hr,
+            pacing             = pc,
+            distance           = dist,
+            crisp_value        = crisp_value,
+            status             = status,
+            recommendation     = recommendation,
+            membership_degrees = membership_degrees,
+            fired              = fired,
+            output_strengths   = dict(zip(self._out_terms, strengths.tolist())),
+            engine             = self,
+        )
+
+    def score(self, hr: float, pc: float, dist: float,
+              **inputs: float) -> Tuple[float, int]:
+        """``(crisp_value, status_code)`` without building a result.
+
+        For high-volume scalar callers: no rule text, curves or result
+        object are created, and the centroid reuses per-thread buffers.
+        Like ``evaluate_batch``, returns ``(nan, -1)`` when no rule fires.
+        """
+        metrics = self.metrics
+        _, _, crisp, t = self._infer(
+            self._input_values(hr, pc, dist, inputs), metrics)
+        if crisp != crisp:
+            return crisp, -1
+        degrees = [trimf_degree(crisp, abc) for abc in self._status_params]
+        if metrics is not None:
+            metrics.lap('scalar', 'classify', t)
+        return crisp, degrees.index(max(degrees))
+
+    def _input_values(self, hr, pc, dist, extra: dict) -> dict:
+        # Inputs keyed by variable name, checked against the rule base.
+        values = {'heart_rate': hr, 'pacing': pc, 'distance': dist, **extra}
+        for name in self.model.rule_inputs:
+            if name not in values:
+                raise ValueError(f"Missing input '{name}' of the rule base.")
+        return values
+
+    def _infer(self, values: Dict[str, float],
+               metrics: Optional[Instrumentation]):
+        """Fired rules, consequent strengths and crisp value of one input.
+
+        The last item is the clock reading after defuzzification (0.0 when
+        not instrumented) for the caller's classify lap.
+        """
+        m = self.model
+        if self._revision != m.revision:
+            self._prepare_output()
+        if metrics is not None:
+            t = start = metrics.clock()
+
+        # Only terms with a non-zero degree can fire a rule (at most two
+        # per input for overlapping triangles), so only their combinations
+        # are looked up instead of walking every rule.
+        active = [m.active_terms(name, values[name]) for name in m.rule_inputs]
+        if metrics is not None:
+            t = metrics.lap('scalar', 'fuzzify', t)
+
+        fired = []
+        for combination in product(*active):
+            terms           = tuple(term for term, _ in combination)
+            firing_strength = min(degree for _, degree in combination)
+            for idx, out_term in m.rule_lookup.get(terms, ()):
+                fired.append((idx, terms, out_term, firing_strength))
+        if metrics is not None:
+            t = metrics.lap('scalar', 'fire', t)
+
+        strengths = self._out_strengths(fired)
+        if metrics is not None:
+            t = metrics.lap('scalar', 'aggregate', t)
+
+        crisp = self._scalar_crisp(strengths)
+        if metrics is None:
+            return fired, strengths, crisp, 0.0
+        t = metrics.lap('scalar', 'defuzz', t)
+        metrics.observe('scalar', 'total', t - start)
+        metrics.count('evaluations')
+        metrics.count('rules_fired', len(fired))
+        if crisp != crisp:
+            metrics.count('empty_evaluations')
+        return fired, strengths, crisp, t
+
+    def _out_strengths(self, fired: list) -> np.ndarray:
+        # Strongest firing per consequent, in a per-thread (K,) buffer.
+        strengths = self._scratch().strengths
+        strengths[:] = 0.0
+        index = self._out_index
+        for _, _, out_term, firing_strength in fired:
+            k = index[out_term]
+            if firing_strength > strengths[k]:
+                strengths[k] = firing_strength
+        return strengths
+
+    def _scalar_crisp(self, strengths: np.ndarray) -> float:
+        if self.defuzz_method == 'analytic':
+            return float(self._analytic_crisp(strengths[None, :])[0])
+        scratch = self._scratch()
+        np.minimum(self._out_mf_matrix, strengths[:, None], out=scratch.clipped)
+        np.max(scratch.clipped, axis=0, out=scratch.aggregated)
+        return float(_weighted_centroid(scratch.aggregated,
+                                        self._centroid_weights))
+
+    def _scratch(self):
+        scratch = self._buffers
+        if not hasattr(scratch, 'strengths'):
+            shape = self._out_mf_matrix.shape
+            scratch.strengths  = np.zeros(shape[0])
+            scratch.clipped    = np.empty(shape)
+            scratch.aggregated = np.empty(shape[1])
+        return scratch
+
+
+    def evaluate_batch(self, hr, pc, dist, chunk_size: Optional[int] = None,
+                       **inputs) -> BatchResult:
+        """Vectorised ``evaluate``; further inputs as keyword arrays."""
+        hr   = np.asarray(hr,   dtype=float).ravel()
+        pc   = np.asarray(pc,   dtype=float).ravel()
+        dist = np.asarray(dist, dtype=float).ravel()
+        values = self._input_values(hr, pc, dist, {
+            name: np.asarray(v, dtype=float).ravel() for name, v in inputs.items()})
+        if any(len(v) != len(hr) for v in values.values()):
+            raise ValueError("All inputs must have the same length.")
+        if self._revision != self.model.revision:
+            self._prepare_output()
+
+        metrics = self.metrics
+        if metrics is not None:
+            start_time = metrics.clock()
+
+        step  = chunk_size or self.BATCH_CHUNK_SIZE
+        crisp = np.empty(len(hr))
+        for start in range(0, len(hr), step):
+            rows = slice(start, start + step)
+            crisp[rows] = self._batch_crisp(
+                {name: v[rows] for name, v in values.items()}, metrics)
+
+        if metrics is not None:
+            t = metrics.clock()
+        membership_degrees = self._membership_degrees(crisp)
+        status_codes = np.argmax(
+            np.vstack(list(membership_degrees.values())), axis=0
+        ).astype(np.int8)
+        status_codes[np.isnan(crisp)] = -1
+        if metrics is not None:
+            t = metrics.lap('batch', 'classify', t)
+            metrics.observe('batch', 'total', t - start_time)
+            metrics.count('batch_calls')
+            metrics.count('batch_rows', len(crisp))
+            metrics.count('empty_evaluations', int(np.sum(status_codes < 0)))
+
+        return BatchResult(
+            heart_rate   = hr,
+            pacing       = pc,
+            distance     = dist,
+            crisp_values = crisp,
+            status_codes = status_codes,
+            membership_degrees = membership_degrees,
+        )
+
+    def _batch_crisp(self, values: Dict[str, np.ndarray],
+                     metrics: Optional[Instrumentation] = None) -> np.ndarray:
+        m      = self.model
+        rules  = m.compiled_rules
+        if metrics is not None:
+            t = metrics.clock()
+
+        # Fuzzify every input term once for the whole chunk, then fire all
+        # rules as gathers + min and fold them per consequent. Folding per
+        # consequent is enough: max(min(s, mf)) over rules sharing a
+        # consequent equals min(max(s), mf).
+        degrees = [m.degree_matrix(name, values[name]) for name in rules.inputs]
+        if metrics is not None:
+            t = metrics.lap('batch', 'fuzzify', t)
+        firing = rules.fire(degrees)
+        if metrics is not None:
+            t = metrics.lap('batch', 'fire', t)
+            metrics.count('rules_fired', int(np.count_nonzero(firing)))
+        strengths = rules.aggregate(firing)
+        if metrics is not None:
+            t = metrics.lap('batch', 'aggregate', t)
+
+        if self.defuzz_method == 'analytic':
+            crisp = self._analytic_crisp(strengths)
+        else:
+            aggregated_mf = np.zeros((len(strengths), len(self._out_universe)))
+            for k, term in enumerate(self._out_terms):
+                np.fmax(aggregated_mf,
+                        np.fmin(strengths[:, k, None], self._out_mfs[term]),
+                        out=aggregated_mf)
+            crisp = _weighted_centroid(aggregated_mf, self._centroid_weights)
+        if metrics is not None:
+            metrics.lap('batch', 'defuzz', t)
+        return crisp
+
+    def _analytic_crisp(self, strengths: np.ndarray) -> np.ndarray:
+        """Exact centroid of max_k min(strengths[:, k], trimf_k) per row.
+
+        The aggregate is piecewise linear with kinks only at the term
+        parameters, at edge/edge crossings between terms (both fixed) and
+        where an edge reaches one of the clip levels (per row). Integrating
+        the polyline through all of those points is therefore exact.
+        """
+        lo, hi  = self._out_bounds
+        a, b, c = self._out_params.T
+        n       = len(strengths)
+
+        # Edges of term k can only meet clip level m where their supports
+        # overlap, so only those (k, m) pairs are generated.
+        terms, levels = self._edge_terms, strengths[:, self._edge_levels]
+        xs = np.concatenate([
+            np.broadcast_to(self._fixed_breaks, (n, len(self._fixed_breaks))),
+            a[terms] + levels * (b - a)[terms],
+            c[terms] - levels * (c - b)[terms],
+        ], axis=1)
+        xs = np.sort(np.clip(xs, lo, hi), axis=1)
+
+        ys = np.zeros_like(xs)
+        for k, (a_k, b_k, c_k) in enumerate(self._out_params):
+            degree = (xs - a_k) / (b_k - a_k)
+            np.minimum(degree, (c_k - xs) / (c_k - b_k), out=degree)
+            np.minimum(degree, strengths[:, k, None], out=degree)
+            np.maximum(ys, degree, out=ys)
+        return _centroid(xs, ys)
+
+
+    def _describe_rule(self, idx: int, terms: tuple, out_term: str) -> str:
+        m = self.model
+        clauses = " AND ".join(
+            f"{_variable_label(name)} is {term.capitalize()}"
+            for name, term in zip(m.rule_inputs, terms))
+        return (f"Rule {idx}: IF {clauses} "
+                f"THEN {_variable_label(m.rule_output)} is "
+                f"{out_term.capitalize()}")
+
+    def _membership_degrees(self, crisp: float) -> Dict[str, float]:
+        degrees = self.model.fuzzify(self.model.rule_output, crisp)
+        return {label: degrees[term]
+                for label, term in zip(self.STATUS_LABELS, STATUS_TERMS)}
+
+
+def _variable_label(name: str) -> str:
+    return name.replace('_', ' ').title()
+
+
+def _centroid(x: np.ndarray, mf: np.ndarray) -> np.ndarray:
+    """Row-wise centroid of the polyline through ``(x, mf)``.
+
+    Same piecewise-linear integration as ``skfuzzy.defuzzify.centroid``,
+    vectorised over the leading axes. Rows with zero area give NaN.
+    """
+    x1, x2 = x[..., :-1], x[..., 1:]
+    y1, y2 = mf[..., :-1], mf[..., 1:]
+    dx     = x2 - x1
+
+    area   = (0.5 * dx * (y1 + y2)).sum(axis=-1)
+    moment = (dx / 6.0 * (y1 * (2 * x1 + x2) + y2 * (x1 + 2 * x2))).sum(axis=-1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(area > 0, moment / area, np.nan)
+
+
+def _centroid_weights(x: np.ndarray) -> np.ndarray:
+    """(2, len(x)) weights turning ``_centroid(x, mf)`` into two dot products.
+
+    On a fixed grid the polyline's area and moment are linear in the
+    samples: ``area = mf @ w[0]`` and ``moment = mf @ w[1]``.
+    """
+    dx = np.diff(x)
+    weights = np.zeros((2, len(x)))
+    weights[0, :-1] += 0.5 * dx
+    weights[0, 1:]  += 0.5 * dx
+    weights[1, :-1] += dx / 6.0 * (2 * x[:-1] + x[1:])
+    weights[1, 1:]  += dx / 6.0 * (x[:-1] + 2 * x[1:])
+    return weights
+
+
+def _weighted_centroid(mf: np.ndarray, weights: np.ndarray):
+    area, moment = mf @ weights[0], mf @ weights[1]
+    if np.ndim(area) == 0:
+        return moment / area if area > 0 else np.nan
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(area > 0, moment / area, np.nan)
+
+
+def _fixed_breakpoints(params: np.ndarray, lo: float,
+                       hi: float) -> np.ndarray:
+    """Input-independent kinks of an aggregate of clipped ``trimf`` terms."""
+    a, b, c = params.T
+    if np.any(a >= b) or np.any(b >= c):
+        raise ValueError(
+            "Analytic defuzzification requires a < b < c for every "
+            "output term.")
+
+    slopes     = np.concatenate([1 / (b - a), -1 / (c - b)])
+    intercepts = np.concatenate([-a / (b - a), c / (c - b)])
+    owners     = np.concatenate([np.arange(len(a)), np.arange(len(a))])
+    points     = [lo, hi, *params.ravel()]
+    for i in range(len(slopes)):
+        for j in range(i + 1, len(slopes)):
+            if slopes[i] == slopes[j]:
+                continue
+            x = (intercepts[j] - intercepts[i]) / (slopes[i] - slopes[j])
+            p, q = owners[i], owners[j]
+            if max(a[p], a[q]) < x < min(c[p], c[q]):
+                points.append(x)
+    return np.unique(np.clip(points, lo, hi))
+
+
+def _overlapping_pairs(params: np.ndarray):
+    """(term, level) index pairs whose supports overlap, including k == m."""
+    a, c  = params[:, 0], params[:, 2]
+    terms, levels = np.nonzero(
+        (a[:, None] < c[None, :]) & (a[None, :] < c[:, None]))
+    return terms, levels
+
+
+def validate_input(value_str: str, min_val: float,
+                   max_val: float, param_name: str) -> float:
+  
+    if not value_str.strip():
+        raise ValueError(f"{param_name} cannot be empty.")
+    try:
+        value = float(value_str.strip())
+    except ValueError:
+        raise ValueError(f"{param_name} must be a number (integer or decimal).")
+    if not (min_val <= value <= max_val):
+        raise ValueError(
+            f"{param_name} must be between {min_val} and {max_val}.")
+    return value
+
+
+def validate_batch(values, min_val: float, max_val: float,
+                   param_name: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Vectorised ``validate_input`` that reports instead of raising.
+
+    Returns ``(parsed, errors)``: ``parsed`` is a float array with NaN in
+    invalid rows and ``errors`` an object array holding the
+    ``validate_input`` message for each invalid row and None elsewhere.
+    """
+    values  = np.asarray(values, dtype=object).ravel()
+    errors  = np.full(len(values), None, dtype=object)
+    # The cast below would read None as NaN, so missing cells are flagged
+    # first to get the same message as in validate_input.
+    invalid = np.equal(values, None)
+    errors[invalid] = f"{param_name} cannot be empty."
+    try:
+        parsed = np.where(invalid, np.nan, values).astype(float)
+    except (TypeError, ValueError):
+        # Slow path only for chunks that contain unparsable cells.
+        parsed = np.full(len(values), np.nan)
+        for i, raw in enumerate(values):
+            text = "" if raw is None else str(raw).strip()
+            if not text:
+                errors[i], invalid[i] = f"{param_name} cannot be empty.", True
+                continue
+            try:
+                parsed[i] = float(text)
+            except ValueError:
+                errors[i] = f"{param_name} must be a number (integer or decimal)."
+                invalid[i] = True
+
+    out_of_range = ~invalid & ~((parsed >= min_val) & (parsed <= max_val))
+    errors[out_of_range] = f"{param_name} must be between {min_val} and {max_val}."
+    invalid |= out_of_range
+    parsed[invalid] = np.nan
+    return parsed, errors
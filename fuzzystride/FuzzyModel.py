@@ -0,0 +1,415 @@
+import hashlib
+import json
+import math
+import numpy as np
+from bisect import bisect_left, bisect_right
+from functools import cached_property, lru_cache, reduce
+from operator import and_
+from typing import Dict, List, Optional, Tuple
+
+from fuzzystride.RuleBase import CompiledRules, compile_rules, load_rule_base
+
+
+# Rule table: one row per rule, antecedent terms in RULE_INPUTS order
+# followed by the RULE_OUTPUT term. The skfuzzy rules and the compiled
+# index arrays are both generated from it.
+RULE_INPUTS = ('distance', 'pacing', 'heart_rate')
+RULE_OUTPUT = 'training_status'
+# Output terms the engine classifies into, in FuzzyEngine.STATUS_LABELS
+# order; a rule base's output variable may have more terms, not fewer.
+STATUS_TERMS = ('undertraining', 'normal', 'overtraining')
+RULE_DEFINITIONS = [
+    # --- Short distance ---
+    ('short',  'slow',     'low',      'undertraining'),
+    ('short',  'slow',     'moderate', 'undertraining'),
+    ('short',  'slow',     'high',     'normal'),
+    ('short',  'moderate', 'low',      'undertraining'),
+    ('short',  'moderate', 'moderate', 'normal'),
+    ('short',  'moderate', 'high',     'normal'),
+    ('short',  'fast',     'low',      'normal'),
+    ('short',  'fast',     'moderate', 'normal'),
+    ('short',  'fast',     'high',     'overtraining'),
+    # --- Medium distance ---
+    ('medium', 'slow',     'low',      'undertraining'),
+    ('medium', 'slow',     'moderate', 'normal'),
+    ('medium', 'slow',     'high',     'normal'),
+    ('medium', 'moderate', 'low',      'normal'),
+    ('medium', 'moderate', 'moderate', 'normal'),
+    ('medium', 'moderate', 'high',     'overtraining'),
+    ('medium', 'fast',     'low',      'normal'),
+    ('medium', 'fast',     'moderate', 'overtraining'),
+    ('medium', 'fast',     'high',     'overtraining'),
+    # --- Long distance ---
+    ('long',   'slow',     'low',      'normal'),
+    ('long',   'slow',     'moderate', 'normal'),
+    ('long',   'slow',     'high',     'overtraining'),
+    ('long',   'moderate', 'low',      'normal'),
+    ('long',   'moderate', 'moderate', 'overtraining'),
+    ('long',   'moderate', 'high',     'overtraining'),
+    ('long',   'fast',     'low',      'normal'),
+    ('long',   'fast',     'moderate', 'overtraining'),
+    ('long',   'fast',     'high',     'overtraining'),
+]
+
+# Ranges of the built-in inputs; variables added by a rule file default
+# to the span of their terms.
+DEFAULT_INPUT_RANGES = {
+    'heart_rate': (100, 190),
+    'pacing':     (3.0, 9.0),
+    'distance':   (0,   42),
+}
+OUTPUT_RANGE   = (0, 1)
+# Sampling step of each variable's universe; other variables get about a
+# hundred or more samples per range (see _universe_step).
+UNIVERSE_STEPS = {
+    'heart_rate':      0.1,
+    'pacing':          0.1,
+    'distance':        0.1,
+    'training_status': 0.01,
+}
+
+
+class FuzzyModel:
+    """Membership functions and rule base of the training-status system.
+
+    Construction only needs NumPy. The skfuzzy ``Antecedent``/``Consequent``
+    variables, ``rules``, ``control_system`` and ``simulation`` are built on
+    first access, so headless callers never import skfuzzy.
+
+    ``mf_params`` replaces the [a, b, c] parameters of the given terms
+    (``{'heart_rate': {'low': (95, 110, 128), ...}}``) and ``input_ranges``
+    the range of the given inputs; their universes follow the ranges.
+    A rule file may also define variables (``mf_params``, replacing a
+    variable's terms as a whole) and their ``input_ranges``, so rule bases
+    over other or more inputs need no code changes.
+
+    ``revision`` is bumped by ``set_membership`` and ``set_rules`` so that
+    engines and caches holding derived state can tell it is stale.
+    """
+
+    # Lazily built skfuzzy objects, dropped whenever the model changes.
+    _LAZY_ATTRIBUTES = ('heart_rate', 'pacing', 'distance', 'training_status',
+                        '_skfuzzy_variables', 'rules', 'control_system',
+                        'simulation')
+
+    def __init__(self, rules_path: Optional[str] = None,
+                 mf_params: Optional[Dict[str, Dict[str, tuple]]] = None,
+                 input_ranges: Optional[Dict[str, Tuple[float, float]]] = None):
+        self.revision = 0
+        if rules_path is None:
+            inputs, output, definitions = RULE_INPUTS, RULE_OUTPUT, RULE_DEFINITIONS
+            file_params, file_ranges = {}, {}
+        else:
+            inputs, output, definitions, file_params, file_ranges = \
+                load_rule_base(rules_path)
+        self._build_membership_functions()
+        for var_name, terms in file_params.items():
+            self._define_variable(var_name, terms)
+        self._build_variables({**file_ranges, **(input_ranges or {})}, output)
+        for var_name, terms in (mf_params or {}).items():
+            for term, abc in terms.items():
+                self._set_params(var_name, term, abc)
+        self._set_rule_base(inputs, output, definitions)
+        self._build_rule_index()
+
+    @classmethod
+    def from_compiled(cls, mf_params: Dict[str, Dict[str, tuple]],
+                      input_ranges: Dict[str, Tuple[float, float]],
+                      rule_definitions, compiled_rules: CompiledRules
+                      ) -> "FuzzyModel":
+        """Model around an already compiled rule base (e.g. from a snapshot).
+
+        ``mf_params`` must list every variable and term, in the order the
+        rules were compiled with.
+        """
+        model = cls.__new__(cls)
+        model.revision = 0
+        model.mf_params = {var: {term: tuple(abc) for term, abc in terms.items()}
+                           for var, terms in mf_params.items()}
+        model._build_variables(input_ranges, compiled_rules.output)
+        model.rule_inputs      = tuple(compiled_rules.inputs)
+        model.rule_output      = compiled_rules.output
+        model.rule_definitions = [tuple(row) for row in rule_definitions]
+        model.compiled_rules   = compiled_rules
+        model._check_output(model.rule_output)
+        model._build_rule_index()
+        return model
+
+    def _build_variables(self, input_ranges=None, output: str = RULE_OUTPUT):
+        # Every variable with terms other than the output is an input.
+        input_ranges = input_ranges or {}
+        for name, (lo, hi) in input_ranges.items():
+            if name not in self.mf_params or name == output:
+                raise ValueError(f"Unknown input variable '{name}'.")
+            if not lo < hi:
+                raise ValueError(f"Range of '{name}' must satisfy low < high.")
+        self.input_ranges = {
+            name: tuple(input_ranges.get(name)
+                        or DEFAULT_INPUT_RANGES.get(name)
+                        or _span(terms))
+            for name, terms in self.mf_params.items() if name != output
+        }
+        output_range = OUTPUT_RANGE if output == RULE_OUTPUT \
+            else _span(self.mf_params[output])
+        # Universes are shared (read-only) between models with equal ranges.
+        self.universes = {
+            name: _universe(lo, hi, _universe_step(name, lo, hi))
+            for name, (lo, hi) in {**self.input_ranges,
+                                   output: output_range}.items()
+        }
+
+    # skfuzzy variables (lazy)
+    @cached_property
+    def heart_rate(self):
+        return self.skfuzzy_variable('heart_rate')
+
+    @cached_property
+    def pacing(self):
+        return self.skfuzzy_variable('pacing')
+
+    @cached_property
+    def distance(self):
+        return self.skfuzzy_variable('distance')
+
+    @cached_property
+    def training_status(self):
+        return self.skfuzzy_variable('training_status')
+
+    def skfuzzy_variable(self, var_name: str):
+        """skfuzzy ``Antecedent``/``Consequent`` of any variable (built once)."""
+        variables = self.__dict__.setdefault('_skfuzzy_variables', {})
+        if var_name not in variables:
+            variables[var_name] = self._build_skfuzzy_variable(var_name)
+        return variables[var_name]
+
+    def _build_skfuzzy_variable(self, var_name: str):
+        import skfuzzy as fuzz
+        from skfuzzy import control as ctrl
+
+        kind = ctrl.Consequent if var_name == self.rule_output else ctrl.Antecedent
+        var  = kind(self.universes[var_name], var_name)
+        for term, abc in self.mf_params[var_name].items():
+            var[term] = fuzz.trimf(var.universe, abc)
+        return var
+
+    # Membership Functions
+    def _build_membership_functions(self):
+        # Analytic [a, b, c] parameters of every trimf term; sampled MFs
+        # and the skfuzzy terms are derived from these.
+        self.mf_params = {
+            'heart_rate': {
+                'low':      (100, 120, 135),
+                'moderate': (130, 145, 165),
+                'high':     (160, 175, 190),
+            },
+            'pacing': {
+                'fast':     (3.0, 3.8, 4.6),
+                'moderate': (4.4, 5.6, 6.8),
+                'slow':     (6.4, 7.8, 9.0),
+            },
+            'distance': {
+                'short':    (0,  4,  10),
+                'medium':   (8,  18, 28),
+                'long':     (25, 35, 42),
+            },
+            'training_status': {
+                'undertraining': (0.0, 0.2,  0.5),
+                'normal':        (0.3, 0.55, 0.8),
+                'overtraining':  (0.6, 0.8,  1.0),
+            },
+        }
+
+    def sampled_mf(self, var_name: str, term: str) -> np.ndarray:
+        """``term`` sampled on the universe of ``var_name`` (as fuzz.trimf)."""
+        return trimf_degree(self.universes[var_name],
+                            self.mf_params[var_name][term])
+
+    def membership(self, var_name: str, term: str, x):
+        return trimf_degree(x, self.mf_params[var_name][term])
+
+    def fuzzify(self, var_name: str, x) -> Dict[str, float]:
+        return {term: trimf_degree(x, abc)
+                for term, abc in self.mf_params[var_name].items()}
+
+    def degree_matrix(self, var_name: str, x) -> np.ndarray:
+        """(len(x), terms) degrees, columns in ``mf_params`` term order."""
+        return np.column_stack(
+            [trimf_degree(np.asarray(x, dtype=float), abc)
+             for abc in self.mf_params[var_name].values()])
+
+    # Rule Base
+    def _set_rule_base(self, inputs, output, definitions):
+        for name in (*inputs, output):
+            if name not in self.mf_params:
+                raise ValueError(f"Rule base refers to unknown variable '{name}'.")
+        self._check_output(output)
+
+        self.rule_inputs      = tuple(inputs)
+        self.rule_output      = output
+        self.rule_definitions = [tuple(row) for row in definitions]
+        self.compiled_rules   = compile_rules(
+            self.rule_definitions, self.rule_inputs, self.rule_output,
+            self.mf_params)
+
+    def _check_output(self, output: str):
+        missing = [t for t in STATUS_TERMS if t not in self.mf_params[output]]
+        if missing:
+            raise ValueError(
+                f"Output variable '{output}' must define the status terms "
+                f"{', '.join(STATUS_TERMS)} (missing: {', '.join(missing)}).")
+
+    # Updates
+    def set_membership(self, var_name: str, term: str, abc):
+        """Replace the [a, b, c] parameters of an existing term."""
+        self._set_params(var_name, term, abc)
+        self._changed()
+
+    def _set_params(self, var_name: str, term: str, abc):
+        if term not in self.mf_params.get(var_name, {}):
+            raise ValueError(f"Unknown term '{term}' of variable '{var_name}'.")
+        self.mf_params[var_name][term] = _checked_params(var_name, term, abc)
+
+    def _define_variable(self, var_name: str, terms: Dict[str, tuple]):
+        # A variable from a rule file: its terms replace any built-in ones.
+        if not terms:
+            raise ValueError(f"Variable '{var_name}' needs at least one term.")
+        self.mf_params[var_name] = {
+            term: _checked_params(var_name, term, abc)
+            for term, abc in terms.items()}
+
+    def set_rules(self, definitions, inputs: Optional[tuple] = None,
+                  output: Optional[str] = None):
+        """Replace the rule table (rows as in ``RULE_DEFINITIONS``)."""
+        self._set_rule_base(inputs or self.rule_inputs,
+                            output or self.rule_output, definitions)
+        self._changed()
+
+    def _changed(self):
+        self.compiled_rules = compile_rules(
+            self.rule_definitions, self.rule_inputs, self.rule_output,
+            self.mf_params)
+        self._build_rule_index()
+        for name in self._LAZY_ATTRIBUTES:
+            self.__dict__.pop(name, None)
+        self.revision += 1
+
+    def parameter_hash(self) -> str:
+        """Short digest of the MF parameters, input ranges and rule table."""
+        return parameter_digest(self.mf_params, self.input_ranges,
+                                self.rule_inputs, self.rule_definitions)
+
+    # Rule Activation Index
+    def _build_rule_index(self):
+        # Terms of each variable sorted by their left foot. When no term's
+        # support nests inside another's the right feet are sorted too, and
+        # the terms containing x form one contiguous slice found by bisection.
+        self.term_index = {}
+        for var_name, terms in self.mf_params.items():
+            ordered = sorted(terms.items(), key=lambda item: item[1][0])
+            starts  = [abc[0] for _, abc in ordered]
+            ends    = [abc[2] for _, abc in ordered]
+            if ends != sorted(ends):
+                starts = ends = None
+            self.term_index[var_name] = (starts, ends, ordered)
+
+        # (antecedent terms in rule_inputs order) -> [(rule number, out_term)]
+        self.rule_lookup = {}
+        for idx, (*antecedent_terms, out_term) in \
+                enumerate(self.rule_definitions, start=1):
+            self.rule_lookup.setdefault(
+                tuple(antecedent_terms), []).append((idx, out_term))
+
+    def active_terms(self, var_name: str, x: float) -> List[Tuple[str, float]]:
+        """(term, degree) pairs of ``var_name`` with a non-zero degree at x."""
+        starts, ends, ordered = self.term_index[var_name]
+        if starts is not None:
+            ordered = ordered[bisect_left(ends, x):bisect_right(starts, x)]
+        active = []
+        for term, abc in ordered:
+            degree = trimf_degree(x, abc)
+            if degree > 0:
+                active.append((term, degree))
+        return active
+
+    # Control System (lazy)
+    @cached_property
+    def rules(self):
+        from skfuzzy import control as ctrl
+
+        variables  = [self.skfuzzy_variable(name) for name in self.rule_inputs]
+        consequent = self.skfuzzy_variable(self.rule_output)
+        return [
+            ctrl.Rule(reduce(and_, (var[term] for var, term
+                                    in zip(variables, antecedent_terms))),
+                      consequent[out_term])
+            for *antecedent_terms, out_term in self.rule_definitions
+        ]
+
+    @cached_property
+    def control_system(self):
+        from skfuzzy import control as ctrl
+        return ctrl.ControlSystem(self.rules)
+
+    @cached_property
+    def simulation(self):
+        from skfuzzy import control as ctrl
+        return ctrl.ControlSystemSimulation(self.control_system)
+
+
+def parameter_digest(mf_params, input_ranges, rule_inputs, rules) -> str:
+    """``FuzzyModel.parameter_hash`` of a model built from these values."""
+    payload = json.dumps({
+        'mf_params':    mf_params,
+        'input_ranges': input_ranges,
+        'rule_inputs':  rule_inputs,
+        'rules':        rules,
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def _checked_params(var_name: str, term: str, abc) -> tuple:
+    a, b, c = abc
+    if not a <= b <= c:
+        raise ValueError(
+            f"Parameters of '{var_name}.{term}' must satisfy a <= b <= c.")
+    return (a, b, c)
+
+
+def _span(terms: Dict[str, tuple]) -> Tuple[float, float]:
+    return (min(abc[0] for abc in terms.values()),
+            max(abc[2] for abc in terms.values()))
+
+
+def _universe_step(name: str, lo: float, hi: float) -> float:
+    if name in UNIVERSE_STEPS:
+        return UNIVERSE_STEPS[name]
+    return 10.0 ** math.floor(math.log10((hi - lo) / 100))
+
+
+@lru_cache(maxsize=64)
+def _universe(lo: float, hi: float, step: float) -> np.ndarray:
+    # np.arange(lo, hi + step, step) as the universes were always sampled;
+    # a float overshoot past hi is dropped.
+    universe = np.arange(lo, hi + step, step)
+    universe = universe[universe <= hi + step / 2]
+    universe.flags.writeable = False
+    return universe
+
+
+def trimf_degree(x, abc):
+    """Closed-form ``fuzz.trimf`` degree of ``x`` (scalar or array)."""
+    a, b, c = abc
+    if np.ndim(x) == 0:
+        x = float(x)
+        if x == b:
+            return 1.0
+        if a < x < b:
+            return (x - a) / (b - a)
+        if b < x < c:
+            return (c - x) / (c - b)
+        return 0.0
+
+    x = np.asarray(x, dtype=float)
+    left  = (x - a) / (b - a) if a != b else np.where(x >= b, 1.0, 0.0)
+    right = (c - x) / (c - b) if b != c else np.where(x <= b, 1.0, 0.0)
+    return np.clip(np.minimum(left, right), 0.0, 1.0)
@@ -0,0 +1,152 @@
+import json
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+# Upper bounds (seconds) of the latency histogram buckets; +Inf is implied.
+DEFAULT_BUCKETS = (
+    1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4,
+    1e-3, 2.5e-3, 5e-3, 1e-2, 2.5e-2, 5e-2, 0.1, 0.25, 0.5, 1.0,
+)
+
+
+class Histogram:
+    """Fixed-bucket latency histogram (Prometheus semantics)."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts  = [0] * (len(self.buckets) + 1)
+        self.count   = 0
+        self.sum     = 0.0
+        self.min     = float('inf')
+        self.max     = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum   += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th observation."""
+        if not self.count:
+            return 0.0
+        rank, seen = q * self.count, 0
+        for bound, n in zip(self.buckets, self.counts):
+            seen += n
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def as_dict(self) -> dict:
+        return {
+            'count':   self.count,
+            'sum':     self.sum,
+            'min':     self.min if self.count else 0.0,
+            'max':     self.max,
+            'mean':    self.sum / self.count if self.count else 0.0,
+            'p50':     self.quantile(0.50),
+            'p99':     self.quantile(0.99),
+            'buckets': {_bound(b): n for b, n in
+                        zip((*self.buckets, float('inf')), self.counts)},
+        }
+
+
+class Instrumentation:
+    """Per-stage timings and counters for ``FuzzyEngine``.
+
+    Attach with ``FuzzyEngine(model, metrics=Instrumentation())`` or by
+    setting ``engine.metrics``. Stage timings are kept per path ('scalar'
+    or 'batch'); a batch observation covers one chunk. With ``metrics``
+    left at None the engine only pays a few ``is not None`` checks.
+    """
+
+    STAGES = ('fuzzify', 'fire', 'aggregate', 'defuzz', 'classify', 'total')
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS,
+                 clock: Callable[[], float] = time.perf_counter):
+        self.buckets = tuple(buckets)
+        self.clock   = clock
+        self._lock   = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.histograms: Dict[Tuple[str, str], Histogram] = {}
+            self.counters:   Dict[str, int] = {}
+            self.gauges:     Dict[str, float] = {}
+
+    def lap(self, path: str, stage: str, since: float) -> float:
+        """Record ``stage`` as ending now; returns now for the next lap."""
+        now = self.clock()
+        self.observe(path, stage, now - since)
+        return now
+
+    def observe(self, path: str, stage: str, seconds: float):
+        with self._lock:
+            histogram = self.histograms.get((path, stage))
+            if histogram is None:
+                histogram = self.histograms[(path, stage)] = \
+                    Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    def count(self, name: str, n: int = 1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def gauge(self, name: str, value: float):
+        with self._lock:
+            self.gauges[name] = value
+
+    # Export
+    def snapshot(self) -> dict:
+        with self._lock:
+            stages = {}
+            for (path, stage), histogram in sorted(self.histograms.items()):
+                stages.setdefault(path, {})[stage] = histogram.as_dict()
+            return {'counters': dict(sorted(self.counters.items())),
+                    'gauges':   dict(sorted(self.gauges.items())),
+                    'stages':   stages}
+
+    def to_json(self, indent: Optional[int] = None) -> str:
+        return json.dumps(self.snapshot(), indent=indent)
+
+    def to_prometheus(self, prefix: str = 'fuzzystride') -> str:
+        """Snapshot in the Prometheus text exposition format."""
+        snapshot = self.snapshot()
+        lines = []
+        for name, value in snapshot['counters'].items():
+            metric = f"{prefix}_{name}_total"
+            lines += [f"# TYPE {metric} counter", f"{metric} {value}"]
+        for name, value in snapshot['gauges'].items():
+            metric = f"{prefix}_{name}"
+            lines += [f"# TYPE {metric} gauge", f"{metric} {value}"]
+
+        metric = f"{prefix}_stage_seconds"
+        if snapshot['stages']:
+            lines.append(f"# TYPE {metric} histogram")
+        for path, stages in snapshot['stages'].items():
+            for stage, data in stages.items():
+                labels = f'path="{_label(path)}",stage="{_label(stage)}"'
+                cumulative = 0
+                for bound, n in data['buckets'].items():
+                    cumulative += n
+                    lines.append(
+                        f'{metric}_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f"{metric}_sum{{{labels}}} {data['sum']!r}")
+                lines.append(f"{metric}_count{{{labels}}} {data['count']}")
+        return "\n".join(lines) + "\n"
+
+
+def _label(value: str) -> str:
+    # Label values escape backslash, double quote and newline.
+    return (value.replace('\\', '\\\\').replace('"', '\\"')
+                 .replace('\n', '\\n'))
+
+
+def _bound(value: float) -> str:
+    return '+Inf' if value == float('inf') else repr(value)
@@ -0,0 +1,216 @@
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import List, Optional, Tuple
+
+from fuzzystride.FuzzyEngine import FuzzyEngine, BatchResult
+from fuzzystride.FuzzyModel import FuzzyModel
+
+# Engine of the current worker process, built once by _init_worker.
+_ENGINE: Optional[FuzzyEngine] = None
+
+
+class ParallelExecutor:
+    """Runs ``FuzzyEngine.evaluate_batch`` over row slices on a worker pool.
+
+    The 'process' backend copies the inputs once into a shared-memory block
+    that every worker maps; workers write crisp values, membership degrees
+    and status codes straight into a second shared block, so no rows are
+    pickled. The 'thread' backend shares plain arrays and relies on the
+    NumPy kernels releasing the GIL.
+
+    With ``snapshot`` (a file from ``Snapshot.save_snapshot``) the parent
+    and every worker map the model instead of building it, sharing its
+    pages. Use as a context manager, or call ``close()``, to shut the pool
+    down.
+    """
+
+    BACKENDS = ('process', 'thread')
+
+    # Slices per worker when chunk_size is not given; >1 evens out stragglers.
+    SLICES_PER_WORKER = 4
+    MIN_CHUNK_SIZE    = 4096
+
+    def __init__(self, workers: Optional[int] = None, backend: str = 'process',
+                 chunk_size: Optional[int] = None,
+                 defuzz_method: str = 'centroid',
+                 rules_path: Optional[str] = None,
+                 snapshot: Optional[str] = None):
+        if backend not in self.BACKENDS:
+            raise ValueError(f"backend must be one of {self.BACKENDS}.")
+        self.workers    = workers or os.cpu_count() or 1
+        self.backend    = backend
+        self.chunk_size = chunk_size
+        self.engine     = FuzzyEngine(_load_model(rules_path, snapshot),
+                                      defuzz_method)
+        self.model      = self.engine.model
+        self._pool_args = (rules_path, defuzz_method, snapshot)
+        self._pool      = None
+
+    def __enter__(self) -> "ParallelExecutor":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def evaluate_batch(self, hr, pc, dist) -> BatchResult:
+        hr   = np.asarray(hr,   dtype=float).ravel()
+        pc   = np.asarray(pc,   dtype=float).ravel()
+        dist = np.asarray(dist, dtype=float).ravel()
+        if not (len(hr) == len(pc) == len(dist)):
+            raise ValueError("hr, pc and dist must have the same length.")
+
+        n = len(hr)
+        if self.backend == 'thread':
+            floats, codes = _output_arrays(n)
+            inputs = (hr, pc, dist)
+            futures = [self._get_pool().submit(
+                           _evaluate_into, self.engine, inputs, floats, codes,
+                           start, stop)
+                       for start, stop in self._slices(n)]
+            for future in futures:
+                future.result()
+        else:
+            floats, codes = self._evaluate_shared(hr, pc, dist)
+
+        labels = FuzzyEngine.STATUS_LABELS
+        return BatchResult(
+            heart_rate   = hr,
+            pacing       = pc,
+            distance     = dist,
+            crisp_values = floats[0],
+            status_codes = codes,
+            membership_degrees = {
+                label: floats[k] for k, label in enumerate(labels, start=1)},
+        )
+
+
+    def _get_pool(self):
+        if self._pool is None:
+            if self.backend == 'thread':
+                self._pool = ThreadPoolExecutor(self.workers)
+            else:
+                self._pool = ProcessPoolExecutor(
+                    self.workers, initializer=_init_worker,
+                    initargs=self._pool_args)
+        return self._pool
+
+    def _slices(self, n: int) -> List[Tuple[int, int]]:
+        step = self.chunk_size or max(
+            self.MIN_CHUNK_SIZE,
+            -(-n // (self.workers * self.SLICES_PER_WORKER)))
+        return [(start, min(start + step, n)) for start in range(0, n, step)]
+
+    def _evaluate_shared(self, hr, pc, dist):
+        n = len(hr)
+        shm_in  = SharedMemory(create=True, size=max(1, _input_bytes(n)))
+        shm_out = SharedMemory(create=True, size=max(1, _output_bytes(n)))
+        try:
+            inputs = _input_views(shm_in, n)
+            inputs[0], inputs[1], inputs[2] = hr, pc, dist
+            del inputs
+
+            pool = self._get_pool()
+            futures = [pool.submit(_evaluate_slice, shm_in.name, shm_out.name,
+                                   n, start, stop)
+                       for start, stop in self._slices(n)]
+            for future in futures:
+                future.result()
+
+            floats, codes = _output_views(shm_out, n)
+            floats, codes = floats.copy(), codes.copy()
+            return floats, codes
+        finally:
+            for shm in (shm_in, shm_out):
+                shm.close()
+                shm.unlink()
+
+
+# Shared-memory layout: inputs are a (3, n) float64 block; outputs are a
+# (4, n) float64 block (crisp value, then one membership degree per status)
+# followed by n int8 status codes.
+def _input_bytes(n: int) -> int:
+    return 3 * n * 8
+
+
+def _output_bytes(n: int) -> int:
+    return 4 * n * 8 + n
+
+
+def _input_views(shm: SharedMemory, n: int) -> np.ndarray:
+    return np.ndarray((3, n), dtype=np.float64, buffer=shm.buf)
+
+
+def _output_views(shm: SharedMemory, n: int):
+    floats = np.ndarray((4, n), dtype=np.float64, buffer=shm.buf)
+    codes  = np.ndarray((n,), dtype=np.int8, buffer=shm.buf, offset=4 * n * 8)
+    return floats, codes
+
+
+def _output_arrays(n: int):
+    return np.empty((4, n)), np.empty(n, dtype=np.int8)
+
+
+def _evaluate_into(engine: FuzzyEngine, inputs, floats: np.ndarray,
+                   codes: np.ndarray, start: int, stop: int):
+    rows   = slice(start, stop)
+    result = engine.evaluate_batch(
+        inputs[0][rows], inputs[1][rows], inputs[2][rows])
+    floats[0, rows] = result.crisp_values
+    for k, label in enumerate(FuzzyEngine.STATUS_LABELS, start=1):
+        floats[k, rows] = result.membership_degrees[label]
+    codes[rows] = result.status_codes
+
+
+def _load_model(rules_path: Optional[str], snapshot: Optional[str]) -> FuzzyModel:
+    if snapshot is None:
+        return FuzzyModel(rules_path)
+    from fuzzystride.Snapshot import load_snapshot
+    return load_snapshot(snapshot).model
+
+
+# Worker side
+def _init_worker(rules_path: Optional[str], defuzz_method: str,
+                 snapshot: Optional[str] = None):
+    global _ENGINE
+    _ENGINE = FuzzyEngine(_load_model(rules_path, snapshot), defuzz_method)
+
+
+def _attach(name: str) -> SharedMemory:
+    # Before Python 3.13 attaching also registers the block with the
+    # resource tracker, which then warns about (or unlinks) a block the
+    # parent owns. Workers are single-threaded, so the registration is
+    # suppressed for the duration of the call.
+    try:
+        return SharedMemory(name=name, track=False)
+    except TypeError:
+        pass
+    register = resource_tracker.register
+    resource_tracker.register = lambda *args, **kwargs: None
+    try:
+        return SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
+
+
+def _evaluate_slice(in_name: str, out_name: str, n: int,
+                    start: int, stop: int) -> int:
+    shm_in, shm_out = _attach(in_name), _attach(out_name)
+    inputs = floats = codes = None
+    try:
+        inputs        = _input_views(shm_in, n)
+        floats, codes = _output_views(shm_out, n)
+        _evaluate_into(_ENGINE, inputs, floats, codes, start, stop)
+    finally:
+        # Views must be released before the mappings can be closed.
+        inputs = floats = codes = None
+        shm_in.close()
+        shm_out.close()
+    return stop - start
@@ -0,0 +1,194 @@
+import threading
+import numpy as np
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence, Tuple
+
+from fuzzystride.Cache import CacheStats
+from fuzzystride.FuzzyEngine import FuzzyEngine, BatchResult, EvaluationResult
+from fuzzystride.FuzzyModel import FuzzyModel, parameter_digest
+
+# Heart rates the default 'heart_rate' terms were drawn for: the bottom of
+# the range, the lactate threshold (where 'moderate' hands over to 'high')
+# and the maximum heart rate.
+DEFAULT_MIN_HR       = 100
+DEFAULT_THRESHOLD_HR = 162
+DEFAULT_MAX_HR       = 190
+
+
+@dataclass(frozen=True)
+class AthleteProfile:
+    """Heart-rate landmarks of one athlete.
+
+    ``threshold_hr`` defaults to the same fraction of ``max_hr`` as in the
+    default model; ``min_hr`` is the bottom of the athlete's HR range.
+    """
+    athlete_id:   str
+    max_hr:       float
+    threshold_hr: Optional[float] = None
+    min_hr:       float = DEFAULT_MIN_HR
+
+    def landmarks(self) -> Tuple[float, float, float]:
+        threshold = self.threshold_hr
+        if threshold is None:
+            threshold = self.max_hr * DEFAULT_THRESHOLD_HR / DEFAULT_MAX_HR
+        if not self.min_hr < threshold < self.max_hr:
+            raise ValueError(
+                f"Profile '{self.athlete_id}' must satisfy "
+                f"min_hr < threshold_hr < max_hr.")
+        return float(self.min_hr), float(threshold), float(self.max_hr)
+
+
+def heart_rate_params(profile: AthleteProfile,
+                      base: Dict[str, tuple]) -> Dict[str, tuple]:
+    """``base`` heart-rate terms moved onto the athlete's landmarks.
+
+    Breakpoints are mapped piecewise-linearly: the default minimum,
+    threshold and maximum heart rates land on the profile's, so every zone
+    keeps its position relative to the athlete's threshold.
+    """
+    anchors = (DEFAULT_MIN_HR, DEFAULT_THRESHOLD_HR, DEFAULT_MAX_HR)
+    targets = profile.landmarks()
+    return {term: tuple(round(float(np.interp(x, anchors, targets)), 2)
+                        for x in abc)
+            for term, abc in base.items()}
+
+
+class ModelRegistry:
+    """Personalised models for many athletes.
+
+    Each registered ``AthleteProfile`` gets its own 'heart_rate' terms and
+    range (see ``heart_rate_params``); everything else comes from the
+    base model (the default one, with the rules from ``rules_path`` if
+    given). Engines are built on first use and kept in an LRU of
+    ``maxsize`` entries keyed by parameter hash, so athletes with equal
+    parameters share one engine and evicted ones are rebuilt on demand.
+
+    ``evaluate_batch`` takes an athlete id per row and evaluates the rows
+    of each model in one vectorised call.
+    """
+
+    def __init__(self, maxsize: int = 256, defuzz_method: str = 'centroid',
+                 rules_path: Optional[str] = None, metrics=None):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1.")
+        self.maxsize       = maxsize
+        self.defuzz_method = defuzz_method
+        self.metrics       = metrics
+        self.rules_path    = rules_path
+        self.stats         = CacheStats()
+        self.base          = FuzzyModel(rules_path)
+        self._profiles: Dict[str, AthleteProfile] = {}
+        # athlete id -> (parameter hash, mf_params, input_ranges)
+        self._params:   Dict[str, tuple] = {}
+        self._engines: "OrderedDict[str, FuzzyEngine]" = OrderedDict()
+        self._lock     = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._profiles)
+
+    def __contains__(self, athlete_id: str) -> bool:
+        return athlete_id in self._profiles
+
+    # Profiles
+    def register(self, profile: AthleteProfile) -> str:
+        """Add or replace a profile; returns its model's parameter hash."""
+        base = self.base
+        mf_params    = {'heart_rate': heart_rate_params(
+            profile, base.mf_params['heart_rate'])}
+        lo, _, hi    = profile.landmarks()
+        input_ranges = {'heart_rate': (lo, hi)}
+        key = parameter_digest(
+            {**base.mf_params, **mf_params},
+            {**base.input_ranges, **input_ranges},
+            base.rule_inputs, base.rule_definitions)
+        with self._lock:
+            self._profiles[profile.athlete_id] = profile
+            self._params[profile.athlete_id]   = (key, mf_params, input_ranges)
+        return key
+
+    def profile(self, athlete_id: str) -> AthleteProfile:
+        return self._profiles[self._check(athlete_id)]
+
+    def _check(self, athlete_id: str) -> str:
+        if athlete_id not in self._profiles:
+            raise ValueError(f"Unknown athlete '{athlete_id}'.")
+        return athlete_id
+
+    # Models
+    def engine(self, athlete_id: str) -> FuzzyEngine:
+        key, mf_params, input_ranges = self._params[self._check(athlete_id)]
+        metrics = self.metrics
+        with self._lock:
+            engine = self._engines.get(key)
+            if engine is not None:
+                self._engines.move_to_end(key)
+                self.stats.hits += 1
+                if metrics is not None:
+                    metrics.count('registry_hits')
+                return engine
+            self.stats.misses += 1
+        if metrics is not None:
+            metrics.count('registry_misses')
+
+        model  = FuzzyModel(self.rules_path, mf_params, input_ranges)
+        engine = FuzzyEngine(model, self.defuzz_method, metrics)
+
+        with self._lock:
+            engine = self._engines.setdefault(key, engine)
+            self._engines.move_to_end(key)
+            while len(self._engines) > self.maxsize:
+                self._engines.popitem(last=False)
+                self.stats.evictions += 1
+                if metrics is not None:
+                    metrics.count('registry_evictions')
+        return engine
+
+    def model(self, athlete_id: str) -> FuzzyModel:
+        return self.engine(athlete_id).model
+
+    # Evaluation
+    def evaluate(self, athlete_id: str, hr: float, pc: float,
+                 dist: float) -> EvaluationResult:
+        return self.engine(athlete_id).evaluate(hr, pc, dist)
+
+    def evaluate_batch(self, athlete_ids: Sequence[str], hr, pc, dist,
+                       chunk_size: Optional[int] = None) -> BatchResult:
+        """Rows of a mixed multi-athlete stream, in input order."""
+        hr   = np.asarray(hr,   dtype=float).ravel()
+        pc   = np.asarray(pc,   dtype=float).ravel()
+        dist = np.asarray(dist, dtype=float).ravel()
+        athletes, inverse = np.unique(np.asarray(athlete_ids, dtype=str),
+                                      return_inverse=True)
+        if not (len(inverse) == len(hr) == len(pc) == len(dist)):
+            raise ValueError(
+                "athlete_ids, hr, pc and dist must have the same length.")
+
+        # Athletes sharing parameters share a group, and each group is one
+        # evaluate_batch call over its rows gathered by a stable sort.
+        keys   = [self._params[self._check(a)][0] for a in athletes]
+        groups = {key: g for g, key in enumerate(dict.fromkeys(keys))}
+        first  = {}
+        for athlete, key in zip(athletes, keys):
+            first.setdefault(key, athlete)
+        row_group = np.array([groups[k] for k in keys], dtype=np.intp)[inverse]
+        order     = np.argsort(row_group, kind='stable')
+        bounds    = np.searchsorted(row_group[order], np.arange(len(groups) + 1))
+
+        crisp   = np.empty(len(hr))
+        codes   = np.empty(len(hr), dtype=np.int8)
+        degrees = {}
+        for key, g in groups.items():
+            rows   = order[bounds[g]:bounds[g + 1]]
+            result = self.engine(first[key]).evaluate_batch(
+                hr[rows], pc[rows], dist[rows], chunk_size)
+            crisp[rows] = result.crisp_values
+            codes[rows] = result.status_codes
+            for label, values in result.membership_degrees.items():
+                degrees.setdefault(label, np.empty(len(hr)))[rows] = values
+        return BatchResult(hr, pc, dist, crisp, codes, degrees)
+
+    def clear(self):
+        """Drop the cached engines (profiles are kept)."""
+        with self._lock:
+            self._engines.clear()
@@ -0,0 +1,128 @@
+import json
+import numpy as np
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Sequence, Tuple
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    tomllib = None
+
+
+@dataclass
+class CompiledRules:
+    """Rule base compiled to index arrays.
+
+    ``antecedents[r, v]`` is the index of rule r's term for input
+    ``inputs[v]`` within ``input_terms[v]``; ``consequents`` is the one-hot
+    (rules x output terms) matrix of rule conclusions.
+    """
+    inputs:       Tuple[str, ...]
+    output:       str
+    input_terms:  Tuple[Tuple[str, ...], ...]
+    output_terms: Tuple[str, ...]
+    antecedents:  np.ndarray
+    consequents:  np.ndarray
+
+    _order:   np.ndarray = field(init=False, repr=False)
+    _starts:  np.ndarray = field(init=False, repr=False)
+    _columns: np.ndarray = field(init=False, repr=False)
+
+    def __post_init__(self):
+        # Rules grouped by consequent so aggregation is one reduceat pass.
+        out_index     = np.argmax(self.consequents, axis=1)
+        self._order   = np.argsort(out_index, kind='stable')
+        columns, starts = np.unique(out_index[self._order], return_index=True)
+        self._columns = columns
+        self._starts  = starts
+
+    def __len__(self) -> int:
+        return len(self.antecedents)
+
+    def fire(self, degrees: Sequence[np.ndarray]) -> np.ndarray:
+        """Firing strengths (n, rules) from per-input (n, terms) degrees."""
+        firing = degrees[0][:, self.antecedents[:, 0]]
+        for v in range(1, len(self.inputs)):
+            np.minimum(firing, degrees[v][:, self.antecedents[:, v]],
+                       out=firing)
+        return firing
+
+    def aggregate(self, firing: np.ndarray) -> np.ndarray:
+        """Max firing strength per output term, shape (n, output terms)."""
+        strengths = np.zeros((len(firing), len(self.output_terms)))
+        if len(self):
+            strengths[:, self._columns] = np.maximum.reduceat(
+                firing[:, self._order], self._starts, axis=1)
+        return strengths
+
+
+def compile_rules(definitions: Sequence[Sequence[str]],
+                  inputs: Sequence[str], output: str,
+                  mf_params: Dict[str, Dict[str, tuple]]) -> CompiledRules:
+    """Compile ``(input_term, ..., output_term)`` rows into index arrays.
+
+    Term order per variable follows ``mf_params``.
+    """
+    input_terms  = tuple(tuple(mf_params[name]) for name in inputs)
+    output_terms = tuple(mf_params[output])
+    lookups      = [{t: i for i, t in enumerate(terms)} for terms in input_terms]
+    out_lookup   = {t: i for i, t in enumerate(output_terms)}
+
+    antecedents = np.zeros((len(definitions), len(inputs)), dtype=np.intp)
+    consequents = np.zeros((len(definitions), len(output_terms)))
+    for r, row in enumerate(definitions):
+        if len(row) != len(inputs) + 1:
+            raise ValueError(
+                f"Rule {r + 1} must name one term for each of {tuple(inputs)} "
+                f"and one {output} term.")
+        *terms, out_term = row
+        for v, term in enumerate(terms):
+            if term not in lookups[v]:
+                raise ValueError(
+                    f"Rule {r + 1}: unknown {inputs[v]} term '{term}'.")
+            antecedents[r, v] = lookups[v][term]
+        if out_term not in out_lookup:
+            raise ValueError(
+                f"Rule {r + 1}: unknown {output} term '{out_term}'.")
+        consequents[r, out_lookup[out_term]] = 1.0
+
+    return CompiledRules(
+        inputs       = tuple(inputs),
+        output       = output,
+        input_terms  = input_terms,
+        output_terms = output_terms,
+        antecedents  = antecedents,
+        consequents  = consequents,
+    )
+
+
+def load_rule_base(path: str):
+    """Read a JSON or TOML rule-base file.
+
+    Returns ``(inputs, output, rules, mf_params, input_ranges)``. The last
+    two are optional in the file (``{}`` when absent): ``mf_params`` gives
+    the [a, b, c] terms of variables the file defines or redefines, and
+    ``input_ranges`` their ranges, as written by ``Tuning.export_model``.
+    """
+    path = Path(path)
+    if path.suffix == '.toml':
+        if tomllib is None:
+            raise ValueError("TOML rule files need Python 3.11 or newer.")
+        spec = tomllib.loads(path.read_text())
+    else:
+        spec = json.loads(path.read_text())
+
+    try:
+        inputs = tuple(spec['inputs'])
+        output = spec['output']
+        rules  = [tuple(row) for row in spec['rules']]
+        mf_params = {var: {term: tuple(abc) for term, abc in terms.items()}
+                     for var, terms in spec.get('mf_params', {}).items()}
+        input_ranges = {name: tuple(r)
+                        for name, r in spec.get('input_ranges', {}).items()}
+    except (KeyError, TypeError, AttributeError):
+        raise ValueError(
+            f"{path} must define 'inputs', 'output' and 'rules' (and "
+            f"optionally 'mf_params' and 'input_ranges' tables).")
+    return inputs, output, rules, mf_params, input_ranges
@@ -0,0 +1,341 @@
+import asyncio
+import json
+import time
+import numpy as np
+from contextlib import suppress
+from http import HTTPStatus
+from typing import Dict, List, Optional, Tuple
+
+from fuzzystride.Batch import (
+    DEFAULT_MAX_BATCH, DEFAULT_MAX_WAIT, INPUT_FIELDS, evaluate_chunks,
+)
+from fuzzystride.FuzzyEngine import (
+    FuzzyEngine, EmptyMembershipError, validate_batch,
+)
+from fuzzystride.Instrumentation import Instrumentation
+
+DEFAULT_MAX_BODY  = 16 * 2**20
+MAX_HEADER_BYTES  = 64 * 2**10
+
+
+class MicroBatcher:
+    """Collects concurrent single-row evaluations into one batch call.
+
+    A batch is evaluated once ``max_batch`` rows are waiting or
+    ``max_wait`` seconds after its first row arrived, whichever comes
+    first; ``max_wait=0`` flushes on the next event-loop iteration. Must be
+    used from the event loop thread.
+    """
+
+    def __init__(self, engine: FuzzyEngine, max_batch: int = DEFAULT_MAX_BATCH,
+                 max_wait: float = DEFAULT_MAX_WAIT,
+                 metrics: Optional[Instrumentation] = None):
+        if max_batch < 1:
+            raise ValueError("max_batch must be at least 1.")
+        self.engine    = engine
+        self.max_batch = max_batch
+        self.max_wait  = max_wait
+        self.metrics   = metrics
+        self._pending: List[tuple] = []
+        self._timer    = None
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def submit(self, hr: float, pc: float, dist: float) -> asyncio.Future:
+        """Future of ``(crisp_value, status_code, membership_degrees)``."""
+        loop   = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((hr, pc, dist, future))
+        if len(self._pending) >= self.max_batch:
+            self.flush()
+        elif self._timer is None:
+            self._timer = (loop.call_later(self.max_wait, self.flush)
+                           if self.max_wait > 0 else loop.call_soon(self.flush))
+        return future
+
+    def flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+
+        columns = [np.fromiter((row[i] for row in pending), float, len(pending))
+                   for i in range(3)]
+        try:
+            result = self.engine.evaluate_batch(*columns)
+        except Exception as exc:
+            for *_, future in pending:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        if self.metrics is not None:
+            self.metrics.count('microbatches')
+            self.metrics.count('microbatch_rows', len(pending))
+
+        degrees = result.membership_degrees
+        for i, (*_, future) in enumerate(pending):
+            if not future.done():
+                future.set_result((
+                    float(result.crisp_values[i]),
+                    int(result.status_codes[i]),
+                    {label: float(values[i]) for label, values in degrees.items()},
+                ))
+
+
+class InferenceServer:
+    """Minimal asyncio HTTP/1.1 JSON service around a ``FuzzyEngine``.
+
+    POST /evaluate        one ``{"heart_rate", "pacing", "distance"}`` object;
+                          concurrent requests are micro-batched
+    POST /evaluate/batch  a list of such objects (or ``{"rows": [...]}``),
+                          evaluated in one vectorised call
+    GET  /health          status, queue depth and in-flight requests
+    GET  /metrics         Prometheus text (engine stages, HTTP latency)
+    """
+
+    def __init__(self, engine: FuzzyEngine, host: str = '127.0.0.1',
+                 port: int = 8000, max_batch: int = DEFAULT_MAX_BATCH,
+                 max_wait: float = DEFAULT_MAX_WAIT,
+                 max_body: int = DEFAULT_MAX_BODY):
+        if engine.metrics is None:
+            engine.metrics = Instrumentation()
+        self.engine    = engine
+        self.metrics   = engine.metrics
+        self.host      = host
+        self.port      = port
+        self.max_body  = max_body
+        self.batcher   = MicroBatcher(engine, max_batch, max_wait, self.metrics)
+        self.in_flight = 0
+        self._server   = None
+        # Open connections: handler task -> its writer.
+        self._connections: Dict[asyncio.Task, asyncio.StreamWriter] = {}
+        self._started  = time.monotonic()
+        self._routes   = {
+            ('POST', '/evaluate'):       self._evaluate,
+            ('POST', '/evaluate/batch'): self._evaluate_batch,
+            ('GET',  '/health'):         self._health,
+            ('GET',  '/metrics'):        self._metrics,
+        }
+
+    async def start(self):
+        self._server = await asyncio.start_server(
+            self._handle_connection, self.host, self.port,
+            limit=MAX_HEADER_BYTES)
+        # With port 0 the OS picks one; report the real port.
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            # Idle keep-alive connections would otherwise hold their
+            # handlers until the client hangs up.
+            for writer in self._connections.values():
+                writer.close()
+            await asyncio.gather(*self._connections, return_exceptions=True)
+            await self._server.wait_closed()
+            self._server = None
+        self.batcher.flush()
+
+    # Connection handling
+    async def _handle_connection(self, reader: asyncio.StreamReader,
+                                 writer: asyncio.StreamWriter):
+        task = asyncio.current_task()
+        self._connections[task] = writer
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except asyncio.IncompleteReadError:
+                    break
+                except asyncio.LimitOverrunError:
+                    await self._send(writer, 431, {'error': "Headers too large."},
+                                     keep_alive=False)
+                    break
+                try:
+                    method, path, version, headers = _parse_head(head)
+                except ValueError:
+                    await self._send(writer, 400, {'error': "Malformed request."},
+                                     keep_alive=False)
+                    break
+
+                keep_alive = _keep_alive(version, headers)
+                if 'transfer-encoding' in headers:
+                    await self._send(writer, 501, {
+                        'error': "Chunked request bodies are not supported."},
+                        keep_alive=False)
+                    break
+                try:
+                    length = int(headers.get('content-length', 0))
+                except ValueError:
+                    length = -1
+                if not 0 <= length <= self.max_body:
+                    await self._send(writer, 413, {
+                        'error': f"Body must be at most {self.max_body} bytes."},
+                        keep_alive=False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                start = time.perf_counter()
+                self.in_flight += 1
+                try:
+                    status, payload = await self._dispatch(method, path, body)
+                finally:
+                    self.in_flight -= 1
+                await self._send(writer, status, payload, keep_alive)
+                self.metrics.observe('http', self._route_label(path),
+                                     time.perf_counter() - start)
+                self.metrics.count('http_requests')
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            del self._connections[task]
+            writer.close()
+            with suppress(ConnectionError):
+                await writer.wait_closed()
+
+    def _route_label(self, path: str) -> str:
+        # One histogram per known route: labelling by the raw path would
+        # let clients create a histogram per distinct URL.
+        if not any(route == path for _, route in self._routes):
+            return 'unmatched'
+        return path.strip('/') or 'root'
+
+    async def _dispatch(self, method: str, path: str, body: bytes):
+        handler = self._routes.get((method, path))
+        if handler is None:
+            if any(route == path for _, route in self._routes):
+                return 405, {'error': f"{method} is not allowed on {path}."}
+            return 404, {'error': f"No such endpoint: {path}."}
+        if method == 'POST':
+            try:
+                body = json.loads(body or b"null")
+            except ValueError:
+                return 400, {'error': "Body is not valid JSON."}
+        return await handler(body)
+
+    async def _send(self, writer: asyncio.StreamWriter, status: int,
+                    payload, keep_alive: bool):
+        if isinstance(payload, str):
+            body, content_type = payload.encode(), 'text/plain; version=0.0.4'
+        else:
+            body, content_type = json.dumps(payload).encode(), 'application/json'
+        if status >= 400:
+            self.metrics.count('http_errors')
+        head = (f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n"
+                f"Content-Type: {content_type}\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+                f"\r\n")
+        writer.write(head.encode('latin-1') + body)
+        await writer.drain()
+
+    # Endpoints
+    async def _evaluate(self, record):
+        if not isinstance(record, dict):
+            return 400, {'errors': ["Body must be a JSON object."]}
+        values, errors = _validate_record(record, self.engine.model.input_ranges)
+        if errors:
+            return 400, {'errors': errors}
+
+        crisp, code, degrees = await self.batcher.submit(*values)
+        if code < 0:
+            return 422, {'errors': [str(EmptyMembershipError())]}
+        status = FuzzyEngine.STATUS_LABELS[code]
+        return 200, {
+            'crisp_value':        crisp,
+            'status':             status,
+            'recommendation':     FuzzyEngine.ADVICE_MAP[status],
+            'membership_degrees': degrees,
+        }
+
+    async def _evaluate_batch(self, body):
+        rows = body.get('rows') if isinstance(body, dict) else body
+        if not isinstance(rows, list):
+            return 400, {'errors': [
+                "Body must be a JSON list of rows or {\"rows\": [...]}."]}
+        rows = [row if isinstance(row, dict) else None for row in rows]
+
+        # Big bodies take a while; keep the event loop serving meanwhile.
+        loop   = asyncio.get_running_loop()
+        result = await loop.run_in_executor(
+            None, lambda: next(evaluate_chunks(self.engine, [rows]), None))
+        if result is None:
+            return 200, {'results': [], 'rejects': []}
+        return 200, {'results': result.records, 'rejects': result.rejects}
+
+    async def _health(self, _):
+        self._update_gauges()
+        return 200, {
+            'status':      'ok',
+            'queue_depth': len(self.batcher),
+            'in_flight':   self.in_flight,
+            'uptime':      time.monotonic() - self._started,
+        }
+
+    async def _metrics(self, _):
+        self._update_gauges()
+        return 200, self.metrics.to_prometheus()
+
+    def _update_gauges(self):
+        self.metrics.gauge('queue_depth', len(self.batcher))
+        # This request is itself in flight.
+        self.metrics.gauge('in_flight_requests', self.in_flight - 1)
+
+
+def _parse_head(head: bytes) -> Tuple[str, str, str, Dict[str, str]]:
+    lines = head.decode('latin-1').split("\r\n")
+    method, target, version = lines[0].split(" ")
+    if not version.startswith("HTTP/1."):
+        raise ValueError(version)
+    headers = {}
+    for line in lines[1:]:
+        if line:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+    return method.upper(), target.split("?", 1)[0], version, headers
+
+
+def _keep_alive(version: str, headers: Dict[str, str]) -> bool:
+    connection = headers.get('connection', '').lower()
+    if version == "HTTP/1.0":
+        return connection == 'keep-alive'
+    return connection != 'close'
+
+
+def _validate_record(record: dict, ranges) -> Tuple[List[float], List[str]]:
+    values, errors = [], []
+    for name, label in INPUT_FIELDS:
+        parsed, messages = validate_batch([record.get(name)], *ranges[name],
+                                          label)
+        values.append(float(parsed[0]))
+        if messages[0] is not None:
+            errors.append(messages[0])
+    return values, errors
+
+
+def serve(engine: FuzzyEngine, host: str = '127.0.0.1', port: int = 8000,
+          **kwargs):
+    """Run an ``InferenceServer`` until interrupted."""
+    server = InferenceServer(engine, host, port, **kwargs)
+
+    async def main():
+        await server.start()
+        print(f"Serving on http://{server.host}:{server.port}", flush=True)
+        try:
+            await server.serve_forever()
+        finally:
+            await server.close()
+
+    with suppress(KeyboardInterrupt):
+        asyncio.run(main())
@@ -0,0 +1,150 @@
+import json
+import os
+import struct
+import numpy as np
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+from fuzzystride.FuzzyEngine import FuzzyEngine
+from fuzzystride.FuzzyModel import FuzzyModel
+from fuzzystride.RuleBase import CompiledRules
+from fuzzystride.SurfaceEngine import SurfaceEngine
+
+# File layout: MAGIC, then version and header length as little-endian
+# uint32, then the JSON header, then every array as raw little-endian data
+# at an ALIGNMENT-byte offset given in the header. Arrays are read through
+# one read-only np.memmap, so processes loading the same file share pages.
+MAGIC            = b'FZSNAP\0\0'
+SNAPSHOT_VERSION = 1
+ALIGNMENT        = 64
+_PREFIX          = struct.Struct('<8sII')
+
+
+@dataclass
+class Snapshot:
+    """A loaded snapshot: the model, its arrays and the header metadata."""
+    model:  FuzzyModel
+    arrays: Dict[str, np.ndarray]
+    header: dict = field(default_factory=dict)
+
+    @property
+    def version(self) -> int:
+        return self.header['version']
+
+    def surface_engine(self, engine: Optional[FuzzyEngine] = None) -> SurfaceEngine:
+        """``SurfaceEngine`` over the stored table (no rebuild)."""
+        meta = self.header.get('surface')
+        if meta is None:
+            raise ValueError("This snapshot holds no surface table.")
+        engine = engine or FuzzyEngine(self.model, meta['method'])
+        if engine.defuzz_method != meta['method']:
+            raise ValueError(
+                f"The surface table was built with '{meta['method']}' "
+                f"defuzzification.")
+        return SurfaceEngine(engine, tuple(meta['shape']),
+                             table=self.arrays['surface'], meta=meta)
+
+
+def save_snapshot(path: str, model: FuzzyModel,
+                  surface: Optional[SurfaceEngine] = None):
+    """Write ``model`` (and optionally a surface table) to ``path``.
+
+    The file is written aside and renamed into place, so readers never
+    map a partial snapshot.
+    """
+    rules  = model.compiled_rules
+    arrays = {
+        'rules/antecedents': rules.antecedents.astype('<i8'),
+        'rules/consequents': rules.consequents.astype('<f8'),
+    }
+    header = {
+        'version':          SNAPSHOT_VERSION,
+        'parameter_hash':   model.parameter_hash(),
+        'mf_params':        {var: {term: list(abc) for term, abc in terms.items()}
+                             for var, terms in model.mf_params.items()},
+        'input_ranges':     {name: list(r) for name, r in model.input_ranges.items()},
+        'rule_inputs':      list(model.rule_inputs),
+        'rule_output':      model.rule_output,
+        'rule_definitions': [list(row) for row in model.rule_definitions],
+    }
+    if surface is not None:
+        if surface.engine.model.parameter_hash() != header['parameter_hash']:
+            raise ValueError("The surface table was built for another model.")
+        arrays['surface'] = np.asarray(surface.table, dtype='<f8')
+        header['surface'] = {
+            'method':     surface.engine.defuzz_method,
+            'shape':      list(surface.shape),
+            'max_error':  surface.max_error,
+            'mean_error': surface.mean_error,
+        }
+
+    # Offsets are relative to the (aligned) start of the data section,
+    # which depends on the header length only.
+    entries, offset = {}, 0
+    for name, array in arrays.items():
+        entries[name] = {'dtype': array.dtype.str, 'shape': list(array.shape),
+                         'offset': offset}
+        offset = _aligned(offset + array.nbytes)
+    header['arrays'] = entries
+    encoded = json.dumps(header).encode()
+    start   = _aligned(_PREFIX.size + len(encoded))
+
+    tmp = f"{path}.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(_PREFIX.pack(MAGIC, SNAPSHOT_VERSION, len(encoded)))
+        f.write(encoded)
+        for name, array in arrays.items():
+            f.seek(start + entries[name]['offset'])
+            f.write(np.ascontiguousarray(array).tobytes())
+        f.truncate(start + offset)
+    os.replace(tmp, path)
+
+
+def load_snapshot(path: str) -> Snapshot:
+    """Map a snapshot written by ``save_snapshot``.
+
+    Arrays are read-only views of the mapped file; nothing is recompiled
+    or resampled, and the skfuzzy objects stay lazy on the model.
+    """
+    with open(path, 'rb') as f:
+        prefix = f.read(_PREFIX.size)
+        if len(prefix) < _PREFIX.size:
+            raise ValueError(f"{path} is not a FuzzyStride snapshot.")
+        magic, version, length = _PREFIX.unpack(prefix)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a FuzzyStride snapshot.")
+        if version > SNAPSHOT_VERSION:
+            raise ValueError(
+                f"{path} is snapshot version {version}; this FuzzyStride "
+                f"reads up to version {SNAPSHOT_VERSION}.")
+        header = json.loads(f.read(length))
+
+    start  = _aligned(_PREFIX.size + length)
+    mapped = np.memmap(path, dtype=np.uint8, mode='r')
+    arrays = {}
+    for name, entry in header['arrays'].items():
+        dtype = np.dtype(entry['dtype'])
+        count = int(np.prod(entry['shape'], dtype=np.int64))
+        begin = start + entry['offset']
+        arrays[name] = mapped[begin:begin + count * dtype.itemsize] \
+            .view(dtype).reshape(entry['shape'])
+
+    mf_params = header['mf_params']
+    inputs    = tuple(header['rule_inputs'])
+    output    = header['rule_output']
+    compiled  = CompiledRules(
+        inputs       = inputs,
+        output       = output,
+        input_terms  = tuple(tuple(mf_params[name]) for name in inputs),
+        output_terms = tuple(mf_params[output]),
+        antecedents  = arrays['rules/antecedents'].astype(np.intp, copy=False),
+        consequents  = arrays['rules/consequents'],
+    )
+    model = FuzzyModel.from_compiled(
+        mf_params, {name: tuple(r) for name, r in header['input_ranges'].items()},
+        header['rule_definitions'], compiled)
+    return Snapshot(model, arrays, header)
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // ALIGNMENT) * ALIGNMENT
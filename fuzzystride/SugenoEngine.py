@@ -0,0 +1,94 @@
+import numpy as np
+from typing import Dict, Optional
+
+from fuzzystride.FuzzyEngine import FuzzyEngine
+from fuzzystride.FuzzyModel import FuzzyModel
+from fuzzystride.Instrumentation import Instrumentation
+
+
+class SugenoEngine(FuzzyEngine):
+    """Zero-order Takagi-Sugeno variant of ``FuzzyEngine``.
+
+    Uses the same fuzzification and rule table, but each output term is a
+    constant level (its ``trimf`` peak unless ``levels`` overrides it) and
+    the crisp value is the mean of the fired rules' levels weighted by
+    their firing strengths. Nothing is clipped, aggregated or integrated
+    over the output universe.
+
+    Results have the ``FuzzyEngine`` shape; ``output_strengths`` hold the
+    summed firing strength per consequent and the status is still the
+    output term the crisp value belongs to most.
+    """
+
+    DEFUZZ_METHODS = ('weighted_average',)
+
+    def __init__(self, model: FuzzyModel,
+                 levels: Optional[Dict[str, float]] = None,
+                 metrics: Optional[Instrumentation] = None):
+        self._level_overrides = dict(levels or {})
+        super().__init__(model, 'weighted_average', metrics)
+
+    def _prepare_output(self):
+        super()._prepare_output()
+        params = self.model.mf_params[self.model.rule_output]
+        levels = {t: float(params[t][1]) for t in self._out_terms}
+        for term, level in self._level_overrides.items():
+            if term not in levels:
+                raise ValueError(f"Unknown output term '{term}'.")
+            levels[term] = float(level)
+        self.levels        = levels
+        self._level_vector = np.array([levels[t] for t in self._out_terms])
+
+    def deviation(self, hr, pc, dist, defuzz_method: str = 'centroid'):
+        """``Accuracy.Comparison`` of this engine against Mamdani inference
+        with ``defuzz_method`` on the given inputs."""
+        from fuzzystride.Accuracy import compare
+
+        mamdani = FuzzyEngine(self.model, defuzz_method).evaluate_batch(
+            hr, pc, dist).crisp_values
+        sugeno  = self.evaluate_batch(hr, pc, dist).crisp_values
+        return compare(self.model, 'sugeno', sugeno,
+                       defuzz_method, mamdani, speedup=float('nan'))
+
+
+    def _out_strengths(self, fired: list) -> np.ndarray:
+        # Summed (not max) firing strength per consequent.
+        strengths = self._scratch().strengths
+        strengths[:] = 0.0
+        index = self._out_index
+        for _, _, out_term, firing_strength in fired:
+            strengths[index[out_term]] += firing_strength
+        return strengths
+
+    def _scalar_crisp(self, strengths: np.ndarray) -> float:
+        total = float(strengths.sum())
+        if total <= 0:
+            return float('nan')
+        return float(strengths @ self._level_vector) / total
+
+    def _batch_crisp(self, values: Dict[str, np.ndarray],
+                     metrics: Optional[Instrumentation] = None) -> np.ndarray:
+        m      = self.model
+        rules  = m.compiled_rules
+        if metrics is not None:
+            t = metrics.clock()
+
+        degrees = [m.degree_matrix(name, values[name]) for name in rules.inputs]
+        if metrics is not None:
+            t = metrics.lap('batch', 'fuzzify', t)
+        firing = rules.fire(degrees)
+        if metrics is not None:
+            t = metrics.lap('batch', 'fire', t)
+            metrics.count('rules_fired', int(np.count_nonzero(firing)))
+        # The one-hot consequent matrix sums firing strengths per term.
+        strengths = firing @ rules.consequents
+        if metrics is not None:
+            t = metrics.lap('batch', 'aggregate', t)
+
+        total = strengths.sum(axis=1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            crisp = np.where(total > 0,
+                             strengths @ self._level_vector / total, np.nan)
+        if metrics is not None:
+            metrics.lap('batch', 'defuzz', t)
+        return crisp
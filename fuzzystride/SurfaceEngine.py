@@ -0,0 +1,168 @@
+import hashlib
+import json
+import os
+import numpy as np
+from pathlib import Path
+from typing import Optional, Tuple
+
+from fuzzystride.FuzzyEngine import FuzzyEngine, BatchResult
+
+
+class SurfaceEngine:
+    """Precomputed crisp-output surface over (heart rate, pacing, distance).
+
+    The crisp value is sampled once on a regular grid spanning the model's
+    input ranges and queried by trilinear interpolation. With ``cache_dir``
+    the table is stored as ``surface-<key>.npy`` (memory-mapped on load)
+    next to a JSON sidecar, where the key hashes the MF parameters, rule
+    table, grid shape and defuzzification method.
+
+    ``max_error`` / ``mean_error`` are measured against the engine on
+    ``error_samples`` random points when the table is built; pass
+    ``tolerance`` to reject tables that are too coarse. A ``table`` built
+    earlier (e.g. from a snapshot) is used as is, with its ``meta``.
+    """
+
+    INPUTS = ('heart_rate', 'pacing', 'distance')
+
+    # 1 bpm x 0.1 min/km x 0.5 km
+    DEFAULT_SHAPE = (91, 61, 85)
+
+    def __init__(self, engine: FuzzyEngine,
+                 shape: Tuple[int, int, int] = DEFAULT_SHAPE,
+                 cache_dir: Optional[str] = None,
+                 error_samples: int = 20000,
+                 tolerance: Optional[float] = None,
+                 table: Optional[np.ndarray] = None,
+                 meta: Optional[dict] = None):
+        if len(shape) != 3 or min(shape) < 2:
+            raise ValueError("shape must give at least 2 nodes per input.")
+        self.engine = engine
+        self.shape  = tuple(int(n) for n in shape)
+        self.ranges = tuple(
+            tuple(float(v) for v in engine.model.input_ranges[name])
+            for name in self.INPUTS)
+        self.axes   = tuple(np.linspace(lo, hi, n)
+                            for (lo, hi), n in zip(self.ranges, self.shape))
+        self.key    = self._cache_key()
+
+        path = Path(cache_dir) / f"surface-{self.key}.npy" if cache_dir else None
+        if table is not None:
+            if table.shape != self.shape or meta is None:
+                raise ValueError("table must have the given shape and come "
+                                 "with its meta.")
+            self.table = table
+        elif path is not None and path.exists():
+            self.table = np.load(path, mmap_mode='r')
+            meta = json.loads(path.with_suffix('.json').read_text())
+        else:
+            self.table = self._build_table()
+            meta = self._measure_error(error_samples)
+            if path is not None:
+                self._save(path, meta)
+
+        self.max_error  = meta['max_error']
+        self.mean_error = meta['mean_error']
+        if tolerance is not None and self.max_error > tolerance:
+            raise ValueError(
+                f"Surface max error {self.max_error:.2e} exceeds tolerance "
+                f"{tolerance:.2e}; use a finer shape than {self.shape}.")
+
+    def crisp(self, hr, pc, dist):
+        """Interpolated crisp value; NaN outside the open input ranges.
+
+        The faces of the input box are excluded as well: no rule fires
+        there, so ``FuzzyEngine`` gives NaN too.
+        """
+        values = [np.asarray(v, dtype=float) for v in (hr, pc, dist)]
+        scalar = all(v.ndim == 0 for v in values)
+        values = np.broadcast_arrays(*(np.atleast_1d(v) for v in values))
+
+        inside = np.ones(values[0].shape, dtype=bool)
+        index, frac = [], []
+        for v, (lo, hi), n in zip(values, self.ranges, self.shape):
+            inside &= (v > lo) & (v < hi)
+            u = np.clip((v - lo) / (hi - lo) * (n - 1), 0, n - 1)
+            i = np.minimum(u.astype(np.intp), n - 2)
+            index.append(i)
+            frac.append(u - i)
+
+        (i, j, k), (fi, fj, fk) = index, frac
+        t = self.table
+        c00 = t[i, j, k]         * (1 - fk) + t[i, j, k + 1]         * fk
+        c01 = t[i, j + 1, k]     * (1 - fk) + t[i, j + 1, k + 1]     * fk
+        c10 = t[i + 1, j, k]     * (1 - fk) + t[i + 1, j, k + 1]     * fk
+        c11 = t[i + 1, j + 1, k] * (1 - fk) + t[i + 1, j + 1, k + 1] * fk
+        c0  = c00 * (1 - fj) + c01 * fj
+        c1  = c10 * (1 - fj) + c11 * fj
+        out = np.where(inside, c0 * (1 - fi) + c1 * fi, np.nan)
+        return float(out[0]) if scalar else out
+
+    def evaluate_batch(self, hr, pc, dist) -> BatchResult:
+        hr   = np.asarray(hr,   dtype=float).ravel()
+        pc   = np.asarray(pc,   dtype=float).ravel()
+        dist = np.asarray(dist, dtype=float).ravel()
+        if not (len(hr) == len(pc) == len(dist)):
+            raise ValueError("hr, pc and dist must have the same length.")
+
+        crisp = self.crisp(hr, pc, dist)
+        membership_degrees = self.engine._membership_degrees(crisp)
+        status_codes = np.argmax(
+            np.vstack(list(membership_degrees.values())), axis=0
+        ).astype(np.int8)
+        status_codes[np.isnan(crisp)] = -1
+
+        return BatchResult(
+            heart_rate   = hr,
+            pacing       = pc,
+            distance     = dist,
+            crisp_values = crisp,
+            status_codes = status_codes,
+            membership_degrees = membership_degrees,
+        )
+
+
+    def _cache_key(self) -> str:
+        payload = json.dumps({
+            'model':  self.engine.model.parameter_hash(),
+            'method': self.engine.defuzz_method,
+            'shape':  self.shape,
+            'ranges': self.ranges,
+        }, sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+    def _build_table(self) -> np.ndarray:
+        # Every rule is silent on the faces of the input box (each term's
+        # degree is 0 at its own endpoints), so boundary nodes are sampled
+        # a hair inside to keep the table NaN-free.
+        nodes = []
+        for axis, (lo, hi) in zip(self.axes, self.ranges):
+            eps = 1e-9 * (hi - lo)
+            nodes.append(np.clip(axis, lo + eps, hi - eps))
+        hr, pc, dist = np.meshgrid(*nodes, indexing='ij')
+        result = self.engine.evaluate_batch(hr, pc, dist)
+        return result.crisp_values.reshape(self.shape)
+
+    def _measure_error(self, samples: int) -> dict:
+        rng = np.random.default_rng(0)
+        points = [rng.uniform(lo, hi, samples) for lo, hi in self.ranges]
+        exact  = self.engine.evaluate_batch(*points).crisp_values
+        error  = np.abs(self.crisp(*points) - exact)
+        return {
+            'max_error':  float(np.nanmax(error)),
+            'mean_error': float(np.nanmean(error)),
+        }
+
+    def _save(self, path: Path, meta: dict):
+        # The .npy is moved into place last: its presence marks a complete
+        # cache entry.
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.with_suffix('.json').write_text(json.dumps({
+            'key':    self.key,
+            'shape':  self.shape,
+            'ranges': self.ranges,
+            **meta,
+        }, indent=2))
+        tmp = path.with_suffix('.tmp.npy')
+        np.save(tmp, self.table)
+        os.replace(tmp, path)
@@ -0,0 +1,337 @@
+import os
+import threading
+import numpy as np
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Dict, Optional, Sequence, Union
+
+from fuzzystride.FuzzyEngine import FuzzyEngine, BatchResult
+
+ACUTE_DAYS   = 7
+CHRONIC_DAYS = 28
+TRACKER_VERSION = 1
+
+Day = Union[int, date]
+
+
+@dataclass
+class TrainingLoad:
+    """Rolling view of one athlete, ending on ``day``.
+
+    ``acute`` and ``chronic`` are the mean crisp status over the last
+    ``acute_days`` and ``chronic_days`` (NaN without evaluations); the
+    ``*_counts`` map each status label to its number of evaluations.
+    """
+    athlete_id:     str
+    day:            int                     # proleptic ordinal, see date.toordinal
+    acute:          float
+    chronic:        float
+    acute_counts:   Dict[str, int]
+    chronic_counts: Dict[str, int]
+    total_counts:   Dict[str, int]
+
+    @property
+    def ratio(self) -> float:
+        """Acute:chronic ratio; above 1 the recent load is rising."""
+        return self.acute / self.chronic if self.chronic else float('nan')
+
+
+class LoadTracker:
+    """Rolling training status for many athletes, updated per evaluation.
+
+    Each athlete is a row of preallocated arrays: a ring of ``chronic_days``
+    daily buckets (crisp sum, evaluation count, count per status) plus
+    running sums over the acute and chronic windows. An update adds to
+    today's bucket and to the running sums; moving to a later day
+    subtracts the buckets leaving each window and clears the recycled
+    ones, at most ``chronic_days`` buckets however long the gap. Reading
+    a window is therefore O(1) and never touches the history.
+
+    Evaluations older than the chronic window are dropped (counted in
+    ``dropped``), as are rows where no rule fired (``empty``). Rows are
+    grown by doubling, so the tracker holds thousands of athletes in a few
+    contiguous arrays; ``save`` and ``restore`` round-trip the whole state.
+    """
+
+    def __init__(self, acute_days: int = ACUTE_DAYS,
+                 chronic_days: int = CHRONIC_DAYS, capacity: int = 64):
+        if not 1 <= acute_days <= chronic_days:
+            raise ValueError("Need 1 <= acute_days <= chronic_days.")
+        self.acute_days   = acute_days
+        self.chronic_days = chronic_days
+        self.labels       = FuzzyEngine.STATUS_LABELS
+        self.dropped      = 0
+        self.empty        = 0
+        self._ids: Dict[str, int] = {}
+        self._lock        = threading.Lock()
+        self._allocate(max(capacity, 1))
+
+    def _allocate(self, rows: int):
+        n_days, n_status = self.chronic_days, len(self.labels)
+        self._day_sum     = np.zeros((rows, n_days))
+        self._day_count   = np.zeros((rows, n_days), dtype=np.int32)
+        self._day_status  = np.zeros((rows, n_days, n_status), dtype=np.int32)
+        self._last_day    = np.zeros(rows, dtype=np.int64)
+        # Running sums; index 0 is the acute window, 1 the chronic one.
+        self._sum         = np.zeros((rows, 2))
+        self._count       = np.zeros((rows, 2), dtype=np.int64)
+        self._status      = np.zeros((rows, 2, n_status), dtype=np.int64)
+        self._total       = np.zeros((rows, n_status), dtype=np.int64)
+
+    _ARRAYS = ('_day_sum', '_day_count', '_day_status', '_last_day',
+               '_sum', '_count', '_status', '_total')
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, athlete_id: str) -> bool:
+        return athlete_id in self._ids
+
+    @property
+    def athletes(self):
+        return list(self._ids)
+
+    def _row(self, athlete_id: str, day: int) -> int:
+        row = self._ids.get(athlete_id)
+        if row is not None:
+            return row
+        row = len(self._ids)
+        if row == len(self._last_day):
+            for name in self._ARRAYS:
+                old = getattr(self, name)
+                new = np.zeros((2 * len(old),) + old.shape[1:], dtype=old.dtype)
+                new[:len(old)] = old
+                setattr(self, name, new)
+        self._ids[athlete_id] = row
+        self._last_day[row]   = day
+        return row
+
+    # Updates
+    def update(self, athlete_id: str, day: Day, crisp: float, status_code: int):
+        """Record one evaluation of ``athlete_id`` on ``day``.
+
+        ``day`` is a ``date``/``datetime`` or a proleptic ordinal
+        (``date.toordinal()``); ``status_code`` indexes
+        ``FuzzyEngine.STATUS_LABELS``.
+        """
+        day = _ordinal(day)
+        with self._lock:
+            self._update(self._row(athlete_id, day), day, float(crisp),
+                         int(status_code))
+
+    def update_batch(self, athlete_ids: Sequence[str], days,
+                     result: BatchResult):
+        """Record the rows of a ``BatchResult`` (``days``: one or per row).
+
+        Vectorised: rows are added to their daily buckets with one scatter
+        per array and the running sums of the athletes touched are
+        recomputed from their rings. The outcome is that of ``update``
+        over the rows sorted by day.
+        """
+        n_days = self.chronic_days
+        days   = np.array([_ordinal(d) for d in np.broadcast_to(
+            np.asarray(days, dtype=object), (len(result),))], dtype=np.int64)
+        if len(athlete_ids) != len(result):
+            raise ValueError("athlete_ids and result must have the same length.")
+        crisp = np.asarray(result.crisp_values, dtype=float)
+        codes = np.asarray(result.status_codes, dtype=np.intp)
+        valid = (codes >= 0) & ~np.isnan(crisp)
+
+        # New athletes start on their earliest day in the batch, as they
+        # would with ``update`` over the rows sorted by day.
+        first = {}
+        for athlete_id, day in zip(athlete_ids, days.tolist()):
+            if day < first.get(athlete_id, day + 1):
+                first[athlete_id] = day
+
+        with self._lock:
+            rows = np.array([self._row(a, first[a]) for a in athlete_ids],
+                            dtype=np.intp)
+            self.empty += int(np.count_nonzero(~valid))
+            rows, days, crisp, codes = rows[valid], days[valid], crisp[valid], codes[valid]
+
+            touched, index = np.unique(rows, return_inverse=True)
+            previous = self._last_day[touched]
+            latest   = previous.copy()
+            np.maximum.at(latest, index, days)
+
+            # Rows too old for the window before this batch are dropped;
+            # rows only too old for the window after it still count in
+            # the totals, as they would one at a time.
+            keep = previous[index] - days < n_days
+            self.dropped += int(np.count_nonzero(~keep))
+            np.add.at(self._total, (rows[keep], codes[keep]), 1)
+            self._advance_rows(touched, latest)
+
+            keep = latest[index] - days < n_days
+            rows, days, crisp, codes = rows[keep], days[keep], crisp[keep], codes[keep]
+            slots = days % n_days
+            np.add.at(self._day_sum,    (rows, slots), crisp)
+            np.add.at(self._day_count,  (rows, slots), 1)
+            np.add.at(self._day_status, (rows, slots, codes), 1)
+            self._refresh(touched)
+
+    def _update(self, row: int, day: int, crisp: float, code: int):
+        if code < 0 or crisp != crisp:
+            self.empty += 1
+            return
+        age = int(self._last_day[row]) - day
+        if age < 0:
+            self._advance(row, day)
+            age = 0
+        elif age >= self.chronic_days:
+            self.dropped += 1
+            return
+
+        slot = day % self.chronic_days
+        self._day_sum[row, slot]          += crisp
+        self._day_count[row, slot]        += 1
+        self._day_status[row, slot, code] += 1
+        windows = slice(0, 2) if age < self.acute_days else slice(1, 2)
+        self._sum[row, windows]          += crisp
+        self._count[row, windows]        += 1
+        self._status[row, windows, code] += 1
+        self._total[row, code]           += 1
+
+    def _advance(self, row: int, day: int):
+        # Move the row's newest day forward to ``day``: each day entering
+        # the ring evicts the bucket leaving the acute window and recycles
+        # the one leaving the chronic window.
+        last, n_days = int(self._last_day[row]), self.chronic_days
+        self._last_day[row] = day
+        if day - last >= n_days:
+            self._day_sum[row]    = 0
+            self._day_count[row]  = 0
+            self._day_status[row] = 0
+            self._sum[row]        = 0
+            self._count[row]      = 0
+            self._status[row]     = 0
+            return
+        acute = self.acute_days
+        for d in range(last + 1, day + 1):
+            leaving = (d - acute) % n_days
+            self._sum[row, 0]    -= self._day_sum[row, leaving]
+            self._count[row, 0]  -= self._day_count[row, leaving]
+            self._status[row, 0] -= self._day_status[row, leaving]
+            slot = d % n_days
+            self._sum[row, 1]    -= self._day_sum[row, slot]
+            self._count[row, 1]  -= self._day_count[row, slot]
+            self._status[row, 1] -= self._day_status[row, slot]
+            self._day_sum[row, slot]    = 0
+            self._day_count[row, slot]  = 0
+            self._day_status[row, slot] = 0
+        if self._count[row, 1] == 0:
+            # Drop the rounding residue of subtracted sums.
+            self._sum[row] = 0
+
+    def _advance_rows(self, rows: np.ndarray, days: np.ndarray):
+        # Vectorised ``_advance`` without the running sums: clear every
+        # bucket that falls out of the chronic window ending on ``days``.
+        n_days = self.chronic_days
+        last   = self._last_day[rows][:, None]
+        slot_day = last - (last - np.arange(n_days)) % n_days
+        r, c = np.nonzero(slot_day <= days[:, None] - n_days)
+        self._day_sum[rows[r], c]    = 0
+        self._day_count[rows[r], c]  = 0
+        self._day_status[rows[r], c] = 0
+        self._last_day[rows] = days
+
+    def _refresh(self, rows: np.ndarray):
+        # Running sums of ``rows`` recomputed from their rings.
+        n_days = self.chronic_days
+        age    = (self._last_day[rows][:, None] - np.arange(n_days)) % n_days
+        acute  = age < self.acute_days
+        day_sum, day_count = self._day_sum[rows], self._day_count[rows]
+        day_status = self._day_status[rows]
+        self._sum[rows]    = np.stack([(day_sum * acute).sum(1), day_sum.sum(1)], 1)
+        self._count[rows]  = np.stack([(day_count * acute).sum(1),
+                                       day_count.sum(1)], 1)
+        self._status[rows] = np.stack([(day_status * acute[:, :, None]).sum(1),
+                                       day_status.sum(1)], 1)
+
+    # Queries
+    def rolling(self, athlete_id: str, day: Optional[Day] = None) -> TrainingLoad:
+        """Rolling windows of ``athlete_id`` ending on ``day``.
+
+        ``day`` defaults to the athlete's latest evaluation; a later day
+        ages the windows (and moves the tracker forward to it).
+        """
+        if athlete_id not in self._ids:
+            raise ValueError(f"Unknown athlete '{athlete_id}'.")
+        with self._lock:
+            row = self._ids[athlete_id]
+            if day is not None and _ordinal(day) > self._last_day[row]:
+                self._advance(row, _ordinal(day))
+            sums, counts = self._sum[row].copy(), self._count[row].copy()
+            status, total = self._status[row].copy(), self._total[row].copy()
+            last = int(self._last_day[row])
+        means = np.divide(sums, counts, out=np.full(2, np.nan),
+                          where=counts > 0)
+        return TrainingLoad(
+            athlete_id     = athlete_id,
+            day            = last,
+            acute          = float(means[0]),
+            chronic        = float(means[1]),
+            acute_counts   = self._counts(status[0]),
+            chronic_counts = self._counts(status[1]),
+            total_counts   = self._counts(total),
+        )
+
+    def _counts(self, row: np.ndarray) -> Dict[str, int]:
+        return {label: int(n) for label, n in zip(self.labels, row)}
+
+    def means(self):
+        """Acute and chronic mean crisp status of every athlete.
+
+        Returns ``(athlete_ids, acute, chronic)``, each window as of the
+        athlete's latest evaluation.
+        """
+        n = len(self._ids)
+        with self._lock:
+            sums, counts = self._sum[:n].copy(), self._count[:n].copy()
+        means = np.divide(sums, counts, out=np.full(sums.shape, np.nan),
+                          where=counts > 0)
+        return list(self._ids), means[:, 0], means[:, 1]
+
+    # Persistence
+    def save(self, path: str):
+        """Write the whole state to an ``.npz`` file (atomically)."""
+        n = len(self._ids)
+        with self._lock:
+            arrays = {name.lstrip('_'): getattr(self, name)[:n]
+                      for name in self._ARRAYS}
+            meta = np.array([TRACKER_VERSION, self.acute_days,
+                             self.chronic_days, self.dropped, self.empty])
+            ids  = np.array(list(self._ids), dtype=str)
+        tmp = f"{path}.tmp"
+        with open(tmp, 'wb') as f:
+            np.savez(f, meta=meta, ids=ids, **arrays)
+        os.replace(tmp, path)
+
+    @classmethod
+    def restore(cls, path: str) -> "LoadTracker":
+        """Tracker saved with ``save``."""
+        with np.load(path, allow_pickle=False) as data:
+            version, acute, chronic, dropped, empty = data['meta'].tolist()
+            if version > TRACKER_VERSION:
+                raise ValueError(
+                    f"{path} is tracker version {version}; this FuzzyStride "
+                    f"reads up to version {TRACKER_VERSION}.")
+            ids     = data['ids'].tolist()
+            tracker = cls(acute, chronic, capacity=len(ids))
+            if data['status'].shape[-1] != len(tracker.labels):
+                raise ValueError(f"{path} was saved with other status labels.")
+            for name in cls._ARRAYS:
+                getattr(tracker, name)[:len(ids)] = data[name.lstrip('_')]
+        tracker._ids    = {athlete_id: row for row, athlete_id in enumerate(ids)}
+        tracker.dropped = dropped
+        tracker.empty   = empty
+        return tracker
+
+
+def _ordinal(day: Day) -> int:
+    if isinstance(day, datetime):
+        day = day.date()
+    if isinstance(day, date):
+        return day.toordinal()
+    return int(day)
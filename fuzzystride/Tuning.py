@@ -0,0 +1,558 @@
+import json
+import os
+import sys
+import time
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import islice, product
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from fuzzystride.Batch import INPUT_FIELDS, open_text, detect_format, read_records
+from fuzzystride.FuzzyEngine import FuzzyEngine, BatchResult, validate_batch
+from fuzzystride.FuzzyModel import FuzzyModel
+
+# 'error_rate' and 'membership' need status labels, 'mse' crisp targets.
+# 'membership' is the mean of (1 - degree of the labelled status at the
+# crisp value), a smoother stand-in for the error rate.
+LOSSES     = ('error_rate', 'membership', 'mse')
+STRATEGIES = ('grid', 'random', 'evolutionary')
+CHECKPOINT_VERSION = 1
+
+_ABC = 'abc'
+
+
+# Data
+@dataclass
+class Dataset:
+    """Labelled workouts; ``labels`` index ``FuzzyEngine.STATUS_LABELS``."""
+    heart_rate: np.ndarray
+    pacing:     np.ndarray
+    distance:   np.ndarray
+    labels:     Optional[np.ndarray] = None
+    targets:    Optional[np.ndarray] = None
+    skipped:    int = 0
+
+    def __len__(self) -> int:
+        return len(self.heart_rate)
+
+
+def load_dataset(path: str, label_column: Optional[str] = 'status',
+                 target_column: Optional[str] = None,
+                 input_format: Optional[str] = None,
+                 ranges: Optional[dict] = None) -> Dataset:
+    """Read a CSV/JSONL workout log with a status and/or crisp target column.
+
+    Rows with invalid inputs, unknown labels or unparsable targets are
+    skipped and counted in ``Dataset.skipped``.
+    """
+    ranges = ranges or FuzzyModel().input_ranges
+    stream = open_text(path)
+    try:
+        records = [r for r in read_records(stream, input_format or detect_format(path))
+                   if r is not None]
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+    valid  = np.ones(len(records), dtype=bool)
+    inputs = {}
+    for name, label in INPUT_FIELDS:
+        parsed, _ = validate_batch([r.get(name) for r in records],
+                                   *ranges[name], label)
+        inputs[name] = parsed
+        valid &= ~np.isnan(parsed)
+
+    labels = targets = None
+    if label_column:
+        lookup = {s.lower(): k for k, s in enumerate(FuzzyEngine.STATUS_LABELS)}
+        labels = np.array([lookup.get(str(r.get(label_column, '')).strip().lower(), -1)
+                           for r in records], dtype=np.int8)
+        valid &= labels >= 0
+    if target_column:
+        targets, _ = validate_batch([r.get(target_column) for r in records],
+                                    0.0, 1.0, target_column)
+        valid &= ~np.isnan(targets)
+
+    skipped = int(len(records) - valid.sum())
+    return Dataset(
+        heart_rate = inputs['heart_rate'][valid],
+        pacing     = inputs['pacing'][valid],
+        distance   = inputs['distance'][valid],
+        labels     = labels[valid]  if labels  is not None else None,
+        targets    = targets[valid] if targets is not None else None,
+        skipped    = skipped,
+    )
+
+
+def loss_value(loss: str, result: BatchResult, dataset: Dataset) -> float:
+    """``loss`` of a batch result over the whole dataset (lower is better).
+
+    Rows where no rule fired count as fully wrong.
+    """
+    if loss == 'mse':
+        if dataset.targets is None:
+            raise ValueError("The 'mse' loss needs crisp targets.")
+        error = np.nan_to_num(result.crisp_values - dataset.targets, nan=1.0)
+        return float(np.mean(error ** 2))
+    if dataset.labels is None:
+        raise ValueError(f"The '{loss}' loss needs status labels.")
+    if loss == 'error_rate':
+        return float(np.mean(result.status_codes != dataset.labels))
+    if loss == 'membership':
+        degrees = np.vstack([result.membership_degrees[label]
+                             for label in FuzzyEngine.STATUS_LABELS])
+        picked  = degrees[dataset.labels, np.arange(len(dataset))]
+        return float(np.mean(1.0 - np.nan_to_num(picked, nan=0.0)))
+    raise ValueError(f"loss must be one of {LOSSES}.")
+
+
+# Search space
+@dataclass(frozen=True)
+class Parameter:
+    """One ``trimf`` breakpoint: ``index`` 0/1/2 is a/b/c of the term."""
+    var:   str
+    term:  str
+    index: int
+    low:   float
+    high:  float
+
+    @property
+    def name(self) -> str:
+        return f"{self.var}.{self.term}.{_ABC[self.index]}"
+
+
+class ParameterSpace:
+    """Maps candidate vectors to MF parameters and rule consequents.
+
+    The continuous part holds the named breakpoints, each bounded to
+    ``spread`` times its variable's range around the model's value (and to
+    the range itself). With ``rules=True`` one discrete coordinate per
+    rule follows, holding the index of its output term. Breakpoints of a
+    term are sorted after substitution, so every vector is a valid model.
+    """
+
+    def __init__(self, model: FuzzyModel, variables: Optional[Sequence[str]] = None,
+                 parameters: Optional[Sequence[str]] = None,
+                 spread: float = 0.15, rules: bool = False):
+        self.mf_params    = {var: dict(terms) for var, terms in model.mf_params.items()}
+        self.input_ranges = dict(model.input_ranges)
+        self.rule_inputs  = model.rule_inputs
+        self.rule_output  = model.rule_output
+        self.rule_definitions = list(model.rule_definitions)
+        self.output_terms = tuple(model.mf_params[model.rule_output])
+
+        if parameters is None:
+            parameters = [f"{var}.{term}.{k}"
+                          for var in (variables or model.rule_inputs)
+                          for term in model.mf_params.get(var, {}) for k in _ABC]
+        self.parameters = [self._parameter(model, name, spread)
+                           for name in parameters]
+        self.rules = rules
+
+        n_rules   = len(self.rule_definitions) if rules else 0
+        self.low  = np.array([p.low for p in self.parameters] + [0] * n_rules,
+                             dtype=float)
+        self.high = np.array([p.high for p in self.parameters] +
+                             [len(self.output_terms) - 1] * n_rules, dtype=float)
+        self.discrete = np.arange(len(self.low)) >= len(self.parameters)
+
+    def _parameter(self, model: FuzzyModel, name: str, spread: float) -> Parameter:
+        try:
+            var, term, letter = name.split('.')
+            value = model.mf_params[var][term][_ABC.index(letter)]
+        except (ValueError, KeyError):
+            raise ValueError(f"Unknown MF parameter '{name}' "
+                             f"(expected variable.term.a|b|c).")
+        if var in model.input_ranges:
+            lo, hi = model.input_ranges[var]
+        else:
+            universe = model.universes[var]
+            lo, hi   = float(universe[0]), float(universe[-1])
+        width = spread * (hi - lo)
+        return Parameter(var, term, _ABC.index(letter),
+                         max(lo, value - width), min(hi, value + width))
+
+    def __len__(self) -> int:
+        return len(self.low)
+
+    @property
+    def names(self) -> List[str]:
+        return [p.name for p in self.parameters] + \
+               [f"rule{r + 1}" for r in range(int(self.discrete.sum()))]
+
+    def initial(self) -> np.ndarray:
+        values = [self.mf_params[p.var][p.term][p.index] for p in self.parameters]
+        if self.rules:
+            lookup  = {t: k for k, t in enumerate(self.output_terms)}
+            values += [lookup[row[-1]] for row in self.rule_definitions]
+        return np.array(values, dtype=float)
+
+    def clip(self, vectors: np.ndarray) -> np.ndarray:
+        vectors = np.clip(vectors, self.low, self.high)
+        vectors[..., self.discrete] = np.round(vectors[..., self.discrete])
+        return vectors
+
+    def sample(self, rng: np.random.Generator, n: int) -> np.ndarray:
+        return self.clip(rng.uniform(self.low, self.high + self.discrete,
+                                     size=(n, len(self))) - 0.5 * self.discrete)
+
+    def grid(self, levels: int) -> Iterator[np.ndarray]:
+        axes = [np.arange(lo, hi + 1) if discrete else np.linspace(lo, hi, levels)
+                for lo, hi, discrete in zip(self.low, self.high, self.discrete)]
+        for point in product(*axes):
+            yield np.array(point, dtype=float)
+
+    def grid_size(self, levels: int) -> int:
+        sizes = np.where(self.discrete, self.high - self.low + 1, levels)
+        return int(np.prod(sizes.astype(float)))
+
+    def apply(self, vector: np.ndarray) -> Tuple[Dict[str, Dict[str, tuple]],
+                                                 List[tuple]]:
+        """``(mf_params overrides, rule table)`` of a candidate vector."""
+        changed = {}
+        for p, value in zip(self.parameters, vector):
+            abc = changed.setdefault((p.var, p.term),
+                                     list(self.mf_params[p.var][p.term]))
+            abc[p.index] = float(value)
+        mf_params = {}
+        for (var, term), abc in changed.items():
+            mf_params.setdefault(var, {})[term] = tuple(sorted(abc))
+
+        rules = self.rule_definitions
+        if self.rules:
+            codes = vector[len(self.parameters):].astype(int)
+            rules = [(*row[:-1], self.output_terms[k])
+                     for row, k in zip(self.rule_definitions, codes)]
+        return mf_params, rules
+
+    def build(self, vector: np.ndarray,
+              rules_path: Optional[str] = None) -> FuzzyModel:
+        mf_params, rules = self.apply(vector)
+        model = FuzzyModel(rules_path, mf_params)
+        if self.rules:
+            model.set_rules(rules, self.rule_inputs, self.rule_output)
+        return model
+
+
+# Scoring
+class _Scorer:
+    def __init__(self, dataset: Dataset, space: ParameterSpace, loss: str,
+                 defuzz_method: str, rules_path: Optional[str]):
+        self.dataset       = dataset
+        self.space         = space
+        self.loss          = loss
+        self.defuzz_method = defuzz_method
+        self.rules_path    = rules_path
+
+    def __call__(self, vector: np.ndarray) -> float:
+        d      = self.dataset
+        model  = self.space.build(vector, self.rules_path)
+        result = FuzzyEngine(model, self.defuzz_method).evaluate_batch(
+            d.heart_rate, d.pacing, d.distance)
+        return loss_value(self.loss, result, d)
+
+
+# Scorer of the current worker process, set once by _init_worker.
+_SCORER: Optional[_Scorer] = None
+
+
+def _init_worker(scorer: _Scorer):
+    global _SCORER
+    _SCORER = scorer
+
+
+def _score(vector: np.ndarray) -> float:
+    return _SCORER(vector)
+
+
+# Search
+@dataclass
+class TuningResult:
+    names:        List[str]
+    best_vector:  np.ndarray
+    best_loss:    float
+    initial_loss: float
+    mf_params:    Dict[str, Dict[str, tuple]]
+    rules:        List[tuple]
+    evaluations:  int
+    generations:  int
+    elapsed:      float
+    stopped:      str             # 'budget', 'exhausted', 'patience' or 'target'
+    history:      List[float] = field(default_factory=list)
+
+
+class Tuner:
+    """Fits MF breakpoints (and optionally rule consequents) to a dataset.
+
+    Candidates are scored in generations of ``population``: every
+    candidate is one batch evaluation over the whole dataset, spread over
+    a process pool of ``workers`` (in-process when 1). 'grid' walks a
+    ``grid_levels``-per-parameter grid, 'random' samples the bounds
+    uniformly and 'evolutionary' runs a real-coded genetic algorithm
+    (tournament selection, blend crossover, Gaussian mutation, elitism),
+    all starting from the model's current parameters.
+
+    The search stops after ``budget`` evaluations, once the best loss has
+    not improved by ``min_delta`` for ``patience`` generations, or once it
+    reaches ``target_loss``. With ``checkpoint`` the state is written
+    after every generation and ``run(resume=True)`` continues from it.
+    """
+
+    def __init__(self, dataset: Dataset, space: ParameterSpace,
+                 loss: str = 'error_rate', strategy: str = 'evolutionary',
+                 workers: Optional[int] = None, defuzz_method: str = 'centroid',
+                 rules_path: Optional[str] = None, population: int = 32,
+                 budget: int = 2000, grid_levels: int = 5,
+                 patience: Optional[int] = 10, min_delta: float = 1e-4,
+                 target_loss: Optional[float] = None, mutation: float = 0.1,
+                 seed: Optional[int] = 0, checkpoint: Optional[str] = None,
+                 progress: Optional[Callable[[int, int, float], None]] = None):
+        if loss not in LOSSES:
+            raise ValueError(f"loss must be one of {LOSSES}.")
+        if strategy not in STRATEGIES:
+            raise ValueError(f"strategy must be one of {STRATEGIES}.")
+        if population < 2 or budget < 1:
+            raise ValueError("population must be at least 2 and budget positive.")
+        if not len(dataset):
+            raise ValueError("The dataset has no usable rows.")
+        if strategy == 'grid' and space.grid_size(grid_levels) > budget:
+            raise ValueError(
+                f"The grid has {space.grid_size(grid_levels):.3g} candidates, "
+                f"more than the budget of {budget}; tune fewer parameters, "
+                f"use fewer levels or another strategy.")
+        self.dataset     = dataset
+        self.space       = space
+        self.loss        = loss
+        self.strategy    = strategy
+        self.workers     = workers or os.cpu_count() or 1
+        self.population  = population
+        self.budget      = budget
+        self.grid_levels = grid_levels
+        self.patience    = patience
+        self.min_delta   = min_delta
+        self.target_loss = target_loss
+        self.mutation    = mutation
+        self.seed        = seed
+        self.checkpoint  = checkpoint
+        self.progress    = progress
+        self._scorer     = _Scorer(dataset, space, loss, defuzz_method, rules_path)
+        self._pool       = None
+
+    def __enter__(self) -> "Tuner":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def score(self, vectors: np.ndarray) -> np.ndarray:
+        """Loss of each candidate vector (rows of ``vectors``)."""
+        if self.workers == 1 or len(vectors) == 1:
+            return np.array([self._scorer(v) for v in vectors])
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                self.workers, initializer=_init_worker,
+                initargs=(self._scorer,))
+        chunk = -(-len(vectors) // self.workers)
+        return np.fromiter(self._pool.map(_score, vectors, chunksize=chunk),
+                           float, len(vectors))
+
+    def run(self, resume: bool = False) -> TuningResult:
+        start = time.perf_counter()
+        state = self._load_checkpoint() if resume else None
+        if state is None:
+            state = self._start()
+        elapsed = state['elapsed']
+        rng  = np.random.default_rng()
+        rng.bit_generator.state = state['rng']
+        grid = self.space.grid(self.grid_levels)
+        grid = islice(grid, state['grid_position'], None)
+
+        stopped = None
+        while stopped is None:
+            remaining = self.budget - state['evaluations']
+            if remaining <= 0:
+                stopped = 'budget'
+                break
+            candidates = self._next_generation(state, rng, grid, remaining)
+            if not len(candidates):
+                stopped = 'exhausted'
+                break
+            losses = self.score(candidates)
+            self._update(state, candidates, losses)
+            state['rng']     = rng.bit_generator.state
+            state['elapsed'] = elapsed + time.perf_counter() - start
+            if self.progress is not None:
+                self.progress(state['generation'], state['evaluations'],
+                              state['best_loss'])
+            self._save_checkpoint(state)
+            stopped = self._should_stop(state)
+
+        best = np.array(state['best_vector'])
+        mf_params, rules = self.space.apply(best)
+        return TuningResult(
+            names        = self.space.names,
+            best_vector  = best,
+            best_loss    = state['best_loss'],
+            initial_loss = state['initial_loss'],
+            mf_params    = mf_params,
+            rules        = rules,
+            evaluations  = state['evaluations'],
+            generations  = state['generation'],
+            elapsed      = elapsed + time.perf_counter() - start,
+            stopped      = stopped,
+            history      = state['history'],
+        )
+
+    def _start(self) -> dict:
+        initial = self.space.initial()
+        loss    = float(self.score(initial[None])[0])
+        return {
+            'generation':    0,
+            'evaluations':   1,
+            'grid_position': 0,
+            'population':    [initial.tolist()],
+            'losses':        [loss],
+            'best_vector':   initial.tolist(),
+            'best_loss':     loss,
+            'initial_loss':  loss,
+            'stale':         0,
+            'history':       [loss],
+            'elapsed':       0.0,
+            'rng':           np.random.default_rng(self.seed).bit_generator.state,
+        }
+
+    def _next_generation(self, state: dict, rng: np.random.Generator,
+                         grid: Iterator[np.ndarray], remaining: int) -> np.ndarray:
+        n = min(self.population, remaining)
+        if self.strategy == 'grid':
+            points = list(islice(grid, n))
+            state['grid_position'] += len(points)
+            return np.array(points).reshape(len(points), len(self.space))
+        if self.strategy == 'random' or len(state['population']) < 2:
+            return self.space.sample(rng, n)
+        return self._offspring(state, rng, n)
+
+    def _offspring(self, state: dict, rng: np.random.Generator,
+                   n: int) -> np.ndarray:
+        space      = self.space
+        population = np.array(state['population'])
+        losses     = np.array(state['losses'])
+
+        def tournament(k: int = 3) -> np.ndarray:
+            picks = rng.integers(len(population), size=k)
+            return population[picks[np.argmin(losses[picks])]]
+
+        children = np.empty((n, len(space)))
+        width    = space.high - space.low
+        for i in range(n):
+            a, b = tournament(), tournament()
+            # BLX-0.25 crossover; discrete genes come from either parent.
+            u = rng.uniform(-0.25, 1.25, len(space))
+            child = a + u * (b - a)
+            child[space.discrete] = np.where(rng.random(space.discrete.sum()) < 0.5,
+                                             a[space.discrete], b[space.discrete])
+            child += rng.normal(0.0, self.mutation * width) * ~space.discrete
+            reset = space.discrete & (rng.random(len(space)) < self.mutation)
+            child[reset] = rng.integers(space.low[reset].astype(int),
+                                        space.high[reset].astype(int) + 1)
+            children[i] = child
+        return space.clip(children)
+
+    def _update(self, state: dict, candidates: np.ndarray, losses: np.ndarray):
+        state['generation']  += 1
+        state['evaluations'] += len(candidates)
+        best = int(np.argmin(losses))
+        if losses[best] < state['best_loss'] - self.min_delta:
+            state['stale'] = 0
+        else:
+            state['stale'] += 1
+        if losses[best] < state['best_loss']:
+            state['best_loss']   = float(losses[best])
+            state['best_vector'] = candidates[best].tolist()
+        state['history'].append(state['best_loss'])
+
+        if self.strategy == 'evolutionary':
+            # Elitist survivor selection over parents and children.
+            pool   = np.vstack([np.array(state['population']), candidates])
+            scores = np.concatenate([state['losses'], losses])
+            keep   = np.argsort(scores, kind='stable')[:self.population]
+            state['population'] = pool[keep].tolist()
+            state['losses']     = scores[keep].tolist()
+
+    def _should_stop(self, state: dict) -> Optional[str]:
+        if self.target_loss is not None and state['best_loss'] <= self.target_loss:
+            return 'target'
+        if self.patience is not None and state['stale'] >= self.patience:
+            return 'patience'
+        return None
+
+    # Checkpoints
+    def _save_checkpoint(self, state: dict):
+        if not self.checkpoint:
+            return
+        payload = {**state,
+                   'version':  CHECKPOINT_VERSION,
+                   'strategy': self.strategy,
+                   'loss':     self.loss,
+                   'names':    self.space.names}
+        # Written aside and renamed, so a crash never leaves half a file.
+        tmp = f"{self.checkpoint}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(payload, f)
+        os.replace(tmp, self.checkpoint)
+
+    def _load_checkpoint(self) -> Optional[dict]:
+        if not self.checkpoint or not os.path.exists(self.checkpoint):
+            return None
+        with open(self.checkpoint, encoding='utf-8') as f:
+            state = json.load(f)
+        expected = (CHECKPOINT_VERSION, self.strategy, self.loss, self.space.names)
+        if (state.pop('version'), state.pop('strategy'), state.pop('loss'),
+                state.pop('names')) != expected:
+            raise ValueError(f"{self.checkpoint} is from a different tuning setup.")
+        return state
+
+
+# Export
+def export_model(result: TuningResult, path: str, space: ParameterSpace):
+    """Write the tuned model as JSON.
+
+    The file is a rule-base file (``inputs``, ``output``, ``rules``) with
+    the full ``mf_params`` and ``input_ranges`` added; ``load_model`` (or
+    ``--model`` on the command line) restores the whole model.
+    """
+    mf_params = {var: dict(terms) for var, terms in space.mf_params.items()}
+    for var, terms in result.mf_params.items():
+        mf_params[var].update(terms)
+    payload = {
+        'inputs':    list(space.rule_inputs),
+        'output':    space.rule_output,
+        'rules':     [list(row) for row in result.rules],
+        'mf_params': {var: {term: list(abc) for term, abc in terms.items()}
+                      for var, terms in mf_params.items()},
+        'input_ranges': {name: list(r)
+                         for name, r in space.input_ranges.items()},
+        'tuning': {
+            'loss':         result.best_loss,
+            'initial_loss': result.initial_loss,
+            'evaluations':  result.evaluations,
+            'stopped':      result.stopped,
+        },
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, indent=2)
+
+
+def load_model(path: str) -> FuzzyModel:
+    """``FuzzyModel`` from a file written by ``export_model``.
+
+    The file is a rule-base file with ``mf_params`` and ``input_ranges``,
+    which ``FuzzyModel`` reads itself.
+    """
+    return FuzzyModel(path)
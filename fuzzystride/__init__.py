@@ -0,0 +1,32 @@
+# fuzzystride/__init__.py
+# Headless core: imports NumPy only. GUI code lives in ui/.
+from fuzzystride.FuzzyModel import FuzzyModel
+from fuzzystride.FuzzyEngine import (
+    FuzzyEngine, EvaluationResult, BatchResult, EmptyMembershipError,
+    validate_input,
+)
+from fuzzystride.SurfaceEngine import SurfaceEngine
+from fuzzystride.SugenoEngine import SugenoEngine
+from fuzzystride.Cache import CachedEngine, CacheStats
+from fuzzystride.Instrumentation import Instrumentation, Histogram
+from fuzzystride.Registry import ModelRegistry, AthleteProfile
+from fuzzystride.Snapshot import Snapshot, save_snapshot, load_snapshot
+from fuzzystride.Training import LoadTracker, TrainingLoad
+
+# Loaded on first use: tuning pulls in multiprocessing and activity
+# parsing xml.etree, which would slow down every import of the package.
+_LAZY = {
+    'Split':             'fuzzystride.Activity',
+    'activity_timeline': 'fuzzystride.Activity',
+    'ParameterSpace':    'fuzzystride.Tuning',
+    'Tuner':             'fuzzystride.Tuning',
+    'load_dataset':      'fuzzystride.Tuning',
+    'load_model':        'fuzzystride.Tuning',
+}
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        import importlib
+        return getattr(importlib.import_module(_LAZY[name]), name)
+    raise AttributeError(f"module 'fuzzystride' has no attribute '{name}'")
@@ -0,0 +1,5 @@
+import sys
+
+from fuzzystride.Cli import main
+
+sys.exit(main())
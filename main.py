@@ -1,15 +1,19 @@
-import os
 import sys
-import ctypes
+import time
 
-if sys.platform == "win32":
-    ctypes.windll.shell32.SetCurrentProcessExplicitAppUserModelID("FuzzyStride.App")
 
-from ui.App import FuzzyStrideApp
+def main():
+    started = time.perf_counter()
+    if sys.platform == "win32":
+        import ctypes
+        ctypes.windll.shell32.SetCurrentProcessExplicitAppUserModelID("FuzzyStride.App")
 
+    # The GUI stack (tkinter, PIL, matplotlib) is imported only when the app
+    # actually starts; the fuzzystride core does not depend on it.
+    from ui.App import FuzzyStrideApp
 
-def main():
-    app = FuzzyStrideApp()
+    # Optional model snapshot (python -m fuzzystride snapshot model.fzs).
+    app = FuzzyStrideApp(started, sys.argv[1] if len(sys.argv) > 1 else None)
     app.run()
 
 
@@ -1,15 +1,19 @@
-import numpy as np
+import queue
+import sys
+import threading
+import time
 import tkinter as tk
 from tkinter import messagebox, ttk
 from PIL import Image, ImageTk
 
-from FuzzyModel import FuzzyModel
-from FuzzyEngine import FuzzyEngine, validate_input
 from ui.Widgets import (
-    AppFonts, make_section, make_labelled_entry,
+    AppFonts, make_section, make_labelled_entry, make_slider,
     make_text_box, make_info_row, configure_progress_style,
 )
-from ui.Plots import MembershipPlots, DefuzzPlot
+
+# NumPy, the fuzzy core and matplotlib (via ui.Plots) are imported by the
+# startup loader thread, behind the splash screen.
+
 
 class FuzzyStrideApp:
 
@@ -19,9 +23,32 @@ class FuzzyStrideApp:
     LOGO_PATH     = "Assets/fuzzyStride-logo.png"
     BRAND_COLOR   = "#165673"
 
-    def __init__(self):
-        self.model  = FuzzyModel()
-        self.engine = FuzzyEngine(self.model)
+    # Slider resolution per input, matching what watches report.
+    SLIDER_STEPS  = {'heart_rate': 1, 'pacing': 0.1, 'distance': 0.1}
+
+    # Share of the progress bar reached when each startup milestone is done.
+    # Background steps run on the loader thread, UI steps on the Tk thread.
+    LOAD_STEPS = (
+        ("Loading fuzzy model",            0.15),
+        ("Loading plotting library",       0.55),
+        ("Warming up inference",           0.60),
+    )
+    BUILD_STEPS = (
+        ("Building fuzzification view",    0.80),
+        ("Building inference view",        0.85),
+        ("Building defuzzification view",  1.00),
+    )
+
+    def __init__(self, started: float = None, snapshot: str = None):
+        # ``started`` is the launch time (time.perf_counter) for the
+        # time-to-interactive report; defaults to now. ``snapshot`` is an
+        # optional model snapshot file to load instead of the default model.
+        self._started        = started if started is not None else time.perf_counter()
+        self._snapshot_path  = snapshot
+        self.startup_timings = {}
+        self.model  = None
+        self.engine = None
+        self._surface = None
         self.root = tk.Tk()
         self.root.title(self.APP_TITLE)
         self.root.geometry(self.WINDOW_SIZE)
@@ -68,34 +95,114 @@ class FuzzyStrideApp:
         self._progress = ttk.Progressbar(
             center, orient="horizontal", mode="determinate",
             length=350, style="Custom.Horizontal.TProgressbar")
-        self._progress.pack(pady=(0, 8))
-
-        self._progress_value = 0
-        self._tick_progress()
-
-    def _tick_progress(self):
-        self._progress_value += 2
-        self._progress['value'] = self._progress_value
-        if self._progress_value < 100:
-            self.root.after(60, self._tick_progress)
+        self._progress.pack(pady=(0, 4))
+        self._progress_label = tk.Label(center, text="", font=self.fonts.value,
+                                        bg="white", fg=self.BRAND_COLOR)
+        self._progress_label.pack(pady=(0, 8))
+
+        self._load_events = queue.Queue()
+        threading.Thread(target=self._load, daemon=True,
+                         name="startup-loader").start()
+        self.root.after(20, self._poll_loader)
+
+    # Startup
+    def _load(self):
+        # Loader thread: heavy imports and model construction only; Tk is
+        # never touched here.
+        steps = (self._load_model, self._load_plotting, self._warm_up)
+        try:
+            for (label, fraction), step in zip(self.LOAD_STEPS, steps):
+                self._load_events.put(('step', label, None))
+                start = time.perf_counter()
+                step()
+                self.startup_timings[label] = time.perf_counter() - start
+                self._load_events.put(('step', label, fraction))
+            self._load_events.put(('done', None, None))
+        except Exception as exc:
+            self._load_events.put(('error', exc, None))
+
+    def _load_model(self):
+        from fuzzystride.FuzzyModel import FuzzyModel
+        from fuzzystride.FuzzyEngine import FuzzyEngine
+        if self._snapshot_path:
+            from fuzzystride.Snapshot import load_snapshot
+            self.model = load_snapshot(self._snapshot_path).model
         else:
-            self._splash.destroy()
-            self._build_main_ui()
+            self.model = FuzzyModel()
+        self.engine = FuzzyEngine(self.model)
+
+    def _load_plotting(self):
+        import ui.Plots  # noqa: F401  (matplotlib + TkAgg backend)
+
+    def _warm_up(self):
+        self.engine.evaluate(150, 5.5, 12)
+
+    def _poll_loader(self):
+        while True:
+            try:
+                kind, payload, fraction = self._load_events.get_nowait()
+            except queue.Empty:
+                self.root.after(20, self._poll_loader)
+                return
+            if kind == 'step':
+                self._set_progress(payload, fraction)
+            elif kind == 'error':
+                messagebox.showerror("Startup Error", str(payload))
+                self.root.destroy()
+                return
+            else:
+                self._build_main_ui()
+                return
+
+    def _set_progress(self, label: str, fraction: float = None):
+        self._progress_label.config(text=label + " …")
+        if fraction is not None:
+            self._progress['value'] = 100 * fraction
 
     def _build_main_ui(self):
-        # Title bar
+        # Built into an unmapped frame behind the splash, one section per
+        # Tk callback so the progress bar keeps moving; shown when done.
+        self._content = ttk.Frame(self.root)
         self._build_title_bar()
 
         # Single frame — all three sections packed directly
-        self._main_frame = ttk.Frame(self.root)
+        self._main_frame = ttk.Frame(self._content)
         self._main_frame.pack(fill="both", expand=True, padx=6, pady=4)
 
-        self._build_fuzzification_section()
-        self._build_inference_section()
-        self._build_defuzzification_section()
+        steps = [self._build_fuzzification_section,
+                 self._build_inference_section,
+                 self._build_defuzzification_section]
+        self._run_build_step(list(zip(self.BUILD_STEPS, steps)))
+
+    def _run_build_step(self, pending):
+        (label, fraction), step = pending.pop(0)
+        self._set_progress(label)
+        self.root.update_idletasks()
+        start = time.perf_counter()
+        step()
+        self.startup_timings[label] = time.perf_counter() - start
+        self._set_progress(label, fraction)
+        if pending:
+            self.root.after(1, self._run_build_step, pending)
+            return
+
+        self._live = LiveEvaluator(self.engine, self.root,
+                                   on_result=self._update_ui,
+                                   on_error=self._show_live_error)
+        self._splash.destroy()
+        self._content.pack(fill="both", expand=True)
+        # Interactive once the event loop is idle again after mapping.
+        self.root.after_idle(self._report_startup)
+
+    def _report_startup(self):
+        self.time_to_interactive = time.perf_counter() - self._started
+        steps = ", ".join(f"{label.lower()} {seconds:.2f} s"
+                          for label, seconds in self.startup_timings.items())
+        print(f"FuzzyStride interactive after {self.time_to_interactive:.2f} s "
+              f"({steps})", file=sys.stderr)
 
     def _build_title_bar(self):
-        bar = ttk.Frame(self.root)
+        bar = ttk.Frame(self._content)
         bar.pack(fill="x", pady=(6, 2))
 
         tk.Label(bar, text=self.SECTION_TITLE,
@@ -107,6 +214,11 @@ class FuzzyStrideApp:
                    command=self._on_evaluate).pack(side="left", padx=4)
         ttk.Button(btn_frame, text="Clear", style="Bold.TButton",
                    command=self._on_clear).pack(side="left", padx=4)
+        ttk.Button(btn_frame, text="Surface", style="Bold.TButton",
+                   command=self._on_surface).pack(side="left", padx=4)
+        self._live_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(btn_frame, text="Live", variable=self._live_var,
+                        command=self._request_live).pack(side="left", padx=4)
 
     # Fuzzufication
     def _build_fuzzification_section(self):
@@ -131,6 +243,17 @@ class FuzzyStrideApp:
             row, "Distance (0-42 km):",
             row=0, col_label=4, padx_label=(8, 4), fonts=self.fonts)
 
+        # Sliders under each entry; in live mode they and typing in the
+        # entries re-evaluate as the values change.
+        self._entries = {'heart_rate': self._entry_hr,
+                         'pacing':     self._entry_pc,
+                         'distance':   self._entry_dist}
+        for col, (name, entry) in zip((0, 2, 4), self._entries.items()):
+            make_slider(row, 1, col, *self.model.input_ranges[name],
+                        command=lambda value, n=name: self._on_slider(n, value))
+            entry.bind("<KeyRelease>", lambda _: self._request_live())
+
+        from ui.Plots import MembershipPlots
         self._mf_plots = MembershipPlots(section, self.model)
 
     # Inference
@@ -168,6 +291,7 @@ class FuzzyStrideApp:
         graph_frame = ttk.Frame(content)
         graph_frame.pack(side="left", fill="both",
                          expand=True, padx=(10, 6), pady=4)
+        from ui.Plots import DefuzzPlot
         self._defuzz_plot = DefuzzPlot(graph_frame, self.model)
 
         info_frame = ttk.Frame(content)
@@ -181,6 +305,7 @@ class FuzzyStrideApp:
 
     # Callbacks
     def _on_evaluate(self):
+        from fuzzystride.FuzzyEngine import validate_input
         try:
             hr   = validate_input(self._entry_hr.get(),   100, 190, "Heart Rate")
             pc   = validate_input(self._entry_pc.get(),   3.0, 9.0, "Pacing")
@@ -191,7 +316,37 @@ class FuzzyStrideApp:
         result = self.engine.evaluate(hr, pc, dist)
         self._update_ui(result)
 
+    def _on_slider(self, name: str, value: str):
+        step  = self.SLIDER_STEPS[name]
+        value = round(float(value) / step) * step
+        entry = self._entries[name]
+        entry.delete(0, tk.END)
+        entry.insert(0, f"{value:.0f}" if step >= 1 else f"{value:.1f}")
+        self._request_live()
+
+    def _request_live(self):
+        if not self._live_var.get():
+            return
+        from fuzzystride.FuzzyEngine import validate_input
+        values = []
+        for name, label in (('heart_rate', "Heart Rate"), ('pacing', "Pacing"),
+                            ('distance', "Distance")):
+            try:
+                values.append(validate_input(
+                    self._entries[name].get(), *self.model.input_ranges[name],
+                    label))
+            except ValueError:
+                # Half-typed values are normal while editing live.
+                return
+        self._live.request(*values)
+
+    def _show_live_error(self, exc: Exception):
+        for lbl in (self._lbl_crisp, self._lbl_status):
+            lbl.config(text="")
+        self._lbl_advice.config(text=str(exc), font=self.fonts.value)
+
     def _on_clear(self):
+        self._live.cancel()
         for entry in (self._entry_hr, self._entry_pc, self._entry_dist):
             entry.delete(0, tk.END)
         for lbl in (self._lbl_crisp, self._lbl_status, self._lbl_advice):
@@ -200,6 +355,41 @@ class FuzzyStrideApp:
         self._agg_text.delete(1.0, tk.END)
         self._mf_plots.clear_markers()
         self._defuzz_plot.reset()
+        if self._surface is not None:
+            self._surface.clear_point()
+
+    # Response surface window
+    def _on_surface(self):
+        if self._surface is not None:
+            self._surface_window.lift()
+            return
+        from ui.Plots import SurfacePlot
+        window = tk.Toplevel(self.root)
+        window.title(f"{self.APP_TITLE} - Response Surface")
+        window.protocol("WM_DELETE_WINDOW", self._close_surface)
+        self._surface_window = window
+
+        row = ttk.Frame(window)
+        row.pack(side="bottom", fill="x", pady=4)
+        tk.Label(row, text="Distance (km):",
+                 font=self.fonts.label).pack(side="left", padx=(8, 4))
+        scale = ttk.Scale(row, from_=0, to=self.model.input_ranges['distance'][1],
+                          orient="horizontal",
+                          command=lambda value: self._surface.show(float(value)))
+        scale.pack(side="left", fill="x", expand=True, padx=(0, 10))
+
+        self._surface = SurfacePlot(window, self.engine)
+        try:
+            distance = float(self._entry_dist.get())
+        except ValueError:
+            distance = 10.0
+        scale.set(distance)
+        self._surface.show(distance)
+
+    def _close_surface(self):
+        self._surface.close()
+        self._surface_window.destroy()
+        self._surface = None
 
 
     def _update_ui(self, result):
@@ -209,6 +399,9 @@ class FuzzyStrideApp:
         self._mf_plots.update_markers(
             result.heart_rate, result.pacing, result.distance)
         self._defuzz_plot.update(result)
+        if self._surface is not None:
+            self._surface.show(result.distance)
+            self._surface.set_point(result.heart_rate, result.pacing)
 
     def _update_result_labels(self, result):
         f = self.fonts.value_large
@@ -228,4 +421,4 @@ class FuzzyStrideApp:
         for key, val in result.agg_values.items():
             self._agg_text.insert(
                 tk.END,
-                f"  {key.capitalize()} Max Membership: {np.max(val):.4f}\n", "r")
\ No newline at end of file
+                f"  {key.capitalize()} Max Membership: {val.max():.4f}\n", "r")
\ No newline at end of file
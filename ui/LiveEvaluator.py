@@ -0,0 +1,103 @@
+import queue
+import threading
+import time
+from typing import Callable, Optional, Tuple
+
+
+class LiveEvaluator:
+    """Runs ``engine.evaluate`` on a worker thread for live input changes.
+
+    ``request`` only stores the newest inputs, so requests made while the
+    worker is busy (or within ``debounce`` seconds of each other) collapse
+    into one evaluation of the latest values. Results are handed back on
+    the Tk thread by polling with ``root.after``; Tk widgets are never
+    touched from the worker.
+    """
+
+    POLL_MS = 15
+
+    def __init__(self, engine, root, on_result: Callable,
+                 on_error: Optional[Callable] = None,
+                 debounce: float = 0.01):
+        self.engine    = engine
+        self.root      = root
+        self.on_result = on_result
+        self.on_error  = on_error
+        self.debounce  = debounce
+
+        self._latest: Optional[Tuple[int, tuple]] = None
+        self._seq      = 0
+        self._applied  = 0
+        self._lock     = threading.Lock()
+        self._wake     = threading.Event()
+        self._stop     = False
+        self._results: "queue.Queue[tuple]" = queue.Queue()
+        self._poll_id  = None
+        self._thread   = threading.Thread(target=self._work, daemon=True,
+                                          name="live-evaluator")
+        self._thread.start()
+
+    def request(self, hr: float, pc: float, dist: float):
+        with self._lock:
+            self._seq += 1
+            self._latest = (self._seq, (hr, pc, dist))
+        self._wake.set()
+        if self._poll_id is None:
+            self._poll_id = self.root.after(self.POLL_MS, self._poll)
+
+    def cancel(self):
+        """Drop the pending request and ignore results already computed."""
+        with self._lock:
+            self._latest  = None
+            self._applied = self._seq
+
+    def close(self):
+        self._stop = True
+        self._wake.set()
+        if self._poll_id is not None:
+            self.root.after_cancel(self._poll_id)
+            self._poll_id = None
+
+    # Worker thread
+    def _work(self):
+        while True:
+            self._wake.wait()
+            if self._stop:
+                return
+            if self.debounce:
+                time.sleep(self.debounce)
+            self._wake.clear()
+            with self._lock:
+                latest, self._latest = self._latest, None
+            if latest is None:
+                continue
+            seq, inputs = latest
+            try:
+                self._results.put((seq, self.engine.evaluate(*inputs), None))
+            except Exception as exc:
+                self._results.put((seq, None, exc))
+
+    # Tk thread
+    def _poll(self):
+        newest = None
+        while True:
+            try:
+                newest = self._results.get_nowait()
+            except queue.Empty:
+                break
+        with self._lock:
+            if newest is not None and newest[0] > self._applied:
+                self._applied = newest[0]
+            else:
+                newest = None
+            idle = self._latest is None and self._applied >= self._seq
+
+        if newest is not None:
+            _, result, error = newest
+            if error is None:
+                self.on_result(result)
+            elif self.on_error is not None:
+                self.on_error(error)
+        # Keep polling only while an answer is still outstanding.
+        self._poll_id = None if idle else \
+            self.root.after(self.POLL_MS, self._poll)
@@ -1,9 +1,46 @@
+import queue
+import threading
 import numpy as np
 import matplotlib.pyplot as plt
+from collections import OrderedDict
+from matplotlib.patches import Polygon
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
-from FuzzyModel import FuzzyModel
-from FuzzyEngine import EvaluationResult
+from fuzzystride.FuzzyModel import FuzzyModel
+from fuzzystride.FuzzyEngine import EvaluationResult, FuzzyEngine
+
+
+class _Blitter:
+    """Redraws a figure's animated artists over a cached background.
+
+    The background is re-captured after every full draw (first show,
+    resize, layout change), so updates only restore it, draw the artists
+    and blit. Canvases without blitting fall back to ``draw_idle``.
+    """
+
+    def __init__(self, canvas, artists):
+        self.canvas      = canvas
+        self.artists     = artists
+        self._background = None
+        canvas.mpl_connect('draw_event', self._on_draw)
+
+    def _on_draw(self, event):
+        self._background = self.canvas.copy_from_bbox(self.canvas.figure.bbox)
+        self._draw_artists()
+
+    def _draw_artists(self):
+        figure = self.canvas.figure
+        for artist in self.artists:
+            if artist.get_visible():
+                figure.draw_artist(artist)
+
+    def update(self):
+        if self._background is None or not self.canvas.supports_blit:
+            self.canvas.draw_idle()
+            return
+        self.canvas.restore_region(self._background)
+        self._draw_artists()
+        self.canvas.blit(self.canvas.figure.bbox)
 
 
 class MembershipPlots:
@@ -17,19 +54,35 @@ class MembershipPlots:
                                  bottom=0.22, wspace=0.35)
         self._draw_base_mfs()
 
-        self.canvas = FigureCanvasTkAgg(self.fig, master=parent)
+        # One persistent marker per axis, moved instead of re-created. It
+        # starts at the left limit so it does not widen the autoscaled axis.
+        kw = dict(color='red', linestyle='--', linewidth=1.5, alpha=0.8,
+                  visible=False, animated=True)
+        self._markers = [ax.axvline(x=ax.get_xlim()[0], **kw)
+                         for ax in (self.ax_hr, self.ax_pc, self.ax_dist)]
+
+        self.canvas   = self._make_canvas(parent)
+        self._blitter = _Blitter(self.canvas, self._markers)
         self.canvas.draw()
-        self.canvas.get_tk_widget().pack(fill="x", pady=2)
+
+    def _make_canvas(self, parent):
+        canvas = FigureCanvasTkAgg(self.fig, master=parent)
+        canvas.get_tk_widget().pack(fill="x", pady=2)
+        return canvas
 
     def _draw_base_mfs(self):
+        # Sampled from the model's trimf parameters, so the GUI never
+        # needs the skfuzzy control objects.
         specs = [
-            (self.ax_hr,   self.model.heart_rate, "Heart Rate MF", "Heart Rate (bpm)"),
-            (self.ax_pc,   self.model.pacing,     "Pacing MF",     "Pacing (min/km)"),
-            (self.ax_dist, self.model.distance,   "Distance MF",   "Distance (km)"),
+            (self.ax_hr,   'heart_rate', "Heart Rate MF", "Heart Rate (bpm)"),
+            (self.ax_pc,   'pacing',     "Pacing MF",     "Pacing (min/km)"),
+            (self.ax_dist, 'distance',   "Distance MF",   "Distance (km)"),
         ]
         for ax, var, title, xlabel in specs:
-            for label, mf in var.terms.items():
-                ax.plot(var.universe, mf.mf, label=label, linewidth=1.2)
+            for label in self.model.mf_params[var]:
+                ax.plot(self.model.universes[var],
+                        self.model.sampled_mf(var, label),
+                        label=label, linewidth=1.2)
             ax.set_title(title, fontsize=8, weight="bold")
             ax.set_xlabel(xlabel, fontsize=7)
             ax.set_ylabel("Degree", fontsize=7)
@@ -39,24 +92,21 @@ class MembershipPlots:
             ax.legend(loc='upper right', fontsize=6)
 
     def update_markers(self, hr: float, pc: float, dist: float):
-        self._remove_markers()
-        kw = dict(color='red', linestyle='--', linewidth=1.5, alpha=0.8)
-        self.ax_hr.axvline(x=hr,    **kw)
-        self.ax_pc.axvline(x=pc,    **kw)
-        self.ax_dist.axvline(x=dist, **kw)
-        self.canvas.draw()
+        for marker, x in zip(self._markers, (hr, pc, dist)):
+            marker.set_xdata([x, x])
+            marker.set_visible(True)
+        self._blitter.update()
 
     def clear_markers(self):
-        self._remove_markers()
-        self.canvas.draw()
-
-    def _remove_markers(self):
-        for ax in (self.ax_hr, self.ax_pc, self.ax_dist):
-            for line in [l for l in ax.lines if l.get_linestyle() == '--']:
-                line.remove()
+        for marker in self._markers:
+            marker.set_visible(False)
+        self._blitter.update()
 
 
 class DefuzzPlot:
+    TITLE        = "Defuzzified Output (Training Status)"
+    RESULT_TITLE = "Defuzzified Output: Training Status"
+
     def __init__(self, parent, model: FuzzyModel):
         self.model = model
         self.fig, self.ax = plt.subplots(figsize=(5, 2.2))
@@ -64,19 +114,44 @@ class DefuzzPlot:
                                  top=0.88, bottom=0.22)
         self._draw_base_mfs()
 
-        self.canvas = FigureCanvasTkAgg(self.fig, master=parent)
+        # Result artists are created once and updated in place.
+        universe = self.model.universes['training_status']
+        self._fill = Polygon(np.zeros((2 * len(universe), 2)), closed=True,
+                             color="#165673", alpha=0.3, linewidth=0,
+                             visible=False, animated=True)
+        self.ax.add_patch(self._fill)
+        self._crisp_line = self.ax.axvline(
+            x=0, color='red', linestyle='--', linewidth=1.5, alpha=0.8,
+            visible=False, animated=True)
+        self._crisp_text = self.ax.text(
+            0, 0.88, "", color='red', fontsize=7, weight="bold",
+            visible=False, animated=True)
+        self._status_text = self.ax.text(
+            0, 0.75, "", color='#165673', fontsize=7, weight="bold",
+            visible=False, animated=True)
+        self._result_artists = [self._fill, self._crisp_line,
+                                self._crisp_text, self._status_text]
+        self._showing_result = False
+
+        self.canvas   = self._make_canvas(parent)
+        self._blitter = _Blitter(self.canvas, self._result_artists)
         self.canvas.draw()
-        self.canvas.get_tk_widget().pack(fill="both", expand=True)
+
+    def _make_canvas(self, parent):
+        canvas = FigureCanvasTkAgg(self.fig, master=parent)
+        canvas.get_tk_widget().pack(fill="both", expand=True)
+        return canvas
 
     def _draw_base_mfs(self):
-        for label, mf in self.model.training_status.terms.items():
-            self.ax.plot(self.model.training_status.universe, mf.mf,
+        universe = self.model.universes['training_status']
+        for label in self.model.mf_params['training_status']:
+            self.ax.plot(universe,
+                         self.model.sampled_mf('training_status', label),
                          label=label.capitalize(), linewidth=1.5)
         self._style_axis()
 
     def _style_axis(self):
-        self.ax.set_title("Defuzzified Output (Training Status)",
-                          fontsize=8, weight="bold")
+        self.ax.set_title(self.TITLE, fontsize=8, weight="bold")
         self.ax.set_xlabel("Training Intensity Level (0–1)", fontsize=7)
         self.ax.set_ylabel("Membership Degree",              fontsize=7)
         self.ax.set_xlim(0, 1)
@@ -86,28 +161,332 @@ class DefuzzPlot:
         self.ax.grid(True, linestyle="--", alpha=0.4)
 
     def update(self, result: EvaluationResult):
-        self.ax.clear()
-        for label, mf in self.model.training_status.terms.items():
-            self.ax.plot(self.model.training_status.universe, mf.mf,
-                         label=label.capitalize(), linewidth=1.5)
-
-        self.ax.fill_between(self.model.training_status.universe,
-                             result.aggregated_mf,
-                             color="#165673", alpha=0.3)
+        universe = self.model.universes['training_status']
+        self._fill.set_xy(np.column_stack([
+            np.concatenate([universe, universe[::-1]]),
+            np.concatenate([result.aggregated_mf, np.zeros(len(universe))]),
+        ]))
 
         cv = result.crisp_value
-        self.ax.axvline(x=cv, color='red', linestyle='--',
-                        linewidth=1.5, alpha=0.8)
-        self.ax.text(cv + 0.02, 0.88, f"Crisp = {cv:.2f}",
-                     color='red', fontsize=7, weight="bold")
-        self.ax.text(cv + 0.02, 0.75, f"→ {result.status}",
-                     color='#165673', fontsize=7, weight="bold")
+        self._crisp_line.set_xdata([cv, cv])
+        self._crisp_text.set_position((cv + 0.02, 0.88))
+        self._crisp_text.set_text(f"Crisp = {cv:.2f}")
+        self._status_text.set_position((cv + 0.02, 0.75))
+        self._status_text.set_text(f"→ {result.status}")
+        for artist in self._result_artists:
+            artist.set_visible(True)
+
+        if self._showing_result:
+            self._blitter.update()
+        else:
+            # The title is part of the cached background; changing it
+            # needs one full redraw, after which updates blit again.
+            self._showing_result = True
+            self.ax.set_title(self.RESULT_TITLE, fontsize=8, weight="bold")
+            self.canvas.draw_idle()
+
+    def reset(self):
+        for artist in self._result_artists:
+            artist.set_visible(False)
+        if self._showing_result:
+            self._showing_result = False
+            self.ax.set_title(self.TITLE, fontsize=8, weight="bold")
+            self.canvas.draw_idle()
+        else:
+            self._blitter.update()
+
+
+class _SurfaceTiler:
+    """Background worker computing crisp-output slices tile by tile.
+
+    Tiles are cached by ``(model hash, distance step, tile)`` in a bounded
+    LRU shared by both threads. A ``request`` replaces whatever the worker
+    was doing; once a slice is complete the worker prefetches neighbouring
+    distance slices until the next request arrives.
+    """
+
+    def __init__(self, engine: FuzzyEngine, hr: np.ndarray, pc: np.ndarray,
+                 tile: int, coarse: int, dist_step: float, prefetch: int,
+                 max_tiles: int):
+        self.engine    = engine
+        self.hr        = hr
+        self.pc        = pc
+        self.tile      = tile
+        self.coarse    = coarse
+        self.dist_step = dist_step
+        self.prefetch  = prefetch
+        self.max_tiles = max_tiles
+        self.tiles     = [(r, c) for r in range(0, len(pc), tile)
+                                 for c in range(0, len(hr), tile)]
+
+        self._cache: "OrderedDict[tuple, np.ndarray]" = OrderedDict()
+        self._job      = None
+        self._gen      = 0
+        self._lock     = threading.Lock()
+        self._wake     = threading.Event()
+        self._stop     = False
+        self.results: "queue.Queue[tuple]" = queue.Queue()
+        self._thread   = threading.Thread(target=self._work, daemon=True,
+                                          name="surface-tiler")
+        self._thread.start()
+
+    # Cache
+    def cached(self, key: tuple):
+        with self._lock:
+            block = self._cache.get(key)
+            if block is not None:
+                self._cache.move_to_end(key)
+            return block
+
+    def _store(self, key: tuple, block: np.ndarray):
+        with self._lock:
+            self._cache[key] = block
+            while len(self._cache) > self.max_tiles:
+                self._cache.popitem(last=False)
+
+    # Jobs
+    def request(self, model_hash: str, step: int, post: bool = True) -> int:
+        """Compute the slice at ``step * dist_step``; returns its generation.
+
+        With ``post`` the slice's blocks are put on ``results`` as they are
+        ready, followed by ``'done'``; otherwise only neighbours are cached.
+        """
+        with self._lock:
+            self._gen += 1
+            self._job  = (self._gen, model_hash, step, post)
+        self._wake.set()
+        return self._gen
+
+    def close(self):
+        self._stop = True
+        self._wake.set()
+
+    def _current(self, gen: int) -> bool:
+        return not self._stop and self._gen == gen
+
+    def _work(self):
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            if self._stop:
+                return
+            with self._lock:
+                job, self._job = self._job, None
+            if job is None:
+                continue
+            gen, model_hash, step, post = job
+            try:
+                if not self._compute_slice(gen, model_hash, step, post):
+                    continue
+                for offset in range(1, self.prefetch + 1):
+                    for neighbour in (step + offset, step - offset):
+                        if not self._current(gen):
+                            break
+                        self._compute_slice(gen, model_hash, neighbour,
+                                            post=False)
+            except Exception as exc:
+                self.results.put((gen, 'error', exc))
+
+    def _compute_slice(self, gen: int, model_hash: str, step: int,
+                       post: bool) -> bool:
+        dist = step * self.dist_step
+        if step < 0 or dist > self.engine.model.input_ranges['distance'][1]:
+            return True
+        # Coarse preview first, then full-resolution tiles.
+        work = [('coarse', slice(None, None, self.coarse),
+                 slice(None, None, self.coarse))]
+        work += [((r, c), slice(r, r + self.tile), slice(c, c + self.tile))
+                 for r, c in self.tiles]
+        for name, rows, cols in work:
+            if not self._current(gen):
+                return False
+            key   = (model_hash, step, name)
+            block = self.cached(key)
+            if block is None:
+                block = self._crisp(self.hr[cols], self.pc[rows], dist)
+                self._store(key, block)
+            if post:
+                self.results.put((gen, name, block))
+        if post:
+            self.results.put((gen, 'done', None))
+        return True
+
+    def _crisp(self, hr: np.ndarray, pc: np.ndarray, dist: float) -> np.ndarray:
+        hh, pp = np.meshgrid(hr, pc)
+        crisp  = self.engine.evaluate_batch(
+            hh.ravel(), pp.ravel(), np.full(hh.size, dist)).crisp_values
+        return crisp.reshape(hh.shape)
+
+
+class SurfacePlot:
+    """Crisp output over Heart Rate x Pacing at a fixed distance.
+
+    ``show(distance)`` draws whatever is cached for that slice at once and
+    lets a background worker fill in the rest: a coarse preview over the
+    whole grid, then full-resolution tiles. Tiles are cached by model hash
+    and neighbouring slices are prefetched, so panning the distance is
+    usually instant. Grey cells are inputs for which no rule fires.
+    """
+
+    TITLE      = "Response Surface (Crisp Output)"
+    RESOLUTION = (181, 121)     # heart-rate x pacing grid points
+    TILE       = 32
+    COARSE     = 8              # coarse preview stride
+    DIST_STEP  = 0.1            # km; distances are snapped to this
+    PREFETCH   = 8              # neighbouring slices computed when idle
+    MAX_TILES  = 4096
+    POLL_MS    = 15
+
+    def __init__(self, parent, engine: FuzzyEngine):
+        self.parent = parent
+        self.engine = engine
+        self.model  = engine.model
+        (hr_lo, hr_hi), (pc_lo, pc_hi) = (self.model.input_ranges['heart_rate'],
+                                          self.model.input_ranges['pacing'])
+        self.hr = np.linspace(hr_lo, hr_hi, self.RESOLUTION[0])
+        self.pc = np.linspace(pc_lo, pc_hi, self.RESOLUTION[1])
+
+        self.fig, self.ax = plt.subplots(figsize=(6, 4.5))
+        self.fig.subplots_adjust(left=0.11, right=0.93, top=0.92, bottom=0.12)
+        self._image_data = np.full((len(self.pc), len(self.hr)), np.nan)
+        # Cells already holding full-resolution values.
+        self._refined    = np.zeros(self._image_data.shape, dtype=bool)
+
+        cmap = plt.get_cmap('viridis').with_extremes(bad='lightgrey')
+        self._image = self.ax.imshow(
+            self._image_data, origin='lower', aspect='auto', cmap=cmap,
+            vmin=0, vmax=1, interpolation='nearest', animated=True,
+            extent=(hr_lo, hr_hi, pc_lo, pc_hi))
+        colorbar = self.fig.colorbar(self._image, ax=self.ax,
+                                     fraction=0.05, pad=0.02)
+        colorbar.set_label("Training Intensity", fontsize=7)
+        colorbar.ax.tick_params(labelsize=6)
+        self._point, = self.ax.plot([], [], marker='+', color='red',
+                                    markersize=12, markeredgewidth=2,
+                                    visible=False, animated=True)
+        self._caption = self.ax.text(0.01, 1.01, "", fontsize=7,
+                                     transform=self.ax.transAxes,
+                                     animated=True)
         self._style_axis()
-        self.ax.set_title("Defuzzified Output: Training Status",
-                          fontsize=8, weight="bold")
+
+        self._tiler = _SurfaceTiler(engine, self.hr, self.pc, self.TILE,
+                                    self.COARSE, self.DIST_STEP,
+                                    self.PREFETCH, self.MAX_TILES)
+        self._gen        = 0
+        self._step       = None
+        self._shown_hash = None
+        self._poll_id    = None
+        self._hash       = None
+        self._revision   = None
+
+        self.canvas   = self._make_canvas(parent)
+        self._blitter = _Blitter(self.canvas, [self._image, self._point,
+                                               self._caption])
         self.canvas.draw()
 
-    def reset(self):
-        self.ax.clear()
-        self._draw_base_mfs()
-        self.canvas.draw()
\ No newline at end of file
+    def _make_canvas(self, parent):
+        canvas = FigureCanvasTkAgg(self.fig, master=parent)
+        canvas.get_tk_widget().pack(fill="both", expand=True)
+        return canvas
+
+    def _style_axis(self):
+        self.ax.set_title(self.TITLE, fontsize=8, weight="bold", pad=14)
+        self.ax.set_xlabel("Heart Rate (bpm)", fontsize=7)
+        self.ax.set_ylabel("Pacing (min/km)",  fontsize=7)
+        self.ax.tick_params(labelsize=6)
+
+    def _model_hash(self) -> str:
+        if self._revision != self.model.revision:
+            self._revision = self.model.revision
+            self._hash     = self.model.parameter_hash()
+        return self._hash
+
+    def show(self, distance: float):
+        """Display the slice at ``distance`` (snapped to ``DIST_STEP``)."""
+        lo, hi = self.model.input_ranges['distance']
+        step = int(round(min(max(distance, lo), hi) / self.DIST_STEP))
+        model_hash = self._model_hash()
+        if step == self._step and model_hash == self._shown_hash:
+            return
+        self._step, self._shown_hash = step, model_hash
+        self._image_data[:] = np.nan
+        self._refined[:]    = False
+
+        # Paint everything already cached; only the rest goes to the worker.
+        coarse = self._tiler.cached((model_hash, step, 'coarse'))
+        if coarse is not None:
+            self._apply('coarse', coarse)
+        missing = False
+        for tile in self._tiler.tiles:
+            block = self._tiler.cached((model_hash, step, tile))
+            if block is None:
+                missing = True
+            else:
+                self._apply(tile, block)
+
+        # Complete slices still restart prefetching around the new position.
+        self._gen = self._tiler.request(model_hash, step, post=missing)
+        if missing and self._poll_id is None:
+            self._poll_id = self.parent.after(self.POLL_MS, self._poll)
+        self._redraw(refining=missing)
+
+    def set_point(self, hr: float, pc: float):
+        self._point.set_data([hr], [pc])
+        self._point.set_visible(True)
+        self._blitter.update()
+
+    def clear_point(self):
+        self._point.set_visible(False)
+        self._blitter.update()
+
+    def close(self):
+        self._tiler.close()
+        if self._poll_id is not None:
+            self.parent.after_cancel(self._poll_id)
+            self._poll_id = None
+        plt.close(self.fig)
+
+    def _apply(self, name, block: np.ndarray):
+        if name == 'coarse':
+            # Nearest-neighbour upsampling, under any refined cells.
+            rows = np.arange(len(self.pc)) // self.COARSE
+            cols = np.arange(len(self.hr)) // self.COARSE
+            preview = block[np.ix_(rows, cols)]
+            self._image_data[~self._refined] = preview[~self._refined]
+        else:
+            r, c = name
+            rows, cols = slice(r, r + block.shape[0]), slice(c, c + block.shape[1])
+            self._image_data[rows, cols] = block
+            self._refined[rows, cols]    = True
+
+    def _poll(self):
+        self._poll_id = None
+        done, changed = False, False
+        while True:
+            try:
+                gen, name, block = self._tiler.results.get_nowait()
+            except queue.Empty:
+                break
+            if gen != self._gen:
+                continue
+            if name == 'done':
+                done = True
+            elif name == 'error':
+                self._caption.set_text(f"Surface failed: {block}")
+                self._blitter.update()
+                return
+            else:
+                self._apply(name, block)
+                changed = True
+        if changed or done:
+            self._redraw(refining=not done)
+        if not done:
+            self._poll_id = self.parent.after(self.POLL_MS, self._poll)
+
+    def _redraw(self, refining: bool):
+        self._image.set_data(np.ma.masked_invalid(self._image_data))
+        caption = f"Distance {self._step * self.DIST_STEP:.1f} km"
+        if refining:
+            caption += f"  ·  refining {self._refined.mean():.0%}"
+        self._caption.set_text(caption)
+        self._blitter.update()
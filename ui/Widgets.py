@@ -32,6 +32,14 @@ def make_labelled_entry(parent, text, row, col_label,
     return entry
 
 
+def make_slider(parent, row, col, from_, to, command):
+    scale = ttk.Scale(parent, from_=from_, to=to, orient="horizontal",
+                      command=command)
+    scale.grid(row=row, column=col, columnspan=2, padx=(8, 10), pady=(0, 4),
+               sticky="ew")
+    return scale
+
+
 def make_text_box(parent, height, width, font):
     widget = tk.Text(parent, height=height, width=width,
                      wrap="word", font=font)